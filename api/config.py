@@ -15,16 +15,127 @@ class Settings(BaseSettings):
     api_port: int = 8000
     api_reload: bool = True
     api_log_level: str = "info"
+    api_workers: int = 1
+    tables_batch_max_ids: int = 100  # Per /tables/batch request; also the export lookup batch size
+
+    # Logging
+    log_sample_rate: float = 1.0  # Share of success-path info logs kept; warnings/errors always kept
+    log_slow_query_ms: float = 1000.0  # Queries at least this slow are always logged
+    log_queue_size: int = 10000
+
+    # Shared Model Host (one Pneuma process serving every API worker)
+    model_host_socket: Optional[str] = None  # e.g. /tmp/pneuma-model-host.sock
+    model_host_autostart: bool = True
+    model_host_connect_timeout: float = 600.0  # Also bounds a host reload
+    model_host_call_timeout: float = 120.0  # Calls made outside a request deadline
+    model_host_batch_window_ms: float = 2.0
+    model_host_max_batch: int = 32
+    model_host_shm_threshold: int = 256 * 1024
+
+    # Response Compression
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 1
+    compression_zstd_level: int = 3
+    compression_brotli_quality: int = 4
 
     # Redis Configuration
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
     redis_password: Optional[str] = None
+    redis_socket_timeout: float = 5.0
 
     # Session Management
     session_expire_hours: int = 24
     secret_key: str = "change-this-in-production"
+    session_active_window_minutes: int = 30
+    session_delete_batch_size: int = 500
+    session_sweep_scan_count: int = 500
+    session_sweep_keys_per_second: int = 5000
+    session_store: str = "redis"  # redis, memory or sqlite
+    session_store_fallback: str = "memory"  # Local store used while Redis is down: memory, sqlite or none
+    session_redis_retry_seconds: float = 30.0
+    session_memory_max_sessions: int = 10000
+    session_sqlite_path: Optional[str] = None  # Defaults to <pneuma_storage_path>/sessions.db
+
+    # Quick Search (in-process ANN, no LLM stage)
+    quick_search_enabled: bool = True
+    quick_min_tables: int = 1  # Fewer indexed tables fall back to balanced mode
+    quick_max_tables: int = 200000  # Per index
+    quick_exact_threshold: int = 4096  # Smaller indexes are searched exhaustively
+    quick_nprobe: int = 16
+    quick_kmeans_iterations: int = 10
+    quick_rebuild_interval_seconds: float = 60.0
+    thorough_candidate_multiplier: int = 10  # Minimum n for thorough mode
+
+    # Federated Search (one query across several indexes)
+    federated_max_indexes: int = 10
+    federated_index_timeout_seconds: float = 10.0  # Slower indexes are left out of the results
+
+    # Follow-up Refinement
+    refine_pool_size: int = 50
+    refine_min_similarity: float = 0.5
+    refine_min_overlap: float = 0.5  # Share of k pool candidates that must still match
+    refine_prior_weight: float = 0.3  # Weight of the original retrieval score when reranking
+
+    # Request Deadlines
+    request_default_timeout_seconds: Optional[float] = None  # Applied when the client sends none
+    request_max_timeout_seconds: float = 300.0
+    deadline_disconnect_poll_ms: int = 250
+
+    # Health Monitoring
+    health_probe_interval_seconds: float = 5.0
+    health_probe_timeout_seconds: float = 2.0
+    health_history_size: int = 120
+    circuit_failure_threshold: int = 5  # Consecutive failures before a circuit opens
+    circuit_reset_seconds: float = 15.0
+
+    # Admission Control
+    rate_limit_enabled: bool = True
+    rate_limit_interactive_capacity: int = 30
+    rate_limit_interactive_refill_per_second: float = 1.0
+    rate_limit_bulk_capacity: int = 60
+    rate_limit_bulk_refill_per_second: float = 2.0
+    rate_limit_session_share: float = 0.5  # Of a client's capacity one session may use; 1 disables
+    inference_workers: int = 2
+
+    # Export Jobs
+    export_dir: Optional[str] = None  # Defaults to <pneuma_storage_path>/exports
+    export_max_workers: int = 2
+    export_queue_size: int = 100
+    export_artifact_ttl_hours: int = 24
+    export_cleanup_interval_seconds: int = 300
+
+    # Query Cache
+    query_cache_enabled: bool = True
+    query_cache_ttl_seconds: int = 3600
+    query_cache_max_entries: int = 5000  # In-process fallback only
+    cache_warm_enabled: bool = True
+    cache_warm_top_n: int = 50  # Queries warmed per index
+    cache_warm_lookback_hours: int = 72
+    cache_warm_interval_seconds: int = 3600
+    cache_warm_startup_delay_seconds: int = 30
+    cache_warm_rate_per_second: float = 2.0
+    cache_warm_query_log: Optional[str] = None  # JSON lines or one query per line
+
+    # Incremental Index Updates
+    index_update_queue_size: int = 1000
+    index_update_batch_size: int = 64
+    delta_compaction_interval_seconds: int = 300
+    delta_compaction_min_entries: int = 100
+    embedding_batch_size: int = 32
+    embedding_device: Optional[str] = None  # e.g. "cpu" or "cuda"; auto-detected when unset
+    embedding_threads: Optional[int] = None  # torch intra-op threads; library default when unset
+    embedding_quantize_queries: bool = False  # Encode queries with an int8 model (CPU only)
+    embedding_quantized_path: Optional[str] = None  # Defaults to <pneuma_storage_path>/models/<model>.int8.pt
+
+    # Bulk Ingestion
+    ingest_root: Optional[str] = None  # When set, admin ingestion jobs may only read below it
+    ingest_workers: Optional[int] = None  # Defaults to the CPU count
+    ingest_embed_batch_size: int = 128
+    ingest_profile_rows: int = 100000
+    ingest_sample_rows: int = 5
 
     # OpenWebUI Configuration (optional fields)
     openwebui_host: str = "localhost"
@@ -40,6 +151,8 @@ class Settings(BaseSettings):
         case_sensitive = False
         # Allow extra fields that might be in .env
         extra = "ignore"
+        # model_host_* settings are ours, not pydantic's model_ namespace
+        protected_namespaces = ("settings_",)
 
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from fastapi import HTTPException
+from typing import TYPE_CHECKING, Optional
+
+# Type hints only: the services (and numpy) load when the lifespan creates them
+if TYPE_CHECKING:
+    from .services.cache_warmer import CacheWarmer
+    from .services.export_jobs import ExportJobService
+    from .services.health_monitor import HealthMonitor
+    from .services.index_updates import IndexUpdateService
+    from .services.ingestion import IngestionJobService
+    from .services.pneuma_service import PneumaService
+    from .services.rate_limiter import RateLimiter
+    from .services.session_service import SessionService
+
+# Global services, populated by the application lifespan in api.main
+pneuma_service: Optional[PneumaService] = None
+session_service: Optional[SessionService] = None
+export_job_service: Optional[ExportJobService] = None
+rate_limiter: Optional[RateLimiter] = None
+index_update_service: Optional[IndexUpdateService] = None
+ingestion_job_service: Optional[IngestionJobService] = None
+cache_warmer: Optional[CacheWarmer] = None
+health_monitor: Optional[HealthMonitor] = None
+
+
+def get_pneuma_service() -> PneumaService:
+    if pneuma_service is None:
+        raise HTTPException(status_code=503, detail="Pneuma service not initialized")
+    return pneuma_service
+
+
+def get_session_service() -> SessionService:
+    if session_service is None:
+        raise HTTPException(status_code=503, detail="Session service not initialized")
+    return session_service
+
+
+def get_export_job_service() -> ExportJobService:
+    if export_job_service is None:
+        raise HTTPException(status_code=503, detail="Export job service not initialized")
+    return export_job_service
+
+
+def get_index_update_service() -> IndexUpdateService:
+    if index_update_service is None:
+        raise HTTPException(status_code=503, detail="Index update service not initialized")
+    return index_update_service
+
+
+def get_ingestion_job_service() -> IngestionJobService:
+    if ingestion_job_service is None:
+        raise HTTPException(status_code=503, detail="Ingestion service not initialized")
+    return ingestion_job_service
+
+
+def get_cache_warmer() -> CacheWarmer:
+    if cache_warmer is None:
+        raise HTTPException(status_code=503, detail="Cache warming is disabled")
+    return cache_warmer
+
+
+def get_health_monitor() -> HealthMonitor:
+    if health_monitor is None:
+        raise HTTPException(status_code=503, detail="Health monitor not initialized")
+    return health_monitor
+
+
+def get_rate_limiter() -> RateLimiter:
+    if rate_limiter is None:
+        raise HTTPException(status_code=503, detail="Rate limiter not initialized")
+    return rate_limiter
@@ -1,40 +1,88 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import os
+import subprocess
+import sys
+import time
 import structlog
-import uvicorn
 
+from . import dependencies
 from .config import settings
-from .routers import query, tables, health, admin
-from .services.pneuma_service import PneumaService
-from .services.session_service import SessionService
+from .routers import query, tables, health, admin, export
 from .middleware.logging import setup_logging
+from .middleware.request_id import RequestIDMiddleware
 
 # Setup structured logging
-setup_logging()
+setup_logging(
+    settings.api_log_level,
+    sample_rate=settings.log_sample_rate,
+    slow_ms=settings.log_slow_query_ms,
+    queue_size=settings.log_queue_size,
+)
 logger = structlog.get_logger()
 
-# Global services
-pneuma_service = None
-session_service = None
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    global pneuma_service, session_service
 
     # Startup
     logger.info("Starting Pneuma API server...")
 
+    # Services are imported when they are created, not when the app is imported
+    from .services.cache_warmer import CacheWarmer
+    from .services.export_jobs import ExportJobService
+    from .services.health_monitor import HealthMonitor
+    from .services.index_updates import IndexUpdateService
+    from .services.ingestion import IngestionJobService
+    from .services.pneuma_service import PneumaService
+    from .services.query_cache import QueryCache
+    from .services.quick_search import QuickSearchService
+    from .services.rate_limiter import RateLimiter
+    from .services.session_service import SessionService
+
     try:
         # Initialize services
         pneuma_service = PneumaService()
         await pneuma_service.initialize()
+        dependencies.pneuma_service = pneuma_service
 
         session_service = SessionService()
         await session_service.initialize()
+        dependencies.session_service = session_service
+
+        health_monitor = HealthMonitor(pneuma_service, session_service)
+        await health_monitor.start()
+        dependencies.health_monitor = health_monitor
+
+        dependencies.rate_limiter = RateLimiter(session_service.redis)
+
+        if settings.quick_search_enabled:
+            pneuma_service.quick = QuickSearchService(
+                pneuma_service.embedder, pneuma_service.delta, pneuma_service.executor
+            )
+            await pneuma_service.quick.start()
+
+        if settings.query_cache_enabled:
+            pneuma_service.cache = QueryCache(session_service.redis)
+            if settings.cache_warm_enabled:
+                cache_warmer = CacheWarmer(pneuma_service, session_service)
+                await cache_warmer.start()
+                dependencies.cache_warmer = cache_warmer
+
+        export_job_service = ExportJobService(pneuma_service, session_service)
+        await export_job_service.start()
+        dependencies.export_job_service = export_job_service
+
+        index_update_service = IndexUpdateService(pneuma_service)
+        await index_update_service.start()
+        dependencies.index_update_service = index_update_service
+
+        dependencies.ingestion_job_service = IngestionJobService(
+            pneuma_service.embedder, pneuma_service.delta
+        )
 
         logger.info("All services initialized successfully")
 
@@ -46,8 +94,22 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Pneuma API server...")
-    if session_service:
-        await session_service.cleanup()
+    if dependencies.cache_warmer:
+        await dependencies.cache_warmer.stop()
+    if dependencies.ingestion_job_service:
+        await dependencies.ingestion_job_service.stop()
+    if dependencies.index_update_service:
+        await dependencies.index_update_service.stop()
+    if dependencies.export_job_service:
+        await dependencies.export_job_service.stop()
+    if dependencies.health_monitor:
+        await dependencies.health_monitor.stop()
+    if dependencies.session_service:
+        await dependencies.session_service.cleanup()
+    if dependencies.pneuma_service:
+        if dependencies.pneuma_service.quick:
+            await dependencies.pneuma_service.quick.stop()
+        await dependencies.pneuma_service.cleanup()
 
 
 # Create FastAPI app
@@ -69,10 +131,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.compression_enabled:
+    from .middleware.compression import CompressionMiddleware
+
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        gzip_level=settings.compression_gzip_level,
+        zstd_level=settings.compression_zstd_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+
+# Outermost, so every log line for the request carries its ID
+app.add_middleware(RequestIDMiddleware)
+
 # Include routers
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(query.router, prefix="/api/v1", tags=["query"])
 app.include_router(tables.router, prefix="/api/v1", tags=["tables"])
+app.include_router(export.router, prefix="/api/v1", tags=["export"])
 app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 
@@ -83,19 +160,6 @@ async def global_exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
-# Dependency to get services
-def get_pneuma_service() -> PneumaService:
-    if pneuma_service is None:
-        raise HTTPException(status_code=503, detail="Pneuma service not initialized")
-    return pneuma_service
-
-
-def get_session_service() -> SessionService:
-    if session_service is None:
-        raise HTTPException(status_code=503, detail="Session service not initialized")
-    return session_service
-
-
 # Root endpoint
 @app.get("/")
 async def root():
@@ -107,15 +171,55 @@ async def root():
     }
 
 
+def start_model_host() -> subprocess.Popen:
+    """Launch the shared model host and wait for its socket to appear"""
+    if os.path.exists(settings.model_host_socket):
+        os.unlink(settings.model_host_socket)
+
+    process = subprocess.Popen([sys.executable, "-m", "api.services.model_host"])
+    deadline = time.monotonic() + settings.model_host_connect_timeout
+    while not os.path.exists(settings.model_host_socket):
+        if process.poll() is not None:
+            raise RuntimeError("Model host exited during startup")
+        if time.monotonic() >= deadline:
+            process.kill()
+            process.wait()
+            raise RuntimeError(
+                f"Model host did not start within {settings.model_host_connect_timeout:.0f}s"
+            )
+        time.sleep(0.5)
+    return process
+
+
 def main():
     """Entry point for running the server"""
-    uvicorn.run(
-        "api.main:app",
-        host=settings.api_host,
-        port=settings.api_port,
-        reload=settings.api_reload,
-        log_level=settings.api_log_level,
-    )
+    # Only the launcher needs uvicorn; importing the app must not pull it in
+    import uvicorn
+
+    model_host = None
+    if settings.api_workers > 1:
+        if not settings.model_host_socket:
+            logger.warning(
+                "Running multiple workers without a model host; each worker loads its own models",
+                workers=settings.api_workers,
+            )
+        elif settings.model_host_autostart:
+            model_host = start_model_host()
+
+    try:
+        uvicorn.run(
+            "api.main:app",
+            host=settings.api_host,
+            port=settings.api_port,
+            # Reload and multiple workers are mutually exclusive in uvicorn
+            reload=settings.api_reload and settings.api_workers == 1,
+            workers=settings.api_workers,
+            log_level=settings.api_log_level,
+        )
+    finally:
+        if model_host is not None:
+            model_host.terminate()
+            model_host.wait()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+import zlib
+from typing import Callable, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # Optional codec
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:  # Optional codec
+    brotli = None
+
+# Server preference when the client accepts several encodings with equal weight
+ENCODING_PREFERENCE = ["zstd", "br", "gzip"]
+INCOMPRESSIBLE_TYPES = ("application/gzip", "application/zip", "image/", "video/", "audio/")
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _ZstdEncoder:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def available_encodings() -> List[str]:
+    """Encodings this server can produce, in preference order"""
+    available = {"gzip"}
+    if zstandard is not None:
+        available.add("zstd")
+    if brotli is not None:
+        available.add("br")
+    return [enc for enc in ENCODING_PREFERENCE if enc in available]
+
+
+def negotiate_encoding(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """Pick the encoding with the highest client q-value, breaking ties by server preference"""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Compress responses with zstd, brotli or gzip as negotiated via Accept-Encoding
+
+    Bodies smaller than ``minimum_size`` are sent as-is. Streaming responses are
+    compressed chunk by chunk with a flush after each one, so they stay incremental.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 1,
+        zstd_level: int = 3,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.available = available_encodings()
+        self.factories: Dict[str, Callable[[], object]] = {
+            "gzip": lambda: _GzipEncoder(gzip_level),
+            "zstd": lambda: _ZstdEncoder(zstd_level),
+            "br": lambda: _BrotliEncoder(brotli_quality),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, self.available) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            self.app, encoding, self.factories[encoding], self.minimum_size
+        )
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, factory: Callable, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.factory = factory
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_with_compression)
+
+    def _skip(self, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "")
+        return (
+            "content-encoding" in headers
+            or "content-range" in headers
+            or self.start_message["status"] in (204, 206, 304)
+            or content_type.startswith(INCOMPRESSIBLE_TYPES)
+        )
+
+    async def send_with_compression(self, message: Message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            self.passthrough = self._skip(Headers(raw=message["headers"]))
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            if self.start_message is not None:
+                await self.send(self.start_message)
+                self.start_message = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            headers = MutableHeaders(raw=self.start_message["headers"])
+
+            if not more_body and len(body) < self.minimum_size:
+                await self.send(self.start_message)
+                self.start_message = None
+                await self.send(message)
+                self.passthrough = True
+                return
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            self.encoder = self.factory()
+
+            if not more_body:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                self.start_message = None
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+            self.start_message = None
+
+        data = self.encoder.compress(body) if body else b""
+        if not more_body:
+            data += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
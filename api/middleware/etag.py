@@ -0,0 +1,26 @@
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response
+
+from .wire_format import negotiate_media_type, render
+
+
+def conditional_response(request: Request, content: Any) -> Response:
+    """Serialize content in the negotiated format with an ETag, answering 304 when If-None-Match matches
+
+    Unset model fields are omitted so sparse fieldsets stay sparse. The ETag
+    hashes the encoded body, so JSON and MessagePack copies get distinct tags.
+    """
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    body = render(content, media_type)
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in candidates or etag in candidates:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type=media_type, headers=headers)
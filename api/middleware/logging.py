@@ -1,31 +1,125 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import random
 import structlog
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
+# Event keys that carry a request duration in milliseconds
+DURATION_KEYS = ("search_time", "search_time_ms", "duration_ms")
+ALWAYS_LOGGED_LEVELS = {"warning", "error", "critical", "exception"}
 
-def setup_logging(log_level: str = "INFO") -> None:
-    """Setup structured logging for the application"""
-    
-    # Configure standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, log_level.upper(), logging.INFO),
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class SampleLogs:
+    """Drop a share of success-path info/debug events
+
+    Warnings and errors always pass, as do events whose duration is at or
+    above ``slow_ms`` (tagged ``slow=True``). Kept sampled events carry
+    ``sample_rate`` so counts can be scaled back up.
+    """
+
+    def __init__(self, rate: float = 1.0, slow_ms: Optional[float] = None):
+        self.rate = rate
+        self.slow_ms = slow_ms
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        if method_name in ALWAYS_LOGGED_LEVELS:
+            return event_dict
+
+        if self.slow_ms is not None:
+            for key in DURATION_KEYS:
+                duration = event_dict.get(key)
+                if isinstance(duration, (int, float)) and duration >= self.slow_ms:
+                    event_dict["slow"] = True
+                    return event_dict
+
+        if self.rate >= 1.0:
+            return event_dict
+        if random.random() >= self.rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = self.rate
+        return event_dict
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hand records to the listener thread untouched and never block the caller
+
+    The stock handler formats records before queueing, which would run the
+    renderer on the caller's thread. When the queue is full the record is
+    dropped and counted instead of waiting.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(
+    log_level: str = "INFO",
+    sample_rate: float = 1.0,
+    slow_ms: Optional[float] = None,
+    queue_size: int = 10000,
+) -> None:
+    """Setup structured logging for the application
+
+    Callers only run the cheap processors and enqueue the event; JSON
+    rendering and the stdout write happen on a background listener thread.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+    else:
+        atexit.register(_stop_listener)
+
+    renderer = structlog.stdlib.ProcessorFormatter(
+        processor=structlog.processors.JSONRenderer(),
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+        ],
     )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(renderer)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+    # Configure standard library logging
+    root = logging.getLogger()
+    root.handlers = [NonBlockingQueueHandler(log_queue)]
+    root.setLevel(getattr(logging, log_level.upper(), logging.INFO))
 
     # Configure structlog
     structlog.configure(
         processors=[
+            structlog.contextvars.merge_contextvars,
             structlog.stdlib.filter_by_level,
+            SampleLogs(sample_rate, slow_ms),
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
+            # Exceptions must be captured on the thread that raised them
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -34,6 +128,14 @@ def setup_logging(log_level: str = "INFO") -> None:
     )
 
 
+def _stop_listener():
+    """Flush queued records on interpreter exit"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str = None) -> structlog.BoundLogger:
     """Get a configured logger instance"""
-    return structlog.get_logger(name)
\ No newline at end of file
+    return structlog.get_logger(name)
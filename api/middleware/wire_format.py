@@ -0,0 +1,80 @@
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:  # Optional wire format
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Names clients use for MessagePack; we answer with MSGPACK_MEDIA_TYPE
+MSGPACK_ALIASES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """MessagePack when the client weights it above JSON and it is installed, else JSON
+
+    Ties (including ``*/*`` and a missing header) go to JSON so browsers and
+    plain HTTP clients see no change.
+    """
+    if not accept or msgpack is None:
+        return JSON_MEDIA_TYPE
+
+    weights: Dict[str, float] = {}
+    for part in accept.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            param = param.strip()
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        weights[name] = max(q, weights.get(name, 0.0))
+
+    wildcard = weights.get("application/*", weights.get("*/*", 0.0))
+    json_q = weights.get(JSON_MEDIA_TYPE, wildcard)
+    msgpack_q = max((weights[name] for name in MSGPACK_ALIASES if name in weights), default=wildcard)
+    return MSGPACK_MEDIA_TYPE if msgpack_q > json_q else JSON_MEDIA_TYPE
+
+
+def encodable(content: Any) -> Any:
+    """Plain JSON-compatible data for content; unset model fields are omitted"""
+    if isinstance(content, BaseModel):
+        return content.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    return jsonable_encoder(content, by_alias=True, exclude_unset=True)
+
+
+def render(content: Any, media_type: str) -> bytes:
+    data = encodable(content)
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(data, use_bin_type=True)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def negotiated_response(request: Request, http_response: Response, content: Any) -> Any:
+    """Return content as-is for JSON clients, or a MessagePack response for those that ask
+
+    Leaving JSON to FastAPI keeps response_model handling unchanged for the
+    default path. Headers already set on the injected ``http_response`` (e.g.
+    rate-limit headers) are copied over, since FastAPI drops them when a
+    route returns its own Response.
+    """
+    http_response.headers["Vary"] = "Accept"
+    media_type = negotiate_media_type(request.headers.get("accept"))
+    if media_type == JSON_MEDIA_TYPE:
+        return content
+    return Response(
+        content=render(content, media_type),
+        media_type=media_type,
+        headers=dict(http_response.headers),
+    )
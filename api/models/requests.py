@@ -1,20 +1,116 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field, field_validator
+from typing import Annotated, Optional, Dict, Any, List, Literal, Union, get_args
+
+# Optional TableInfo fields a client can ask for; table_id and table_name are always returned
+TableField = Literal[
+    "description",
+    "relevance_score",
+    "row_count",
+    "column_count",
+    "schema",
+    "sample_data",
+    "metadata",
+]
+TABLE_FIELDS = list(get_args(TableField))
+
+# Interactive queries are scheduled ahead of bulk ones when inference is contended
+Priority = Literal["interactive", "bulk"]
+
+# Session ids are embedded in store keys (session:<id>, session:<id>:pool), so no ":"
+SESSION_ID_PATTERN = r"^[A-Za-z0-9_.-]{1,128}$"
+
+# Index names become directory and file names under the storage path, so no "/" or leading "."
+INDEX_NAME_PATTERN = r"^[A-Za-z0-9_][A-Za-z0-9_.-]*$"
+IndexName = Annotated[str, Field(pattern=INDEX_NAME_PATTERN)]
+
+# quick: in-process ANN only; balanced: Pneuma as configured; thorough: wider LLM rerank pool
+SearchMode = Literal["quick", "balanced", "thorough"]
 
 class QueryRequest(BaseModel):
     query: str = Field(..., description="Natural language query")
-    index_name: str = Field(default="default", description="Index to search in")
+    index_name: str = Field(default="default", pattern=INDEX_NAME_PATTERN, description="Index to search in")
     k: int = Field(default=5, ge=1, le=20, description="Number of results to return")
     n: int = Field(default=5, ge=1, le=20, description="Multiplier for candidate generation")
     alpha: float = Field(default=0.5, ge=0.0, le=1.0, description="Hybrid search weight")
-    session_id: Optional[str] = Field(default=None, description="Session ID for context")
+    session_id: Optional[str] = Field(default=None, pattern=SESSION_ID_PATTERN, description="Session ID for context")
+    fields: Optional[List[TableField]] = Field(default=None, description="Table fields to return (default: all)")
+    priority: Priority = Field(default="interactive", description="Scheduling lane (interactive, bulk)")
+    refine: bool = Field(default=False, description="Rerank the session's previous candidates instead of searching again, keeping this search's candidates for the next follow-up (needs session_id)")
+    timeout_ms: Optional[int] = Field(default=None, ge=1, description="Give up on the query after this long (overrides the X-Request-Timeout header)")
+    mode: SearchMode = Field(default="balanced", description="Speed/quality trade-off (quick, balanced, thorough)")
+
+class AlphaSweepRequest(BaseModel):
+    query: str = Field(..., description="Natural language query")
+    index_name: str = Field(default="default", pattern=INDEX_NAME_PATTERN, description="Index to search in")
+    k: int = Field(default=5, ge=1, le=20, description="Number of results per alpha")
+    n: int = Field(default=5, ge=1, le=20, description="Multiplier for candidate generation")
+    alphas: List[float] = Field(..., min_length=1, max_length=21, description="Hybrid search weights to rank with")
+    fields: Optional[List[TableField]] = Field(default=None, description="Table fields to return (default: all)")
+    priority: Priority = Field(default="interactive", description="Scheduling lane (interactive, bulk)")
+    session_id: Optional[str] = Field(default=None, pattern=SESSION_ID_PATTERN, description="Session ID used for rate limiting")
+    timeout_ms: Optional[int] = Field(default=None, ge=1, description="Give up on the sweep after this long (overrides the X-Request-Timeout header)")
+
+    @field_validator("alphas")
+    @classmethod
+    def check_alphas(cls, alphas: List[float]) -> List[float]:
+        if any(a < 0.0 or a > 1.0 for a in alphas):
+            raise ValueError("alphas must be between 0 and 1")
+        return alphas
+
+class FederatedQueryRequest(BaseModel):
+    query: str = Field(..., description="Natural language query")
+    index_names: Union[Literal["all"], List[IndexName]] = Field(default="all", description="Indexes to search, or \"all\"")
+    k: int = Field(default=5, ge=1, le=20, description="Number of results to return across all indexes")
+    n: int = Field(default=5, ge=1, le=20, description="Multiplier for candidate generation")
+    alpha: float = Field(default=0.5, ge=0.0, le=1.0, description="Hybrid search weight")
+    session_id: Optional[str] = Field(default=None, pattern=SESSION_ID_PATTERN, description="Session ID for context")
+    fields: Optional[List[TableField]] = Field(default=None, description="Table fields to return (default: all)")
+    priority: Priority = Field(default="interactive", description="Scheduling lane (interactive, bulk)")
+    timeout_ms: Optional[int] = Field(default=None, ge=1, description="Give up on the whole query after this long (overrides the X-Request-Timeout header)")
+    index_timeout_ms: Optional[int] = Field(default=None, ge=1, description="Skip indexes that take longer than this (default: FEDERATED_INDEX_TIMEOUT_SECONDS)")
+    mode: SearchMode = Field(default="balanced", description="Speed/quality trade-off (quick, balanced, thorough)")
+
+    @field_validator("index_names")
+    @classmethod
+    def check_index_names(cls, index_names):
+        if isinstance(index_names, list) and not index_names:
+            raise ValueError("index_names must list at least one index or be \"all\"")
+        return index_names
 
 class TableDetailsRequest(BaseModel):
     table_id: str = Field(..., description="Table identifier")
     include_sample_data: bool = Field(default=True, description="Include sample rows")
     sample_size: int = Field(default=10, ge=1, le=100, description="Number of sample rows")
+    fields: Optional[List[TableField]] = Field(default=None, description="Table fields to return (default: all)")
+
+class TableBatchRequest(BaseModel):
+    table_ids: List[str] = Field(..., min_length=1, description="Table identifiers, returned in this order")
+    index_name: Optional[str] = Field(default=None, pattern=INDEX_NAME_PATTERN, description="Index to look in (default: all)")
+    include_sample_data: bool = Field(default=False, description="Include sample rows")
+    sample_size: int = Field(default=10, ge=1, le=100, description="Number of sample rows")
+    fields: Optional[List[TableField]] = Field(default=None, description="Table fields to return (default: all)")
+
+class TableUpsertRequest(BaseModel):
+    table_name: str = Field(..., description="Human-readable table name")
+    description: Optional[str] = Field(default=None, description="Table description used for search")
+    row_count: Optional[int] = Field(default=None, ge=0, description="Number of rows")
+    column_count: Optional[int] = Field(default=None, ge=0, description="Number of columns")
+    table_schema: Optional[List[Dict[str, Any]]] = Field(default=None, alias="schema", description="Column definitions")
+    sample_data: Optional[List[Dict[str, Any]]] = Field(default=None, description="Sample rows")
+    metadata: Optional[Dict[str, Any]] = Field(default=None, description="Additional metadata")
+
+class IngestRequest(BaseModel):
+    source_dir: str = Field(..., description="Directory of CSV/Parquet files to ingest")
+    index_name: str = Field(default="default", pattern=INDEX_NAME_PATTERN, description="Index to ingest into")
+    workers: Optional[int] = Field(default=None, ge=1, le=64, description="Profiling processes (default: CPU count)")
 
 class ExportRequest(BaseModel):
     table_ids: List[str] = Field(..., description="List of table IDs to export")
-    format: str = Field(default="json", description="Export format (json, csv)")
-    include_metadata: bool = Field(default=True, description="Include table metadata")
\ No newline at end of file
+    format: str = Field(default="json", pattern="^(json|csv|markdown)$", description="Export format (json, csv, markdown)")
+    include_metadata: bool = Field(default=True, description="Include table metadata")
+    gzip: bool = Field(default=False, description="Gzip the export stream on the fly")
+
+class SessionExportRequest(BaseModel):
+    session_id: str = Field(..., pattern=SESSION_ID_PATTERN, description="Session whose search results are exported")
+    format: str = Field(default="json", pattern="^(json|csv|markdown)$", description="Export format (json, csv, markdown)")
+    gzip: bool = Field(default=False, description="Gzip the export stream on the fly")
\ No newline at end of file
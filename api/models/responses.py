@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 from datetime import datetime
 
 
@@ -13,6 +13,22 @@ class TableInfo(BaseModel):
     table_schema: Optional[List[Dict[str, Any]]] = Field(None, alias="schema")
     sample_data: Optional[List[Dict[str, Any]]] = None
     metadata: Optional[Dict[str, Any]] = None
+    index_name: Optional[str] = None  # Index the table came from, in federated results
+
+
+class TableLookup(BaseModel):
+    table_id: str
+    found: bool
+    table: Optional[TableInfo] = None
+    # Why a miss happened: "deleted" by an index update, or "not_cataloged" when
+    # no search result or index update has reported the table's metadata yet
+    reason: Optional[Literal["deleted", "not_cataloged"]] = None
+
+
+class TableBatchResponse(BaseModel):
+    tables: List[TableLookup]  # One entry per requested id, in request order
+    found: int
+    not_found: List[str]
 
 
 class QueryResponse(BaseModel):
@@ -22,6 +38,41 @@ class QueryResponse(BaseModel):
     total_results: int
     search_time_ms: float
     timestamp: datetime
+    refined: Optional[bool] = None
+    mode: Optional[str] = None  # Mode that answered, when one was requested
+
+
+class IndexSearchStatus(BaseModel):
+    index_name: str
+    status: str  # ok, timeout or error
+    results: int = 0
+    search_time_ms: float
+    error: Optional[str] = None
+
+
+class FederatedQueryResponse(BaseModel):
+    query: str
+    session_id: Optional[str] = None
+    results: List[TableInfo]
+    total_results: int
+    search_time_ms: float
+    timestamp: datetime
+    partial: bool  # True when some index timed out or failed
+    indexes: List[IndexSearchStatus]
+
+
+class AlphaRanking(BaseModel):
+    alpha: float
+    results: List[TableInfo]
+
+
+class AlphaSweepResponse(BaseModel):
+    query: str
+    rankings: List[AlphaRanking]
+    candidate_count: int
+    retrievals: int
+    search_time_ms: float
+    timestamp: datetime
 
 
 class HealthResponse(BaseModel):
@@ -30,6 +81,7 @@ class HealthResponse(BaseModel):
     version: str
     pneuma_status: str
     redis_status: str
+    session_store: Optional[str] = None
 
 
 class IndexInfo(BaseModel):
@@ -42,3 +94,21 @@ class IndexInfo(BaseModel):
 class IndexListResponse(BaseModel):
     indexes: List[IndexInfo]
     default_index: str
+
+
+
+class ExportJobResponse(BaseModel):
+    job_id: str
+    kind: str
+    format: str
+    status: str
+    tables_total: Optional[int] = None
+    tables_done: int = 0
+    progress: float = 0.0
+    tables_exported: List[str] = []
+    download_url: Optional[str] = None
+    file_size: Optional[int] = None
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    error: Optional[str] = None
\ No newline at end of file
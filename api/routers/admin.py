@@ -1,19 +1,44 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Depends, Path, Query
+from fastapi.responses import JSONResponse
+from typing import TYPE_CHECKING, Dict, Any, Optional
 import structlog
 from datetime import datetime
+import os
 
-from ..services.pneuma_service import PneumaService
+from ..config import settings
+from ..dependencies import (
+    get_cache_warmer,
+    get_health_monitor,
+    get_index_update_service,
+    get_ingestion_job_service,
+    get_pneuma_service,
+    get_session_service,
+)
+from ..models.requests import INDEX_NAME_PATTERN, IngestRequest, TableUpsertRequest
+from ..services.deadlines import shed_stats
+from ..services.health_monitor import HealthMonitor
 from ..services.session_service import SessionService
 
+# Type hints only; importing the app must not load the search stack (numpy, models)
+if TYPE_CHECKING:
+    from ..services.cache_warmer import CacheWarmer
+    from ..services.index_updates import IndexUpdateService
+    from ..services.ingestion import IngestionJobService
+    from ..services.pneuma_service import PneumaService
+
 logger = structlog.get_logger()
 router = APIRouter()
 
+INDEX_NAME = Path(..., pattern=INDEX_NAME_PATTERN, description="Index to update")
+
 
 @router.get("/status")
 async def admin_status(
-    pneuma_service: PneumaService = Depends(),
-    session_service: SessionService = Depends()
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
+    session_service: SessionService = Depends(get_session_service),
+    monitor: HealthMonitor = Depends(get_health_monitor),
 ):
     """Get system status for admin"""
     
@@ -22,20 +47,24 @@ async def admin_status(
         status = {
             "timestamp": datetime.utcnow().isoformat(),
             "pneuma_initialized": pneuma_service.initialized,
+            "pneuma_backend": pneuma_service.status(),
+            "delta_segments": {
+                name: pneuma_service.delta.segment(name).stats()
+                for name in pneuma_service.delta.index_names()
+            },
+            # Cached by the health monitor rather than pinged per request
             "services": {
-                "pneuma": "healthy" if pneuma_service.is_healthy() else "unhealthy",
-                "redis": "unknown"  # We'll check this
-            }
+                "pneuma": monitor.status("pneuma"),
+                "redis": monitor.status("session_store"),
+                "session_store": session_service.store.name,
+            },
+            "dependencies": monitor.snapshot,
+            "circuits": {
+                "pneuma": pneuma_service.breaker.stats(),
+                "session_store": session_service.breaker.stats(),
+            },
         }
         
-        # Check Redis
-        try:
-            if session_service.redis:
-                await session_service.redis.ping()
-                status["services"]["redis"] = "healthy"
-        except:
-            status["services"]["redis"] = "unhealthy"
-            
         return status
         
     except Exception as e:
@@ -44,20 +73,36 @@ async def admin_status(
 
 
 @router.post("/reload")
-async def reload_pneuma(pneuma_service: PneumaService = Depends()):
-    """Reload Pneuma service (admin only)"""
-    
-    try:
-        await pneuma_service.initialize()
-        return {"message": "Pneuma service reloaded successfully"}
-        
-    except Exception as e:
-        logger.error("Failed to reload Pneuma service", error=str(e))
-        raise HTTPException(status_code=500, detail="Reload failed")
+async def reload_pneuma(pneuma_service: PneumaService = Depends(get_pneuma_service)):
+    """Reload Pneuma in the background while the current backend keeps serving (admin only)
+
+    Progress and the active generation are reported by ``/admin/status``.
+    """
+
+    if not pneuma_service.start_reload():
+        raise HTTPException(status_code=409, detail="A reload is already in progress")
+
+    logger.info("Pneuma reload started")
+    return JSONResponse(
+        status_code=202,
+        content={
+            "message": "Pneuma reload started",
+            "status_url": "/api/v1/admin/status",
+            "pneuma_backend": pneuma_service.status(),
+        },
+    )
+
+
+@router.post("/cache/warm", status_code=202)
+async def warm_query_cache(cache_warmer: CacheWarmer = Depends(get_cache_warmer)):
+    """Start a cache warming pass now (admin only)"""
+    if not cache_warmer.trigger():
+        raise HTTPException(status_code=409, detail="Cache warming already in progress")
+    return {"message": "Cache warming started", "last_run": cache_warmer.last_run}
 
 
 @router.get("/indexes")
-async def list_all_indexes(pneuma_service: PneumaService = Depends()):
+async def list_all_indexes(pneuma_service: PneumaService = Depends(get_pneuma_service)):
     """List all available indexes with details"""
     
     try:
@@ -81,25 +126,217 @@ async def list_all_indexes(pneuma_service: PneumaService = Depends()):
         raise HTTPException(status_code=500, detail="Failed to retrieve indexes")
 
 
+def queue_index_update(
+    index_update_service: IndexUpdateService,
+    index_name: str,
+    op: str,
+    table_id: str,
+    table: Optional[TableUpsertRequest] = None,
+) -> JSONResponse:
+    """Queue an incremental index change and answer 202 with its operation state"""
+    from ..services.index_updates import IndexUpdateQueueFull
+
+    payload = None
+    if table is not None:
+        payload = dict(table.model_dump(by_alias=True, exclude_none=True), table_id=table_id)
+
+    try:
+        operation = index_update_service.submit(index_name, op, table_id, payload)
+    except IndexUpdateQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    logger.info("Index update queued", index=index_name, op=op, table_id=table_id)
+    return JSONResponse(status_code=202, content=operation)
+
+
+@router.post("/indexes/{index_name}/tables/{table_id}")
+@router.put("/indexes/{index_name}/tables/{table_id}")
+async def upsert_index_table(
+    table_id: str,
+    table: TableUpsertRequest,
+    index_name: str = INDEX_NAME,
+    index_update_service: IndexUpdateService = Depends(get_index_update_service)
+):
+    """Add or replace one table in a live index (admin only)
+
+    The table is embedded in the background and lands in the index's delta
+    segment, which is searched alongside the base index.
+    """
+    return queue_index_update(index_update_service, index_name, "upsert", table_id, table)
+
+
+@router.delete("/indexes/{index_name}/tables/{table_id}")
+async def delete_index_table(
+    table_id: str,
+    index_name: str = INDEX_NAME,
+    index_update_service: IndexUpdateService = Depends(get_index_update_service)
+):
+    """Remove one table from a live index (admin only)"""
+    return queue_index_update(index_update_service, index_name, "delete", table_id)
+
+
+@router.get("/indexes/{index_name}/updates/{op_id}")
+async def get_index_update(
+    op_id: str,
+    index_name: str = INDEX_NAME,
+    index_update_service: IndexUpdateService = Depends(get_index_update_service)
+):
+    """Get the state of a queued index change"""
+    operation = index_update_service.get_operation(op_id)
+    if operation is None or operation["index_name"] != index_name:
+        raise HTTPException(status_code=404, detail=f"Index update {op_id} not found")
+    return operation
+
+
+@router.post("/indexes/{index_name}/compact")
+async def compact_index_delta(
+    index_name: str = INDEX_NAME,
+    index_update_service: IndexUpdateService = Depends(get_index_update_service)
+):
+    """Fold an index's delta log into its segment snapshot now (admin only)"""
+
+    try:
+        folded = await index_update_service.compact(index_name)
+        return {"index_name": index_name, "entries_compacted": folded}
+
+    except Exception as e:
+        logger.error("Delta compaction failed", index=index_name, error=str(e))
+        raise HTTPException(status_code=500, detail="Compaction failed")
+
+
+@router.post("/ingest", status_code=202)
+async def start_ingestion(
+    request: IngestRequest,
+    ingestion_job_service: IngestionJobService = Depends(get_ingestion_job_service)
+):
+    """Ingest a directory of CSV/Parquet tables into an index in the background (admin only)
+
+    Reruns resume from the job's manifest, skipping files already ingested.
+    """
+    source_dir = os.path.realpath(request.source_dir)
+    if settings.ingest_root:
+        root = os.path.realpath(settings.ingest_root)
+        if os.path.commonpath([root, source_dir]) != root:
+            raise HTTPException(status_code=403, detail="Source directory is outside the ingest root")
+    if not os.path.isdir(source_dir):
+        raise HTTPException(status_code=400, detail=f"Source directory not found: {request.source_dir}")
+
+    from ..services.ingestion import IngestionJobConflict
+
+    try:
+        job = ingestion_job_service.start(source_dir, request.index_name, request.workers)
+    except IngestionJobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    logger.info("Ingestion job started", job_id=job["job_id"], index=request.index_name)
+    return job
+
+
+@router.get("/ingest/{job_id}")
+async def get_ingestion_job(
+    job_id: str,
+    ingestion_job_service: IngestionJobService = Depends(get_ingestion_job_service)
+):
+    """Get the progress of an ingestion job"""
+    job = ingestion_job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Ingestion job {job_id} not found")
+    return job
+
+
+@router.get("/sessions/active")
+async def count_active_sessions(
+    window_minutes: Optional[int] = Query(default=None, ge=1, le=60 * 24 * 30),
+    session_service: SessionService = Depends(get_session_service)
+):
+    """Count sessions active within the window (from the activity index)"""
+    window_minutes = window_minutes or settings.session_active_window_minutes
+
+    try:
+        count = await session_service.count_active_sessions(window_minutes * 60)
+        return {"window_minutes": window_minutes, "active_sessions": count}
+
+    except Exception as e:
+        logger.error("Failed to count active sessions", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to count active sessions")
+
+
+@router.get("/sessions/idle")
+async def list_idle_sessions(
+    idle_minutes: int = Query(default=60, ge=1),
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    session_service: SessionService = Depends(get_session_service)
+):
+    """List sessions idle for at least idle_minutes, least recently active first"""
+
+    try:
+        sessions = await session_service.list_idle_sessions(idle_minutes * 60, limit, offset)
+        return {
+            "idle_minutes": idle_minutes,
+            "sessions": [
+                {
+                    "session_id": session_id,
+                    "last_activity": datetime.utcfromtimestamp(score).isoformat(),
+                }
+                for session_id, score in sessions
+            ],
+        }
+
+    except Exception as e:
+        logger.error("Failed to list idle sessions", error=str(e))
+        raise HTTPException(status_code=500, detail="Failed to list idle sessions")
+
+
+@router.post("/sessions/expire")
+async def expire_idle_sessions(
+    idle_minutes: int = Query(..., ge=1),
+    session_service: SessionService = Depends(get_session_service)
+):
+    """Delete every session idle for at least idle_minutes (admin only)"""
+
+    try:
+        deleted = await session_service.expire_idle_sessions(idle_minutes * 60)
+        logger.info("Expired idle sessions", idle_minutes=idle_minutes, deleted=deleted)
+        return {"idle_minutes": idle_minutes, "deleted": deleted}
+
+    except Exception as e:
+        logger.error("Failed to expire idle sessions", error=str(e))
+        raise HTTPException(status_code=500, detail="Session expiry failed")
+
+
+@router.post("/sessions/sweep", status_code=202)
+async def sweep_sessions(session_service: SessionService = Depends(get_session_service)):
+    """Reconcile the session activity index with a throttled SCAN (admin only)"""
+    if not session_service.start_sweep():
+        raise HTTPException(status_code=409, detail="A session sweep is already running")
+    return {"message": "Session sweep started", "last_sweep": session_service.last_sweep}
+
+
 @router.delete("/sessions/{session_id}")
 async def delete_session(
     session_id: str,
-    session_service: SessionService = Depends()
+    session_service: SessionService = Depends(get_session_service)
 ):
     """Delete a specific session (admin only)"""
-    
+
     try:
-        # This would need to be implemented in session_service
-        # For now, just return success
-        return {"message": f"Session {session_id} deleted"}
-        
+        deleted = await session_service.delete_session(session_id)
+
     except Exception as e:
         logger.error("Failed to delete session", error=str(e))
         raise HTTPException(status_code=500, detail="Session deletion failed")
 
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+    return {"message": f"Session {session_id} deleted"}
+
 
 @router.get("/metrics")
-async def get_system_metrics():
+async def get_system_metrics(
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
+    session_service: SessionService = Depends(get_session_service),
+):
     """Get basic system metrics"""
     
     try:
@@ -107,8 +344,13 @@ async def get_system_metrics():
         metrics = {
             "uptime_seconds": 3600,  # Mock value
             "total_queries": 150,    # Mock value  
-            "active_sessions": 5,    # Mock value
+            "active_sessions": await session_service.count_active_sessions(
+                settings.session_active_window_minutes * 60
+            ),
             "memory_usage_mb": 512,  # Mock value
+            "inference": pneuma_service.executor.stats(),
+            # Work dropped after its deadline passed or its client disconnected
+            "shed": shed_stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
         
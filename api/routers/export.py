@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Tuple
+import os
+import structlog
+
+from ..dependencies import get_export_job_service, get_pneuma_service, get_session_service
+from ..models.requests import ExportRequest, SessionExportRequest
+from ..models.responses import ExportJobResponse
+from ..services.export_jobs import ExportJobService, ExportQueueFull
+from ..services.export_service import ExportService, encode_stream, gzip_stream
+from ..services.session_service import SessionService
+
+# Type hints only; importing the app must not load the search stack (numpy, models)
+if TYPE_CHECKING:
+    from ..services.pneuma_service import PneumaService
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+def get_export_service(
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
+    session_service: SessionService = Depends(get_session_service),
+) -> ExportService:
+    return ExportService(pneuma_service, session_service)
+
+
+def _streaming_response(chunks, format: str, filename: str, gzip: bool) -> StreamingResponse:
+    """Wrap a text chunk generator in a chunked download response"""
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{ExportService.EXTENSIONS[format]}"',
+        "Cache-Control": "no-store",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        body = gzip_stream(chunks)
+    else:
+        body = encode_stream(chunks)
+
+    return StreamingResponse(
+        body,
+        media_type=ExportService.CONTENT_TYPES[format],
+        headers=headers,
+    )
+
+
+@router.post("/export/metadata")
+async def export_metadata(
+    request: ExportRequest,
+    export_service: ExportService = Depends(get_export_service),
+):
+    """Stream metadata for the requested tables, one table at a time"""
+    logger.info(
+        "Streaming metadata export",
+        table_count=len(request.table_ids),
+        format=request.format,
+    )
+
+    records = export_service.iter_table_records(request.table_ids, request.include_metadata)
+    chunks = export_service.stream_tables(records, request.format)
+    filename = f"pneuma_metadata_{datetime.utcnow():%Y%m%d_%H%M%S}"
+    return _streaming_response(chunks, request.format, filename, request.gzip)
+
+
+@router.post("/export/session")
+async def export_session(
+    request: SessionExportRequest,
+    export_service: ExportService = Depends(get_export_service),
+):
+    """Stream the search history recorded for a session"""
+    logger.info(
+        "Streaming session export",
+        session_id=request.session_id,
+        format=request.format,
+    )
+
+    records = export_service.iter_session_records(request.session_id)
+    chunks = export_service.stream_session(request.session_id, records, request.format)
+    filename = f"pneuma_session_{request.session_id}"
+    return _streaming_response(chunks, request.format, filename, request.gzip)
+
+
+def _job_response(request: Request, job: Dict[str, Any]) -> ExportJobResponse:
+    """Convert stored job state to the public response, hiding local file paths"""
+    tables_total = job.get("tables_total")
+    if job["status"] == "completed":
+        progress = 1.0
+    elif tables_total:
+        progress = min(job["tables_done"] / tables_total, 1.0)
+    else:
+        progress = 0.0
+
+    download_url = None
+    if job["status"] == "completed":
+        download_url = str(request.url_for("download_export_artifact", job_id=job["job_id"]))
+
+    return ExportJobResponse(
+        job_id=job["job_id"],
+        kind=job["kind"],
+        format=job["format"],
+        status=job["status"],
+        tables_total=tables_total,
+        tables_done=job["tables_done"],
+        progress=progress,
+        tables_exported=job["tables_exported"],
+        download_url=download_url,
+        file_size=job.get("file_size"),
+        created_at=job["created_at"],
+        completed_at=job.get("completed_at"),
+        expires_at=job.get("expires_at"),
+        error=job.get("error"),
+    )
+
+
+async def _submit(
+    request: Request, job_service: ExportJobService, kind: str, format: str, gzip: bool, params: Dict[str, Any]
+) -> ExportJobResponse:
+    try:
+        job = await job_service.submit(kind, format, gzip, params)
+    except ExportQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return _job_response(request, job)
+
+
+@router.post("/export/jobs/metadata", response_model=ExportJobResponse, status_code=202)
+async def create_metadata_export_job(
+    request: ExportRequest,
+    http_request: Request,
+    job_service: ExportJobService = Depends(get_export_job_service),
+):
+    """Queue a metadata export that is written to disk in the background"""
+    return await _submit(
+        http_request,
+        job_service,
+        "metadata",
+        request.format,
+        request.gzip,
+        {"table_ids": request.table_ids, "include_metadata": request.include_metadata},
+    )
+
+
+@router.post("/export/jobs/session", response_model=ExportJobResponse, status_code=202)
+async def create_session_export_job(
+    request: SessionExportRequest,
+    http_request: Request,
+    job_service: ExportJobService = Depends(get_export_job_service),
+):
+    """Queue a session results export that is written to disk in the background"""
+    return await _submit(
+        http_request,
+        job_service,
+        "session",
+        request.format,
+        request.gzip,
+        {"session_id": request.session_id},
+    )
+
+
+@router.get("/export/jobs/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    job_id: str,
+    http_request: Request,
+    job_service: ExportJobService = Depends(get_export_job_service),
+):
+    """Poll the status and progress of an export job"""
+    job = await job_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found or expired")
+    return _job_response(http_request, job)
+
+
+def _parse_range(header: str, size: int) -> Tuple[int, int]:
+    """Parse a single 'bytes=start-end' range into inclusive offsets"""
+    units, _, spec = header.partition("=")
+    if units.strip() != "bytes" or "," in spec:
+        raise ValueError("Only single byte ranges are supported")
+
+    start_str, _, end_str = spec.strip().partition("-")
+    if not start_str:
+        start = max(size - int(end_str), 0)
+        end = size - 1
+    else:
+        start = int(start_str)
+        end = min(int(end_str), size - 1) if end_str else size - 1
+
+    if start > end or start >= size:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _iter_file(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = fh.read(min(DOWNLOAD_CHUNK_BYTES, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+@router.get("/export/jobs/{job_id}/download", name="download_export_artifact")
+async def download_export_artifact(
+    job_id: str,
+    http_request: Request,
+    job_service: ExportJobService = Depends(get_export_job_service),
+):
+    """Download a finished export artifact, honouring HTTP range requests"""
+    job = await job_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found or expired")
+    if job["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Export job is {job['status']}")
+
+    path = job["file_path"]
+    if (job.get("expires_at") or "") < datetime.utcnow().isoformat() or not os.path.exists(path):
+        raise HTTPException(status_code=410, detail="Export artifact has expired")
+
+    size = os.path.getsize(path)
+    filename = job_service.artifact_filename(job)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    media_type = "application/gzip" if job["gzip"] else ExportService.CONTENT_TYPES[job["format"]]
+
+    range_header = http_request.headers.get("range")
+    if not range_header:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_iter_file(path, 0, size), media_type=media_type, headers=headers)
+
+    try:
+        start, end = _parse_range(range_header, size)
+    except ValueError:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    length = end - start + 1
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        _iter_file(path, start, length),
+        status_code=206,
+        media_type=media_type,
+        headers=headers,
+    )
@@ -1,36 +1,41 @@
+from __future__ import annotations
+
 from fastapi import APIRouter, Depends
 from datetime import datetime
+from typing import TYPE_CHECKING
 import structlog
 
 from ..models.responses import HealthResponse
-from ..services.pneuma_service import PneumaService
+from ..dependencies import get_health_monitor, get_pneuma_service, get_session_service
+from ..services.health_monitor import HealthMonitor
 from ..services.session_service import SessionService
 
+# Type hints only; importing the app must not load the search stack (numpy, models)
+if TYPE_CHECKING:
+    from ..services.pneuma_service import PneumaService
+
 logger = structlog.get_logger()
 router = APIRouter()
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check(
-    pneuma_service: PneumaService = Depends(),
-    session_service: SessionService = Depends(),
+    session_service: SessionService = Depends(get_session_service),
+    monitor: HealthMonitor = Depends(get_health_monitor),
 ):
-    """Health check endpoint"""
+    """Health check endpoint
 
-    # Check Pneuma service
-    pneuma_status = "healthy" if pneuma_service.is_healthy() else "unhealthy"
-
-    # Check Redis connection
-    redis_status = "healthy"
-    try:
-        if session_service.redis:
-            await session_service.redis.ping()
-    except:
-        redis_status = "unhealthy"
+    Served from the health monitor's last probe round; nothing is pinged here.
+    """
+    pneuma_status = monitor.status("pneuma")
+    redis_status = monitor.status("session_store")
 
+    statuses = {pneuma_status, redis_status}
     overall_status = (
         "healthy"
-        if all([pneuma_status == "healthy", redis_status == "healthy"])
+        if statuses == {"healthy"}
+        else "degraded"
+        if statuses <= {"healthy", "degraded"}
         else "unhealthy"
     )
 
@@ -40,14 +45,29 @@ async def health_check(
         version="0.1.0",
         pneuma_status=pneuma_status,
         redis_status=redis_status,
+        session_store=session_service.store.name,
     )
 
 
 @router.get("/health/pneuma")
-async def pneuma_health(pneuma_service: PneumaService = Depends()):
+async def pneuma_health(
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
+    monitor: HealthMonitor = Depends(get_health_monitor),
+):
     """Detailed Pneuma service health"""
     return {
-        "status": "healthy" if pneuma_service.is_healthy() else "unhealthy",
+        "status": monitor.status("pneuma"),
         "initialized": pneuma_service.initialized,
+        "probe": monitor.snapshot.get("pneuma"),
+        "circuit": pneuma_service.breaker.stats(),
         "timestamp": datetime.utcnow(),
     }
+
+
+@router.get("/health/dependencies")
+async def dependencies_health(monitor: HealthMonitor = Depends(get_health_monitor)):
+    """Last probe result and probe latency history per dependency"""
+    return {
+        name: dict(snapshot, history=monitor.latency_history(name))
+        for name, snapshot in monitor.snapshot.items()
+    }
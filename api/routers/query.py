@@ -1,52 +1,238 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from typing import TYPE_CHECKING, Dict, Any, Optional
+import math
 import structlog
 
-from ..models.requests import QueryRequest
-from ..models.responses import QueryResponse
-from ..services.pneuma_service import PneumaService
+from ..config import settings
+from ..models.requests import AlphaSweepRequest, FederatedQueryRequest, QueryRequest
+from ..models.responses import AlphaSweepResponse, FederatedQueryResponse, QueryResponse
+from ..dependencies import get_pneuma_service, get_rate_limiter, get_session_service
+from ..middleware.wire_format import negotiated_response
+from ..services.deadlines import DEADLINE_HEADER, Deadline, RequestAbandoned, deadline_scope
+from ..services.health_monitor import CircuitOpenError
+from ..services.rate_limiter import RateLimiter
 from ..services.session_service import SessionService
 
+# Type hints only; importing the app must not load the search stack (numpy, models)
+if TYPE_CHECKING:
+    from ..services.pneuma_service import PneumaService
+
 logger = structlog.get_logger()
 router = APIRouter()
 
-@router.post("/query", response_model=QueryResponse)
+# Clients send one key for every attempt of a call; retries are recorded in the session once
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+async def admit(
+    http_request: Request,
+    http_response: Response,
+    rate_limiter: RateLimiter,
+    session_id: Optional[str],
+    lane: str,
+    cost: int = 1,
+):
+    """Charge the client's and session's token buckets, rejecting with 429 when one is empty"""
+    identity = RateLimiter.client_identity(
+        http_request.headers.get("x-api-key"),
+        http_request.client.host if http_request.client else None,
+    )
+    decision = await rate_limiter.acquire(identity, lane, cost, session_id=session_id)
+
+    if not decision.allowed:
+        logger.warning("Rate limit exceeded", identity=identity, session_id=session_id, lane=lane)
+        raise HTTPException(
+            status_code=429, detail="Rate limit exceeded", headers=decision.headers()
+        )
+    http_response.headers.update(decision.headers())
+
+def abandoned(error: RequestAbandoned) -> HTTPException:
+    """504 once the deadline has passed; 499 (client closed request) after a disconnect"""
+    if error.reason == "client_disconnected":
+        return HTTPException(status_code=499, detail="Client closed request")
+    logger.warning("Request deadline exceeded", stage=error.stage)
+    return HTTPException(status_code=504, detail=f"Deadline exceeded before {error.stage}")
+
+def unavailable(error: CircuitOpenError) -> HTTPException:
+    """503 for a dependency whose circuit is open, with a Retry-After hint"""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))},
+    )
+
+@router.post("/query", response_model=QueryResponse, response_model_exclude_unset=True)
 async def query_tables(
     request: QueryRequest,
-    pneuma_service: PneumaService = Depends(),
-    session_service: SessionService = Depends()
+    http_request: Request,
+    http_response: Response,
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
+    session_service: SessionService = Depends(get_session_service),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter)
 ):
     """Query Pneuma for relevant tables based on natural language"""
     
+    await admit(http_request, http_response, rate_limiter, request.session_id, request.priority)
+    deadline = Deadline.from_request(http_request.headers.get(DEADLINE_HEADER), request.timeout_ms)
+
     try:
-        # Execute query
-        response = await pneuma_service.query_tables(request)
+        async with deadline_scope(deadline, http_request):
+            response = None
+
+            # Rerank the previous candidate pool for follow-ups when it still fits
+            if request.refine and request.session_id:
+                pool = await session_service.get_candidate_pool(request.session_id)
+                if pool and pool["index_name"] == request.index_name:
+                    response, vectors = await pneuma_service.refine_tables(request, pool)
+                    if vectors is not None:
+                        pool["vectors"] = vectors
+                        await session_service.save_candidate_pool(request.session_id, pool)
+
+            if response is None and request.refine and request.session_id:
+                # Execute query, keeping its candidate pool for later refinement
+                response, records = await pneuma_service.query_with_pool(request)
+                await session_service.save_candidate_pool(
+                    request.session_id,
+                    {"index_name": request.index_name, "query": request.query, "records": records},
+                )
+                response.refined = False
+            elif response is None:
+                # Execute query
+                response = await pneuma_service.query_tables(request)
         
-        # Store in session if session_id provided
-        if request.session_id:
-            await session_service.add_query_to_session(
-                request.session_id,
-                request.query,
-                response
-            )
+            # Store in session if session_id provided
+            if request.session_id:
+                await session_service.add_query_to_session(
+                    request.session_id,
+                    request.query,
+                    response,
+                    request.index_name,
+                    request_id=http_request.headers.get(IDEMPOTENCY_HEADER),
+                )
         
-        logger.info(
-            "Query executed successfully",
-            query=request.query,
-            results_count=len(response.results),
-            search_time=response.search_time_ms
-        )
+            logger.info(
+                "Query executed successfully",
+                query=request.query,
+                results_count=len(response.results),
+                search_time=response.search_time_ms
+            )
         
-        return response
+            return negotiated_response(http_request, http_response, response)
         
+    except RequestAbandoned as e:
+        raise abandoned(e)
+    except CircuitOpenError as e:
+        raise unavailable(e)
     except Exception as e:
         logger.error("Query execution failed", error=str(e), query=request.query)
         raise HTTPException(status_code=500, detail=f"Query failed: {str(e)}")
 
+@router.post(
+    "/query/alpha-sweep",
+    response_model=AlphaSweepResponse,
+    response_model_exclude_unset=True,
+)
+async def query_alpha_sweep(
+    request: AlphaSweepRequest,
+    http_request: Request,
+    http_response: Response,
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter)
+):
+    """Rank the same query under several hybrid weights from one candidate pool"""
+
+    await admit(http_request, http_response, rate_limiter, request.session_id, request.priority)
+    deadline = Deadline.from_request(http_request.headers.get(DEADLINE_HEADER), request.timeout_ms)
+
+    try:
+        async with deadline_scope(deadline, http_request):
+            response = await pneuma_service.query_alpha_sweep(request)
+
+            logger.info(
+                "Alpha sweep executed successfully",
+                query=request.query,
+                alphas=len(request.alphas),
+                candidates=response.candidate_count,
+                search_time=response.search_time_ms
+            )
+
+            return negotiated_response(http_request, http_response, response)
+
+    except RequestAbandoned as e:
+        raise abandoned(e)
+    except CircuitOpenError as e:
+        raise unavailable(e)
+    except Exception as e:
+        logger.error("Alpha sweep failed", error=str(e), query=request.query)
+        raise HTTPException(status_code=500, detail=f"Alpha sweep failed: {str(e)}")
+
+@router.post(
+    "/query/federated",
+    response_model=FederatedQueryResponse,
+    response_model_exclude_unset=True,
+)
+async def query_federated(
+    request: FederatedQueryRequest,
+    http_request: Request,
+    http_response: Response,
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
+    session_service: SessionService = Depends(get_session_service),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter)
+):
+    """Search several indexes at once and merge their results into one ranking"""
+
+    if isinstance(request.index_names, list) and len(request.index_names) > settings.federated_max_indexes:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.federated_max_indexes} indexes per federated query",
+        )
+
+    # Each index searched costs as much as a single-index query
+    if isinstance(request.index_names, list):
+        searched = len(set(request.index_names))
+    else:
+        searched = min(len(await pneuma_service.get_available_indexes()), settings.federated_max_indexes)
+    await admit(
+        http_request, http_response, rate_limiter, request.session_id, request.priority, max(1, searched)
+    )
+    deadline = Deadline.from_request(http_request.headers.get(DEADLINE_HEADER), request.timeout_ms)
+
+    try:
+        async with deadline_scope(deadline, http_request):
+            response = await pneuma_service.query_federated(request)
+
+            if request.session_id:
+                await session_service.add_query_to_session(
+                    request.session_id,
+                    request.query,
+                    response,
+                    request_id=http_request.headers.get(IDEMPOTENCY_HEADER),
+                )
+
+            logger.info(
+                "Federated query executed successfully",
+                query=request.query,
+                indexes=len(response.indexes),
+                partial=response.partial,
+                results_count=len(response.results),
+                search_time=response.search_time_ms
+            )
+
+            return negotiated_response(http_request, http_response, response)
+
+    except RequestAbandoned as e:
+        raise abandoned(e)
+    except CircuitOpenError as e:
+        raise unavailable(e)
+    except Exception as e:
+        logger.error("Federated query failed", error=str(e), query=request.query)
+        raise HTTPException(status_code=500, detail=f"Federated query failed: {str(e)}")
+
 @router.get("/query/session/{session_id}")
 async def get_session_queries(
     session_id: str,
-    session_service: SessionService = Depends()
+    session_service: SessionService = Depends(get_session_service)
 ):
     """Get query history for a session"""
     
@@ -1,17 +1,35 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import TYPE_CHECKING, List, Optional
 import structlog
 
-from ..models.requests import TableDetailsRequest
-from ..models.responses import IndexListResponse
-from ..services.pneuma_service import PneumaService
+from ..config import settings
+from ..models.requests import TableBatchRequest, TableDetailsRequest, TABLE_FIELDS
+from ..models.responses import IndexListResponse, TableBatchResponse, TableInfo
+from ..dependencies import get_pneuma_service
+from ..middleware.etag import conditional_response
+
+# Type hints only; importing the app must not load the search stack (numpy, models)
+if TYPE_CHECKING:
+    from ..services.pneuma_service import PneumaService
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+MISS_DETAILS = {
+    "deleted": "Table not found: it was deleted from the index",
+    "not_cataloged": (
+        "Table not found: its metadata is only known once a search or an "
+        "index update has returned it"
+    ),
+}
+
 
 @router.get("/indexes", response_model=IndexListResponse)
-async def list_indexes(pneuma_service: PneumaService = Depends()):
+async def list_indexes(
+    request: Request, pneuma_service: PneumaService = Depends(get_pneuma_service)
+):
     """List available Pneuma indexes"""
     try:
         indexes = await pneuma_service.get_available_indexes()
@@ -28,28 +46,91 @@ async def list_indexes(pneuma_service: PneumaService = Depends()):
                 }
             )
 
-        return IndexListResponse(indexes=index_list, default_index="default")
+        return conditional_response(
+            request, IndexListResponse(indexes=index_list, default_index="default")
+        )
 
     except Exception as e:
         logger.error("Failed to list indexes", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to retrieve indexes")
 
 
-@router.get("/table/{table_id}")
+@router.post("/tables/batch", response_model=TableBatchResponse)
+async def get_tables_batch(
+    batch: TableBatchRequest,
+    request: Request,
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
+):
+    """Get details for many tables in one call
+
+    Tables come back in request order; ids that cannot be resolved are
+    marked ``found: false`` with a ``reason`` instead of failing the whole batch.
+    """
+    if len(batch.table_ids) > settings.tables_batch_max_ids:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.tables_batch_max_ids} table ids per batch",
+        )
+
+    try:
+        wanted = batch.fields if batch.fields is not None else TABLE_FIELDS
+        if not batch.include_sample_data:
+            wanted = [f for f in wanted if f != "sample_data"]
+
+        lookups = await pneuma_service.lookup_tables(
+            batch.table_ids,
+            fields=wanted,
+            sample_size=batch.sample_size,
+            index_name=batch.index_name,
+        )
+        not_found = [lookup.table_id for lookup in lookups if not lookup.found]
+        return conditional_response(
+            request,
+            TableBatchResponse(tables=lookups, found=len(lookups) - len(not_found), not_found=not_found),
+        )
+
+    except Exception as e:
+        logger.error("Failed to get table batch", error=str(e), tables=len(batch.table_ids))
+        raise HTTPException(status_code=500, detail="Failed to retrieve table details")
+
+
+@router.get("/table/{table_id}", response_model=TableInfo)
+@router.get("/tables/{table_id}", response_model=TableInfo)
 async def get_table_details(
     table_id: str,
+    request: Request,
     include_sample_data: bool = True,
     sample_size: int = 10,
-    pneuma_service: PneumaService = Depends(),
+    fields: Optional[str] = None,
+    pneuma_service: PneumaService = Depends(get_pneuma_service),
 ):
-    """Get detailed information about a specific table"""
+    """Get detailed information about a specific table
+
+    ``fields`` is a comma-separated subset of table fields to return.
+    """
     try:
-        table_info = await pneuma_service.get_table_details(table_id)
+        try:
+            details = TableDetailsRequest(
+                table_id=table_id,
+                include_sample_data=include_sample_data,
+                sample_size=sample_size,
+                fields=fields.split(",") if fields else None,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        wanted = details.fields if details.fields is not None else TABLE_FIELDS
+        if not details.include_sample_data:
+            wanted = [f for f in wanted if f != "sample_data"]
+
+        (lookup,) = await pneuma_service.lookup_tables(
+            [table_id], fields=wanted, sample_size=details.sample_size
+        )
 
-        if not table_info:
-            raise HTTPException(status_code=404, detail="Table not found")
+        if not lookup.found:
+            raise HTTPException(status_code=404, detail=MISS_DETAILS[lookup.reason])
 
-        return table_info
+        return conditional_response(request, lookup.table)
 
     except HTTPException:
         raise
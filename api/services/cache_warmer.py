@@ -0,0 +1,168 @@
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+import structlog
+
+from ..config import settings
+from ..models.requests import QueryRequest
+from .pneuma_service import PneumaService
+from .query_cache import normalize_query
+from .session_service import SessionService
+
+logger = structlog.get_logger()
+
+WARM_LOCK_KEY = "qcache:warm_lock"
+SESSION_SCAN_BATCH = 200
+
+
+class CacheWarmer:
+    """Pre-computes the most frequent recent queries into the query cache
+
+    Queries are mined from session histories (and optionally a query log
+    file), counted per index, and the top-N per index are replayed on the bulk
+    lane at a fixed rate. Warming pauses whenever interactive queries are
+    waiting, and a Redis lock keeps concurrent API workers from warming the
+    same entries twice.
+    """
+
+    def __init__(self, pneuma_service: PneumaService, session_service: SessionService):
+        self.pneuma_service = pneuma_service
+        self.session_service = session_service
+        self.task: Optional[asyncio.Task] = None
+        self.manual_task: Optional[asyncio.Task] = None
+        self.last_run: Dict[str, Any] = {}
+
+    async def start(self):
+        self.task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def trigger(self) -> bool:
+        """Start a warming pass in the background; False if one is already running"""
+        if self.manual_task is not None and not self.manual_task.done():
+            return False
+        self.manual_task = asyncio.create_task(self.warm())
+        return True
+
+    async def _loop(self):
+        await asyncio.sleep(settings.cache_warm_startup_delay_seconds)
+        while True:
+            try:
+                await self.warm()
+            except Exception as e:
+                logger.error("Cache warming failed", error=str(e))
+            await asyncio.sleep(settings.cache_warm_interval_seconds)
+
+    async def warm(self) -> Dict[str, Any]:
+        """Run one warming pass; returns a summary of what was warmed"""
+        if not await self._acquire_lock():
+            logger.info("Cache warming skipped, another worker holds the lock")
+            return {"skipped": True}
+
+        started = time.time()
+        counts = Counter()
+        counts.update(await self.mine_sessions())
+        if settings.cache_warm_query_log:
+            counts.update(self.mine_query_log(settings.cache_warm_query_log))
+
+        top = self.top_queries(counts, settings.cache_warm_top_n)
+        warmed = 0
+        interval = 1.0 / settings.cache_warm_rate_per_second
+        for index_name, queries in top.items():
+            for query in queries:
+                await self._wait_for_idle()
+                try:
+                    # Same pool size as session queries, so both paths hit
+                    await self.pneuma_service.query_with_pool(
+                        QueryRequest(query=query, index_name=index_name, priority="bulk")
+                    )
+                    warmed += 1
+                except Exception as e:
+                    logger.warning("Failed to warm query", query=query, error=str(e))
+                await asyncio.sleep(interval)
+
+        self.last_run = {
+            "started_at": started,
+            "duration_seconds": round(time.time() - started, 3),
+            "distinct_queries": len(counts),
+            "warmed": warmed,
+            "indexes": {name: len(queries) for name, queries in top.items()},
+        }
+        logger.info("Cache warming finished", **self.last_run)
+        return self.last_run
+
+    async def _acquire_lock(self) -> bool:
+        redis = self.session_service.redis
+        if redis is None:
+            return True
+        try:
+            ttl = max(int(settings.cache_warm_interval_seconds), 60)
+            return bool(await redis.set(WARM_LOCK_KEY, os.getpid(), nx=True, ex=ttl))
+        except Exception as e:
+            logger.warning("Cache warm lock unavailable", error=str(e))
+            return True
+
+    async def _wait_for_idle(self):
+        """Yield to live traffic: wait while interactive queries are queued"""
+        while self.pneuma_service.executor.stats()["queued"]["interactive"] > 0:
+            await asyncio.sleep(0.5)
+
+    async def mine_sessions(self) -> Counter:
+        """Count recent queries per (index, normalized query) across sessions"""
+        counts = Counter()
+        cutoff = (datetime.utcnow() - timedelta(hours=settings.cache_warm_lookback_hours)).isoformat()
+        async for batch in self.session_service.store.iter_histories(SESSION_SCAN_BATCH):
+            self._count_sessions(batch, cutoff, counts)
+        return counts
+
+    def _count_sessions(self, values: Iterable[Optional[str]], cutoff: str, counts: Counter):
+        for value in values:
+            if not value:
+                continue
+            for entry in json.loads(value).get("queries", []):
+                if entry.get("timestamp", "") >= cutoff and entry.get("query"):
+                    index_name = entry.get("index_name") or settings.pneuma_default_index
+                    counts[(index_name, normalize_query(entry["query"]))] += 1
+
+    def mine_query_log(self, path: str) -> Counter:
+        """Count queries in a log file of JSON lines ({"query", "index_name"}) or plain text"""
+        counts = Counter()
+        if not os.path.exists(path):
+            logger.warning("Query log not found", path=path)
+            return counts
+
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                index_name, query = settings.pneuma_default_index, line
+                if line.startswith("{"):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    query = record.get("query")
+                    index_name = record.get("index_name") or index_name
+                if query:
+                    counts[(index_name, normalize_query(query))] += 1
+        return counts
+
+    @staticmethod
+    def top_queries(counts: Counter, top_n: int) -> Dict[str, List[str]]:
+        """Most frequent queries per index, most frequent first"""
+        by_index: Dict[str, Counter] = {}
+        for (index_name, query), count in counts.items():
+            by_index.setdefault(index_name, Counter())[query] = count
+        return {
+            index_name: [query for query, _ in queries.most_common(top_n)]
+            for index_name, queries in by_index.items()
+        }
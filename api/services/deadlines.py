@@ -0,0 +1,158 @@
+import asyncio
+import contextvars
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+# Seconds the client is still willing to wait, e.g. its own timeout minus time spent
+DEADLINE_HEADER = "X-Request-Timeout"
+
+current_deadline: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar(
+    "current_deadline", default=None
+)
+
+# Work dropped because nobody was waiting for it any more, by reason and stage
+shed_counts: Counter = Counter()
+# Requests given up on, by reason
+abandoned_counts: Counter = Counter()
+_shed_lock = threading.Lock()
+
+
+class RequestAbandoned(Exception):
+    """The request's deadline passed or its client went away"""
+
+    def __init__(self, reason: str, stage: str):
+        super().__init__(f"Request abandoned ({reason}) before {stage}")
+        self.reason = reason
+        self.stage = stage
+
+
+def record_shed(reason: str, stage: str):
+    with _shed_lock:
+        shed_counts[(reason, stage)] += 1
+
+
+def _count_abandoned(reason: str):
+    with _shed_lock:
+        abandoned_counts[reason] += 1
+
+
+def shed_stats() -> Dict[str, Any]:
+    by_reason: Counter = Counter()
+    by_stage: Counter = Counter()
+    with _shed_lock:
+        counts = list(shed_counts.items())
+        abandoned = dict(abandoned_counts)
+    for (reason, stage), count in counts:
+        by_reason[reason] += count
+        by_stage[stage] += count
+    return {
+        "abandoned_requests": abandoned,
+        "shed_work": {"total": sum(by_reason.values()), "by_reason": dict(by_reason), "by_stage": dict(by_stage)},
+    }
+
+
+class Deadline:
+    """When a request stops being worth working on
+
+    Expires at a monotonic time, or earlier when cancelled because the client
+    disconnected. Plain attribute reads, so worker threads can check it too.
+    """
+
+    def __init__(self, timeout: Optional[float]):
+        self.expires_at = time.monotonic() + timeout if timeout is not None else None
+        self.cancel_reason: Optional[str] = None
+
+    @classmethod
+    def from_request(cls, header: Optional[str], timeout_ms: Optional[int] = None) -> "Deadline":
+        """Deadline from the request body, else the header, else the server default"""
+        timeout = settings.request_default_timeout_seconds
+        if timeout_ms is not None:
+            timeout = timeout_ms / 1000
+        elif header:
+            try:
+                timeout = float(header)
+            except ValueError:
+                logger.warning("Ignoring malformed deadline header", value=header)
+        if timeout is not None:
+            timeout = min(max(timeout, 0.0), settings.request_max_timeout_seconds)
+        return cls(timeout)
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why the request was abandoned, or None if it is still live"""
+        if self.cancel_reason is not None:
+            return self.cancel_reason
+        if self.expires_at is not None and time.monotonic() >= self.expires_at:
+            return "deadline_exceeded"
+        return None
+
+    def cancel(self, reason: str = "client_disconnected"):
+        if self.cancel_reason is None:
+            self.cancel_reason = reason
+
+    def check(self, stage: str):
+        """Raise RequestAbandoned (and count the shed stage) if the request is over"""
+        reason = self.reason
+        if reason is not None:
+            record_shed(reason, stage)
+            raise RequestAbandoned(reason, stage)
+
+
+def check_deadline(stage: str):
+    """Check the current request's deadline between stages of work"""
+    deadline = current_deadline.get()
+    if deadline is not None:
+        deadline.check(stage)
+
+
+@asynccontextmanager
+async def deadline_scope(deadline: Deadline, request: Any = None):
+    """Run the body under a deadline, cancelling it on expiry or client disconnect
+
+    A watcher cancels the enclosing task when the deadline passes or the
+    client disconnects, so awaited inference jobs that have not started are
+    dropped from the queue. The cancellation surfaces as RequestAbandoned.
+    """
+    task = asyncio.current_task()
+    token = current_deadline.set(deadline)
+    poll = settings.deadline_disconnect_poll_ms / 1000
+
+    async def watch():
+        while True:
+            remaining = deadline.remaining()
+            if remaining is not None and remaining <= 0:
+                break
+            await asyncio.sleep(poll if remaining is None else min(poll, remaining))
+            if request is not None and await request.is_disconnected():
+                deadline.cancel()
+                break
+        task.cancel()
+
+    watcher = asyncio.create_task(watch())
+    try:
+        yield deadline
+    except asyncio.CancelledError:
+        reason = deadline.reason
+        if reason is None or not watcher.done():
+            raise
+        _count_abandoned(reason)
+        raise RequestAbandoned(reason, "request")
+    except RequestAbandoned as e:
+        _count_abandoned(e.reason)
+        raise
+    finally:
+        watcher.cancel()
+        current_deadline.reset(token)
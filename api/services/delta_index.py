@@ -0,0 +1,242 @@
+import base64
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+import structlog
+
+from ..config import settings
+from .table_metadata import INDEX_NAME_PATTERN
+
+logger = structlog.get_logger()
+
+SNAPSHOT_VECTORS = "segment.npz"
+SNAPSHOT_META = "segment.json"
+LOG_FILE = "log.jsonl"
+LOCK_FILE = ".lock"
+
+
+def _encode_vector(vector: np.ndarray) -> str:
+    return base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_vector(data: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+
+class DeltaSegment:
+    """Tables added, updated or removed in one index since its base was built
+
+    Changes are appended to a JSON-lines log. Compaction folds the log into an
+    npz/json snapshot, dropping superseded rows, and truncates it. Every API
+    worker tails the same files, so a change written through one worker is
+    visible to the others on their next search.
+
+    ``tombstones`` holds every table id whose base-index copy must be hidden:
+    deleted tables and tables that now have a newer copy in this segment.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        self.vectors: Dict[str, np.ndarray] = {}
+        self.tombstones: Set[str] = set()
+        self.log_entries = 0
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_ids: List[str] = []
+        self._snapshot_mtime: Optional[int] = None
+        self._log_offset = 0
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize writers across worker processes"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @property
+    def version(self) -> Tuple[Optional[int], int]:
+        """Changes whenever the segment's contents do"""
+        return self._snapshot_mtime, self._log_offset
+
+    def is_empty(self) -> bool:
+        return not self.tables and not self.tombstones
+
+    def refresh(self):
+        """Pick up snapshot and log changes written by any worker"""
+        with self._lock:
+            try:
+                snapshot_mtime = os.stat(self._path(SNAPSHOT_META)).st_mtime_ns
+            except FileNotFoundError:
+                snapshot_mtime = None
+            try:
+                log_size = os.path.getsize(self._path(LOG_FILE))
+            except FileNotFoundError:
+                log_size = 0
+
+            # A new snapshot or a truncated log means compaction ran; replay is
+            # idempotent, so reloading and re-reading the log from 0 is safe
+            if snapshot_mtime != self._snapshot_mtime or log_size < self._log_offset:
+                self._load_snapshot()
+                self._snapshot_mtime = snapshot_mtime
+                self._log_offset = 0
+                self.log_entries = 0
+
+            if log_size > self._log_offset:
+                self._replay_log()
+
+    def _load_snapshot(self):
+        self.tables, self.vectors, self.tombstones = {}, {}, set()
+        self._matrix = None
+
+        meta_path = self._path(SNAPSHOT_META)
+        if not os.path.exists(meta_path):
+            return
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with np.load(self._path(SNAPSHOT_VECTORS), allow_pickle=False) as data:
+            ids, matrix = data["ids"].tolist(), data["vectors"]
+
+        self.tables = meta["tables"]
+        self.tombstones = set(meta["tombstones"])
+        self.vectors = {table_id: matrix[i] for i, table_id in enumerate(ids)}
+
+    def _replay_log(self):
+        with open(self._path(LOG_FILE), "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read()
+
+        # Only apply complete lines; a writer may be mid-append
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+                self.log_entries += 1
+        self._log_offset += end
+
+    def _apply(self, entry: Dict[str, Any]):
+        table_id = entry["table_id"]
+        if entry["op"] == "upsert":
+            self.tables[table_id] = entry["table"]
+            self.vectors[table_id] = _decode_vector(entry["vector"])
+        else:
+            self.tables.pop(table_id, None)
+            self.vectors.pop(table_id, None)
+        self.tombstones.add(table_id)
+        self._matrix = None
+
+    def append(self, entries: List[Dict[str, Any]]):
+        """Durably log a batch of changes, then apply them"""
+        lines = []
+        for entry in entries:
+            record = dict(entry)
+            if "vector" in record:
+                record["vector"] = _encode_vector(record["vector"])
+            lines.append(json.dumps(record) + "\n")
+
+        with self._file_lock():
+            with open(self._path(LOG_FILE), "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+        self.refresh()
+
+    def compact(self) -> int:
+        """Fold the log into a fresh snapshot; returns the entries folded in"""
+        with self._file_lock():
+            self.refresh()
+            with self._lock:
+                folded = self.log_entries
+                if folded == 0:
+                    return 0
+
+                ids = list(self.vectors)
+                matrix = (
+                    np.stack([self.vectors[i] for i in ids])
+                    if ids else np.empty((0, 0), dtype=np.float32)
+                )
+                tmp_vectors = self._path(SNAPSHOT_VECTORS + ".tmp.npz")
+                np.savez(tmp_vectors, ids=np.array(ids, dtype=str), vectors=matrix)
+                os.replace(tmp_vectors, self._path(SNAPSHOT_VECTORS))
+
+                # The metadata file is written last; its mtime signals readers
+                tmp_meta = self._path(SNAPSHOT_META + ".tmp")
+                with open(tmp_meta, "w", encoding="utf-8") as f:
+                    json.dump({"tables": self.tables, "tombstones": sorted(self.tombstones)}, f)
+                os.replace(tmp_meta, self._path(SNAPSHOT_META))
+
+                open(self._path(LOG_FILE), "w").close()
+                self._snapshot_mtime = os.stat(self._path(SNAPSHOT_META)).st_mtime_ns
+                self._log_offset = 0
+                self.log_entries = 0
+
+        logger.info("Compacted delta segment", directory=self.directory, entries=folded)
+        return folded
+
+    def search(self, query_vector: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Top-k delta tables by cosine similarity to a normalized query vector"""
+        with self._lock:
+            if self._matrix is None:
+                self._matrix_ids = list(self.vectors)
+                self._matrix = (
+                    np.stack([self.vectors[i] for i in self._matrix_ids])
+                    if self._matrix_ids else None
+                )
+            matrix, ids = self._matrix, self._matrix_ids
+
+        if matrix is None:
+            return []
+
+        scores = matrix @ np.asarray(query_vector, dtype=np.float32)
+        k = min(k, len(ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(ids[i], float(scores[i])) for i in top]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tables": len(self.tables),
+            "tombstones": len(self.tombstones),
+            "log_entries": self.log_entries,
+        }
+
+
+class DeltaIndex:
+    """Delta segments for every index, stored under <pneuma_storage_path>/delta"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(settings.pneuma_storage_path, "delta")
+        self.segments: Dict[str, DeltaSegment] = {}
+
+    def segment(self, index_name: str, create: bool = False) -> Optional[DeltaSegment]:
+        """The segment for an index, or None if it has never been written to"""
+        if not INDEX_NAME_PATTERN.match(index_name):
+            raise ValueError(f"Invalid index name: {index_name!r}")
+        segment = self.segments.get(index_name)
+        if segment is None:
+            directory = os.path.join(self.root, index_name)
+            if not create and not os.path.isdir(directory):
+                return None
+            segment = self.segments[index_name] = DeltaSegment(directory)
+        segment.refresh()
+        return segment
+
+    def index_names(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if INDEX_NAME_PATTERN.match(name) and os.path.isdir(os.path.join(self.root, name))
+        )
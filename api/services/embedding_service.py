@@ -0,0 +1,151 @@
+import copy
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional
+import numpy as np
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+
+def table_text(table: Dict[str, Any]) -> str:
+    """Text embedded for a table: its name, description and column names"""
+    parts = [table.get("table_name", ""), table.get("description") or ""]
+    columns = [c.get("name", "") for c in table.get("schema") or [] if isinstance(c, dict)]
+    if columns:
+        parts.append("Columns: " + ", ".join(columns))
+    return "\n".join(p for p in parts if p)
+
+
+class EmbeddingService:
+    """Sentence embeddings from the same model Pneuma uses for dense retrieval
+
+    The model is loaded on first use so API workers that never touch the
+    delta index or incremental updates do not pay for it. With
+    EMBEDDING_QUANTIZE_QUERIES, queries go through an int8 dynamically
+    quantized copy of the model (cached on disk) while tables stay fp32.
+
+    When MODEL_HOST_SOCKET is set, texts are encoded by the shared model host
+    instead, so API workers hold no copy of the model at all.
+    """
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        quantize_queries: Optional[bool] = None,
+        host_socket: Optional[str] = None,
+    ):
+        self.model_path = model_path or settings.pneuma_embed_path
+        self.quantize_queries = (
+            settings.embedding_quantize_queries if quantize_queries is None else quantize_queries
+        )
+        # "" forces a local model; the model host itself encodes that way
+        self.host_socket = settings.model_host_socket if host_socket is None else host_socket
+        self._model: Any = None
+        self._query_model: Any = None
+        self._host: Any = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Any:
+        with self._lock:
+            if self._model is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                except ImportError:
+                    raise RuntimeError(
+                        "sentence-transformers is required to compute table and query embeddings"
+                    )
+
+                logger.info("Loading embedding model", model=self.model_path)
+                if settings.embedding_threads:
+                    import torch
+
+                    torch.set_num_threads(settings.embedding_threads)
+                self._model = SentenceTransformer(self.model_path, device=settings.embedding_device)
+        return self._model
+
+    @property
+    def quantized_path(self) -> str:
+        """Where the int8 query model is cached; named after the source model"""
+        if settings.embedding_quantized_path:
+            return settings.embedding_quantized_path
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model_path.strip("/"))
+        return os.path.join(settings.pneuma_storage_path, "models", f"{name}.int8.pt")
+
+    def _load_quantized(self) -> Any:
+        """Load the cached int8 query model, exporting it on first use
+
+        Only the quantized weights are stored, never a pickled module, so
+        loading the cache runs no code from the storage path.
+        """
+        import torch
+
+        model = self._model or self._load()
+        with self._lock:
+            if self._query_model is not None:
+                return self._query_model
+
+            # Dynamic quantization: int8 weights for every Linear layer, activations
+            # quantized on the fly; this is where a CPU transformer spends its time
+            quantized = torch.quantization.quantize_dynamic(
+                copy.deepcopy(model).to("cpu"), {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+            path = self.quantized_path
+            meta_path = path + ".json"
+            expected = {"source": self.model_path, "torch": torch.__version__, "format": "state_dict"}
+            cached = False
+            if os.path.exists(path) and os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    cached = json.load(f) == expected
+
+            if cached:
+                logger.info("Loading quantized query encoder", path=path)
+                quantized.load_state_dict(torch.load(path, map_location="cpu", weights_only=True))
+            else:
+                logger.info("Exporting quantized query encoder", path=path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                torch.save(quantized.state_dict(), path + ".tmp")
+                os.replace(path + ".tmp", path)
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump(expected, f)
+            self._query_model = quantized
+        return self._query_model
+
+    def _remote(self) -> Any:
+        """Client for the shared model host, connected on first use"""
+        with self._lock:
+            if self._host is None:
+                from .model_host import RemotePneuma
+
+                self._host = RemotePneuma(self.host_socket)
+        return self._host
+
+    def encode_query(self, texts: List[str]) -> np.ndarray:
+        """Embeddings for search queries, from the int8 model when enabled (blocking)"""
+        if self.host_socket:
+            return self._remote().encode(texts, query=True)
+        # Dynamic int8 quantization only has CPU kernels
+        if not self.quantize_queries or settings.embedding_device not in (None, "cpu"):
+            return self.encode(texts)
+        return self._encode_with(self._query_model or self._load_quantized(), texts)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Unit-normalized float32 embeddings, one row per text (blocking)"""
+        if self.host_socket:
+            return self._remote().encode(texts)
+        return self._encode_with(self._model or self._load(), texts)
+
+    def _encode_with(self, model: Any, texts: List[str]) -> np.ndarray:
+        vectors = model.encode(
+            texts,
+            batch_size=settings.embedding_batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+import structlog
+
+from ..config import settings
+from .export_service import ExportService, encode_stream, gzip_stream
+from .session_service import SessionService
+
+if TYPE_CHECKING:
+    from .pneuma_service import PneumaService
+
+logger = structlog.get_logger()
+
+JOB_KEY_PREFIX = "export_job:"
+WRITE_BUFFER_BYTES = 256 * 1024
+STATE_SAVE_INTERVAL_SECONDS = 1.0
+SHUTDOWN_ERROR = "Interrupted by server shutdown, submit the export again"
+
+
+class ExportQueueFull(Exception):
+    """Raised when the export job queue cannot accept more work"""
+
+
+class ExportJobService:
+    """Background export jobs that spill their artifacts to local disk"""
+
+    def __init__(self, pneuma_service: PneumaService, session_service: SessionService):
+        self.export_service = ExportService(pneuma_service, session_service)
+        self.session_service = session_service
+        self.export_dir = settings.export_dir or os.path.join(
+            settings.pneuma_storage_path, "exports"
+        )
+        self.ttl = timedelta(hours=settings.export_artifact_ttl_hours)
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.cleanup_task: Optional[asyncio.Task] = None
+        self.local_jobs: Dict[str, Dict[str, Any]] = {}
+        # Jobs a worker has taken off the queue, by job id
+        self.active: Dict[str, Dict[str, Any]] = {}
+
+    async def start(self):
+        """Create the export directory and start the worker pool"""
+        os.makedirs(self.export_dir, exist_ok=True)
+        self.queue = asyncio.Queue(maxsize=settings.export_queue_size)
+        self.workers = [
+            asyncio.create_task(self._worker(i))
+            for i in range(settings.export_max_workers)
+        ]
+        self.cleanup_task = asyncio.create_task(self._cleanup_loop())
+        logger.info(
+            "Export job workers started",
+            workers=settings.export_max_workers,
+            export_dir=self.export_dir,
+        )
+
+    async def stop(self):
+        """Cancel workers and the cleanup loop, failing the jobs they leave unfinished"""
+        tasks = self.workers + ([self.cleanup_task] if self.cleanup_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.workers = []
+        self.cleanup_task = None
+
+        # Nothing will run these again; don't leave pollers waiting on them
+        unfinished = list(self.active.values())
+        while self.queue is not None and not self.queue.empty():
+            job, _ = self.queue.get_nowait()
+            unfinished.append(job)
+        for job in unfinished:
+            await self._fail(job, SHUTDOWN_ERROR)
+        self.active.clear()
+        if unfinished:
+            logger.warning("Export jobs interrupted by shutdown", count=len(unfinished))
+
+    async def submit(self, kind: str, format: str, gzip: bool, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue an export job and return its initial state"""
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "format": format,
+            "gzip": gzip,
+            "status": "queued",
+            "tables_total": len(params["table_ids"]) if "table_ids" in params else None,
+            "tables_done": 0,
+            "tables_exported": [],
+            "file_path": None,
+            "file_size": None,
+            "created_at": datetime.utcnow().isoformat(),
+            "completed_at": None,
+            "expires_at": None,
+            "error": None,
+        }
+
+        try:
+            self.queue.put_nowait((job, params))
+        except asyncio.QueueFull:
+            raise ExportQueueFull("Export queue is full, retry later")
+
+        await self._save(job)
+        logger.info("Export job queued", job_id=job["job_id"], kind=kind, format=format)
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load job state from Redis, or the local fallback for jobs saved during an outage"""
+        redis = self.session_service.redis
+        if redis is not None:
+            try:
+                data = await redis.get(JOB_KEY_PREFIX + job_id)
+                if data:
+                    return json.loads(data)
+            except Exception as e:
+                logger.warning("Failed to read export job from Redis", error=str(e))
+
+        return self.local_jobs.get(job_id)
+
+    def artifact_filename(self, job: Dict[str, Any]) -> str:
+        name = f"pneuma_{job['kind']}_{job['job_id']}.{ExportService.EXTENSIONS[job['format']]}"
+        return name + ".gz" if job["gzip"] else name
+
+    async def _save(self, job: Dict[str, Any]):
+        """Persist job state, keeping it for as long as its artifact lives"""
+        redis = self.session_service.redis
+        if redis is not None:
+            try:
+                await redis.set(
+                    JOB_KEY_PREFIX + job["job_id"],
+                    json.dumps(job),
+                    ex=int(self.ttl.total_seconds()),
+                )
+                # Drop any copy kept during an outage so reads don't see stale state
+                self.local_jobs.pop(job["job_id"], None)
+                return
+            except Exception as e:
+                logger.warning("Failed to store export job in Redis", error=str(e))
+
+        self.local_jobs[job["job_id"]] = job
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job, params = await self.queue.get()
+            self.active[job["job_id"]] = job
+            try:
+                await self._run(job, params)
+            except asyncio.CancelledError:
+                # Left in self.active for stop() to fail
+                raise
+            except Exception as e:
+                logger.error("Export job failed", job_id=job["job_id"], error=str(e))
+                await self._fail(job, str(e))
+            finally:
+                self.queue.task_done()
+            self.active.pop(job["job_id"], None)
+
+    async def _fail(self, job: Dict[str, Any], error: str):
+        job["status"] = "failed"
+        job["error"] = error
+        job["expires_at"] = (datetime.utcnow() + self.ttl).isoformat()
+        await self._save(job)
+
+    async def _run(self, job: Dict[str, Any], params: Dict[str, Any]):
+        job["status"] = "running"
+        await self._save(job)
+
+        if job["kind"] == "metadata":
+            records = self.export_service.iter_table_records(
+                params["table_ids"], params.get("include_metadata", True)
+            )
+            chunks = self.export_service.stream_tables(self._track(job, records), job["format"])
+        else:
+            history = await self.session_service.get_session_history(params["session_id"])
+            job["tables_total"] = len(history)
+            records = self._iter_list(history)
+            chunks = self.export_service.stream_session(
+                params["session_id"], self._track(job, records), job["format"]
+            )
+
+        body = gzip_stream(chunks) if job["gzip"] else encode_stream(chunks)
+        path = os.path.join(self.export_dir, self.artifact_filename(job))
+        file_size = await self._write_artifact(body, path)
+
+        completed_at = datetime.utcnow()
+        job.update(
+            status="completed",
+            file_path=path,
+            file_size=file_size,
+            completed_at=completed_at.isoformat(),
+            expires_at=(completed_at + self.ttl).isoformat(),
+        )
+        await self._save(job)
+        logger.info("Export job completed", job_id=job["job_id"], file_size=file_size)
+
+    async def _iter_list(self, items: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        for item in items:
+            yield item
+
+    async def _track(
+        self, job: Dict[str, Any], records: AsyncIterator[Dict[str, Any]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Count records as they stream past and persist progress periodically"""
+        exported = set(job["tables_exported"])
+        last_save = time.monotonic()
+
+        async for record in records:
+            job["tables_done"] += 1
+            if job["kind"] == "metadata":
+                if "error" not in record:
+                    job["tables_exported"].append(record["table_id"])
+            else:
+                for name in record.get("response_summary", {}).get("table_names", []):
+                    if name not in exported:
+                        exported.add(name)
+                        job["tables_exported"].append(name)
+
+            if time.monotonic() - last_save >= STATE_SAVE_INTERVAL_SECONDS:
+                await self._save(job)
+                last_save = time.monotonic()
+
+            yield record
+
+    async def _write_artifact(self, body: AsyncIterator[bytes], path: str) -> int:
+        """Write the stream to disk in buffered blocks, renaming it into place when done"""
+        loop = asyncio.get_event_loop()
+        tmp_path = path + ".part"
+        buffer = bytearray()
+        size = 0
+
+        try:
+            with open(tmp_path, "wb") as fh:
+                async for data in body:
+                    buffer += data
+                    if len(buffer) >= WRITE_BUFFER_BYTES:
+                        await loop.run_in_executor(None, fh.write, bytes(buffer))
+                        size += len(buffer)
+                        buffer.clear()
+                if buffer:
+                    await loop.run_in_executor(None, fh.write, bytes(buffer))
+                    size += len(buffer)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return size
+
+    async def _cleanup_loop(self):
+        while True:
+            await asyncio.sleep(settings.export_cleanup_interval_seconds)
+            try:
+                loop = asyncio.get_event_loop()
+                removed = await loop.run_in_executor(None, self._remove_expired_artifacts)
+                if removed:
+                    logger.info("Removed expired export artifacts", count=removed)
+            except Exception as e:
+                logger.error("Export artifact cleanup failed", error=str(e))
+
+    def _remove_expired_artifacts(self) -> int:
+        """Delete artifacts older than the TTL and forget their local job state"""
+        cutoff = time.time() - self.ttl.total_seconds()
+        removed = 0
+
+        with os.scandir(self.export_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+
+        now = datetime.utcnow().isoformat()
+        for job_id, job in list(self.local_jobs.items()):
+            if job["expires_at"] and job["expires_at"] < now:
+                del self.local_jobs[job_id]
+
+        return removed
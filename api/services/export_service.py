@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List
+import structlog
+
+from ..config import settings
+from ..models.requests import TABLE_FIELDS
+from .session_service import SessionService
+
+if TYPE_CHECKING:
+    from .pneuma_service import PneumaService
+
+logger = structlog.get_logger()
+
+TABLE_CSV_COLUMNS = [
+    "table_id",
+    "table_name",
+    "description",
+    "row_count",
+    "column_count",
+    "columns",
+    "metadata",
+    "error",
+]
+SESSION_CSV_COLUMNS = [
+    "timestamp",
+    "query",
+    "results_count",
+    "search_time_ms",
+    "table_names",
+]
+
+
+class ExportService:
+    """Service for streaming table metadata and session history exports"""
+
+    CONTENT_TYPES = {
+        "json": "application/json",
+        "csv": "text/csv",
+        "markdown": "text/markdown",
+    }
+    EXTENSIONS = {"json": "json", "csv": "csv", "markdown": "md"}
+
+    def __init__(self, pneuma_service: PneumaService, session_service: SessionService):
+        self.pneuma_service = pneuma_service
+        self.session_service = session_service
+
+    async def iter_table_records(
+        self, table_ids: List[str], include_metadata: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Fetch tables in batches so only one batch is held in memory"""
+        fields = [
+            f
+            for f in TABLE_FIELDS
+            if f != "sample_data" and (include_metadata or f != "metadata")
+        ]
+        batch_size = settings.tables_batch_max_ids
+        for start in range(0, len(table_ids), batch_size):
+            batch = table_ids[start:start + batch_size]
+            try:
+                lookups = await self.pneuma_service.lookup_tables(batch, fields=fields)
+            except Exception as e:
+                logger.error("Failed to fetch tables for export", error=str(e), tables=len(batch))
+                for table_id in batch:
+                    yield {"table_id": table_id, "error": "lookup failed"}
+                continue
+
+            for lookup in lookups:
+                if not lookup.found:
+                    yield {"table_id": lookup.table_id, "error": f"not found ({lookup.reason})"}
+                else:
+                    yield lookup.table.model_dump(by_alias=True, exclude_unset=True)
+
+    async def iter_session_records(self, session_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the query history entries of a session"""
+        for entry in await self.session_service.get_session_history(session_id):
+            yield entry
+
+    async def stream_tables(
+        self, records: AsyncIterator[Dict[str, Any]], format: str
+    ) -> AsyncIterator[str]:
+        """Serialize table records incrementally in the requested format"""
+        if format == "csv":
+            yield self._csv_row(TABLE_CSV_COLUMNS)
+            async for record in records:
+                yield self._csv_row(self._table_csv_values(record))
+        elif format == "markdown":
+            yield f"# Table Metadata Export\n\n_Generated {datetime.utcnow().isoformat()}_\n\n"
+            async for record in records:
+                yield self._table_markdown(record)
+        else:
+            async for chunk in self._json_document("tables", records):
+                yield chunk
+
+    async def stream_session(
+        self, session_id: str, records: AsyncIterator[Dict[str, Any]], format: str
+    ) -> AsyncIterator[str]:
+        """Serialize session history entries incrementally in the requested format"""
+        if format == "csv":
+            yield self._csv_row(SESSION_CSV_COLUMNS)
+            async for entry in records:
+                summary = entry.get("response_summary", {})
+                yield self._csv_row(
+                    [
+                        entry.get("timestamp"),
+                        entry.get("query"),
+                        summary.get("results_count"),
+                        summary.get("search_time_ms"),
+                        "; ".join(summary.get("table_names", [])),
+                    ]
+                )
+        elif format == "markdown":
+            yield f"# Search Results for Session `{session_id}`\n\n"
+            async for entry in records:
+                summary = entry.get("response_summary", {})
+                yield f"## {entry.get('query', '')}\n\n"
+                yield f"- **Time:** {entry.get('timestamp', 'Unknown')}\n"
+                yield f"- **Results:** {summary.get('results_count', 0)}\n"
+                for name in summary.get("table_names", []):
+                    yield f"  - {name}\n"
+                yield "\n"
+        else:
+            async for chunk in self._json_document("queries", records, session_id=session_id):
+                yield chunk
+
+    async def _json_document(
+        self, key: str, records: AsyncIterator[Dict[str, Any]], **header: Any
+    ) -> AsyncIterator[str]:
+        """Emit a JSON object whose array member is written one element at a time"""
+        header["generated_at"] = datetime.utcnow().isoformat()
+        prefix = json.dumps(header)[:-1]
+        yield f'{prefix}, "{key}": ['
+
+        count = 0
+        async for record in records:
+            yield ("," if count else "") + json.dumps(record, default=str)
+            count += 1
+
+        yield f'], "count": {count}}}'
+
+    def _csv_row(self, values: List[Any]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(values)
+        return buffer.getvalue()
+
+    def _table_csv_values(self, record: Dict[str, Any]) -> List[Any]:
+        columns = [col.get("name", "") for col in record.get("schema") or []]
+        metadata = record.get("metadata")
+        return [
+            record.get("table_id"),
+            record.get("table_name"),
+            record.get("description"),
+            record.get("row_count"),
+            record.get("column_count"),
+            "; ".join(columns),
+            json.dumps(metadata, default=str) if metadata else "",
+            record.get("error", ""),
+        ]
+
+    def _table_markdown(self, record: Dict[str, Any]) -> str:
+        if "error" in record:
+            return f"## {record['table_id']}\n\n_{record['error']}_\n\n"
+
+        result = f"## {record.get('table_name') or record['table_id']}\n\n"
+        result += f"- **ID:** `{record['table_id']}`\n"
+        result += f"- **Description:** {record.get('description') or 'No description'}\n"
+        result += f"- **Size:** {record.get('row_count', 'Unknown')} rows × {record.get('column_count', 'Unknown')} columns\n"
+
+        schema = record.get("schema") or []
+        if schema:
+            result += "\n| Column | Type | Description |\n|---|---|---|\n"
+            for col in schema:
+                result += f"| {col.get('name', '')} | {col.get('type', '')} | {col.get('description', '')} |\n"
+
+        return result + "\n"
+
+
+async def gzip_stream(chunks: AsyncIterator[str], level: int = 6) -> AsyncIterator[bytes]:
+    """Gzip a text stream on the fly, flushing after every chunk so bytes go out immediately"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        data += compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def encode_stream(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Encode a text stream to UTF-8 bytes"""
+    async for chunk in chunks:
+        yield chunk.encode("utf-8")
@@ -0,0 +1,77 @@
+import heapq
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def min_max_normalize(scores: np.ndarray) -> np.ndarray:
+    """Scale scores to [0, 1]; a constant vector maps to all ones"""
+    if scores.size == 0:
+        return scores
+    low, high = scores.min(), scores.max()
+    if high - low <= 1e-12:
+        return np.ones_like(scores)
+    return (scores - low) / (high - low)
+
+
+def align_scores(
+    candidate_ids: Sequence[str], scores: Dict[str, float]
+) -> np.ndarray:
+    """Normalized score per candidate, with candidates missing from the list scored 0"""
+    present = np.array([cid in scores for cid in candidate_ids])
+    raw = np.array([scores.get(cid, 0.0) for cid in candidate_ids], dtype=np.float64)
+    aligned = np.zeros(len(candidate_ids), dtype=np.float64)
+    if present.any():
+        aligned[present] = min_max_normalize(raw[present])
+    return aligned
+
+
+def fuse_alpha_sweep(
+    lexical: np.ndarray, dense: np.ndarray, alphas: Sequence[float], k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Fuse lexical and dense scores for every alpha at once
+
+    Returns the top-k candidate indices per alpha (shape A x k, best first)
+    and their fused scores. ``alpha`` weighs the lexical component.
+    """
+    weights = np.asarray(alphas, dtype=np.float64)[:, None]
+    fused = weights * lexical[None, :] + (1.0 - weights) * dense[None, :]
+
+    k = min(k, fused.shape[1])
+    if k == 0:
+        empty = np.empty((len(alphas), 0))
+        return empty.astype(np.int64), empty
+
+    top = np.argpartition(-fused, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(fused, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def merge_normalized(
+    ranked: Dict[str, List[Dict[str, Any]]], k: int, score_key: str = "relevance_score"
+) -> List[Tuple[str, float, Dict[str, Any]]]:
+    """Merge per-source result lists into one top-k, min-max normalizing each source first
+
+    Normalizing per source puts indexes with different score scales on the
+    same 0-1 range before they compete. Returns (source, normalized score,
+    record) tuples, best first; a table id found in several sources keeps
+    only its best entry.
+    """
+    streams = []
+    for source, records in ranked.items():
+        scores = min_max_normalize(np.array([r.get(score_key) or 0.0 for r in records], dtype=np.float64))
+        order = np.argsort(-scores, kind="stable")
+        streams.append([(float(scores[i]), source, records[i]) for i in order])
+
+    merged: List[Tuple[str, float, Dict[str, Any]]] = []
+    seen = set()
+    for score, source, record in heapq.merge(*streams, key=lambda entry: -entry[0]):
+        table_id = record.get("table_id")
+        if table_id in seen:
+            continue
+        seen.add(table_id)
+        merged.append((source, score, record))
+        if len(merged) == k:
+            break
+    return merged
@@ -0,0 +1,212 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+# Failures that mean a dependency is unreachable rather than that a call was bad
+BREAKER_ERRORS = (ConnectionError, TimeoutError, OSError)
+
+
+class CircuitOpenError(RuntimeError):
+    """A dependency's circuit is open; the call was rejected without trying it"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable (circuit open)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fail fast while a dependency is down
+
+    Opens after CIRCUIT_FAILURE_THRESHOLD consecutive failures (or when the
+    health monitor's probe fails) and rejects calls for CIRCUIT_RESET_SECONDS.
+    Then it lets one trial call through: success closes it, failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, reset_seconds: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.circuit_failure_threshold
+        self.reset_seconds = reset_seconds or settings.circuit_reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_at: Optional[float] = None
+        self.opens = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def check(self):
+        """Raise CircuitOpenError unless a call may go through now"""
+        state = self.state
+        if state == "closed":
+            return
+
+        now = time.monotonic()
+        if state == "half_open" and (self.trial_at is None or now - self.trial_at >= self.reset_seconds):
+            self.trial_at = now
+            return
+
+        self.rejected += 1
+        raise CircuitOpenError(self.name, self.retry_after())
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("Circuit closed", dependency=self.name)
+        self.failures = 0
+        self.opened_at = None
+        self.trial_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self):
+        if self.state == "closed":
+            self.opens += 1
+            logger.warning("Circuit opened", dependency=self.name, failures=self.failures)
+        self.opened_at = time.monotonic()
+        self.trial_at = None
+
+    def retry_after(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "opens": self.opens,
+            "rejected": self.rejected,
+            "retry_after_seconds": round(self.retry_after(), 3),
+        }
+
+
+class HealthMonitor:
+    """Probe dependencies in the background and serve their last known status
+
+    Health endpoints read the cached snapshot instead of pinging on every
+    call. Probe outcomes also drive each dependency's circuit breaker: a
+    failed probe opens it, a successful one closes it. A probe that returns a
+    note reports the dependency as degraded: still serving, breaker closed.
+    """
+
+    def __init__(self, pneuma_service: Any, session_service: Any):
+        self.pneuma_service = pneuma_service
+        self.session_service = session_service
+        self.probes: Dict[str, Tuple[Callable[[], Awaitable[Optional[str]]], CircuitBreaker]] = {
+            "pneuma": (self._probe_pneuma, pneuma_service.breaker),
+            "session_store": (self._probe_session_store, session_service.breaker),
+        }
+        self.history: Dict[str, Deque[Tuple[float, bool, float]]] = {
+            name: deque(maxlen=settings.health_history_size) for name in self.probes
+        }
+        self.snapshot: Dict[str, Dict[str, Any]] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Probe once so the first health request has data, then keep probing"""
+        await self.probe_all()
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.health_probe_interval_seconds)
+            try:
+                await self.probe_all()
+            except Exception as e:
+                logger.error("Health probe round failed", error=str(e))
+
+    async def _probe_pneuma(self):
+        if not self.pneuma_service.is_healthy():
+            raise RuntimeError("Pneuma service not initialized")
+        # A shared model host can die under us; an in-process backend cannot
+        pneuma = self.pneuma_service.pneuma
+        if hasattr(pneuma, "ping"):
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, pneuma.ping, settings.health_probe_timeout_seconds)
+
+    async def _probe_session_store(self) -> Optional[str]:
+        store = self.session_service.store
+        primary = getattr(store, "primary", None)
+        if primary is None:
+            await store.ping()
+            return None
+
+        # A failover store answers from its fallback; probe the store it fronts
+        try:
+            await primary.ping()
+            return None
+        except Exception as e:
+            # Sessions are still served, so the breaker stays closed
+            await store.fallback.ping()
+            return f"{primary.name} unavailable, serving from {store.fallback.name}: {str(e) or type(e).__name__}"
+
+    async def probe_all(self):
+        await asyncio.gather(*(self._probe(name) for name in self.probes))
+
+    async def _probe(self, name: str):
+        probe, breaker = self.probes[name]
+        start = time.perf_counter()
+        error = degraded = None
+        try:
+            degraded = await asyncio.wait_for(probe(), settings.health_probe_timeout_seconds)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        history = self.history[name]
+        history.append((time.time(), error is None, latency_ms))
+        if error is None:
+            if degraded and self.snapshot.get(name, {}).get("status") != "degraded":
+                logger.warning("Dependency degraded", dependency=name, detail=degraded)
+            breaker.record_success()
+        else:
+            if self.snapshot.get(name, {}).get("status") != "unhealthy":
+                logger.warning("Dependency probe failed", dependency=name, error=error)
+            breaker.trip()
+
+        import numpy as np
+
+        latencies = np.array([entry[2] for entry in history])
+        self.snapshot[name] = {
+            "status": "unhealthy" if error else "degraded" if degraded else "healthy",
+            "error": error or degraded,
+            "checked_at": history[-1][0],
+            "latency_ms": round(latency_ms, 3),
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "latency_p95_ms": round(float(np.percentile(latencies, 95)), 3),
+            "success_rate": round(sum(1 for entry in history if entry[1]) / len(history), 4),
+            "probes": len(history),
+            "circuit": breaker.stats(),
+        }
+
+    def status(self, name: str) -> str:
+        return self.snapshot.get(name, {}).get("status", "unknown")
+
+    def latency_history(self, name: str) -> list:
+        return [
+            {"timestamp": ts, "ok": ok, "latency_ms": round(latency, 3)}
+            for ts, ok, latency in self.history[name]
+        ]
@@ -0,0 +1,139 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+
+from ..config import settings
+from .embedding_service import table_text
+from .pneuma_service import PneumaService
+
+logger = structlog.get_logger()
+
+# Finished operations kept for status lookups
+MAX_TRACKED_OPERATIONS = 1000
+
+
+class IndexUpdateQueueFull(Exception):
+    """Raised when the index update queue cannot accept more work"""
+
+
+class IndexUpdateService:
+    """Applies table add/update/delete operations to delta segments
+
+    Operations are queued and applied in order by one background worker, which
+    embeds every upsert in a batch on the bulk inference lane. A separate loop
+    compacts segments whose logs have grown, without blocking queries.
+    """
+
+    def __init__(self, pneuma_service: PneumaService):
+        self.pneuma_service = pneuma_service
+        self.delta = pneuma_service.delta
+        self.embedder = pneuma_service.embedder
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.compaction_task: Optional[asyncio.Task] = None
+        self.operations: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    async def start(self):
+        self.queue = asyncio.Queue(maxsize=settings.index_update_queue_size)
+        self.worker = asyncio.create_task(self._worker())
+        self.compaction_task = asyncio.create_task(self._compaction_loop())
+        logger.info("Index update worker started", delta_root=self.delta.root)
+
+    async def stop(self):
+        tasks = [t for t in (self.worker, self.compaction_task) if t]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.worker = self.compaction_task = None
+
+    def submit(
+        self, index_name: str, op: str, table_id: str, table: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Queue an upsert or delete and return its initial state"""
+        operation = {
+            "op_id": uuid.uuid4().hex,
+            "index_name": index_name,
+            "op": op,
+            "table_id": table_id,
+            "status": "queued",
+            "submitted_at": time.time(),
+            "applied_at": None,
+            "error": None,
+        }
+
+        try:
+            self.queue.put_nowait((operation, table))
+        except asyncio.QueueFull:
+            raise IndexUpdateQueueFull("Index update queue is full, retry later")
+
+        self.operations[operation["op_id"]] = operation
+        while len(self.operations) > MAX_TRACKED_OPERATIONS:
+            self.operations.popitem(last=False)
+        return operation
+
+    def get_operation(self, op_id: str) -> Optional[Dict[str, Any]]:
+        return self.operations.get(op_id)
+
+    async def compact(self, index_name: str) -> int:
+        segment = self.delta.segment(index_name)
+        if segment is None:
+            return 0
+        return await asyncio.to_thread(segment.compact)
+
+    async def _worker(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < settings.index_update_batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            try:
+                await self._apply_batch(batch)
+            except Exception as e:
+                logger.error("Index update batch failed", error=str(e), operations=len(batch))
+                for operation, _ in batch:
+                    operation.update(status="failed", error=str(e))
+
+    async def _apply_batch(self, batch: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]):
+        for operation, _ in batch:
+            operation["status"] = "embedding"
+
+        # Embed only the changed tables, all in one call
+        upserts = [(operation, table) for operation, table in batch if operation["op"] == "upsert"]
+        vectors = []
+        if upserts:
+            vectors = await self.pneuma_service.executor.run(
+                "bulk", self.embedder.encode, [table_text(table) for _, table in upserts]
+            )
+        vector_by_op = {operation["op_id"]: vector for (operation, _), vector in zip(upserts, vectors)}
+
+        # Keep submission order within each index
+        by_index: Dict[str, List[Dict[str, Any]]] = {}
+        for operation, table in batch:
+            entry = {"op": operation["op"], "table_id": operation["table_id"]}
+            if operation["op"] == "upsert":
+                entry.update(table=table, vector=vector_by_op[operation["op_id"]])
+            by_index.setdefault(operation["index_name"], []).append(entry)
+
+        for index_name, entries in by_index.items():
+            segment = self.delta.segment(index_name, create=True)
+            await asyncio.to_thread(segment.append, entries)
+
+        applied_at = time.time()
+        for operation, _ in batch:
+            operation.update(status="applied", applied_at=applied_at)
+        logger.info("Applied index updates", operations=len(batch), indexes=list(by_index))
+
+    async def _compaction_loop(self):
+        while True:
+            await asyncio.sleep(settings.delta_compaction_interval_seconds)
+            for index_name in self.delta.index_names():
+                segment = self.delta.segment(index_name)
+                if segment is None or segment.log_entries < settings.delta_compaction_min_entries:
+                    continue
+                try:
+                    await asyncio.to_thread(segment.compact)
+                except Exception as e:
+                    logger.error("Delta compaction failed", index=index_name, error=str(e))
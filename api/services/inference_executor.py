@@ -0,0 +1,130 @@
+import asyncio
+import contextvars
+import itertools
+import queue
+import threading
+from typing import Any, Callable, Dict
+import structlog
+
+from .deadlines import RequestAbandoned, current_deadline, record_shed
+
+logger = structlog.get_logger()
+
+# Lower value runs first
+LANE_PRIORITY = {"interactive": 0, "bulk": 1}
+
+
+class InferenceExecutor:
+    """Bounded worker pool that runs interactive jobs ahead of bulk ones
+
+    Jobs wait in a single priority queue ordered by lane, then by arrival, so
+    when every worker is busy the next free one always picks up an interactive
+    job before any queued bulk job. Jobs whose request has been abandoned by
+    the time a worker picks them up are dropped without running.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self._queued = {lane: 0 for lane in LANE_PRIORITY}
+        self._shutdown = False
+        self._shed = 0
+
+    def _ensure_workers(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.max_workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"inference-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    async def run(self, lane: str, fn: Callable, *args: Any) -> Any:
+        """Run fn(*args) on the pool in the given lane and await its result
+
+        fn runs in a copy of the caller's context, so it sees the request's
+        deadline.
+        """
+        if self._shutdown:
+            raise RuntimeError("Inference executor is shut down")
+        deadline = current_deadline.get()
+        if deadline is not None:
+            deadline.check("inference_queue")
+        self._ensure_workers()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        context = contextvars.copy_context()
+        with self._lock:
+            self._queued[lane] += 1
+        self._queue.put(
+            (LANE_PRIORITY[lane], next(self._sequence), lane, fn, args, loop, future, context, deadline)
+        )
+        return await future
+
+    def _worker(self):
+        while True:
+            _, _, lane, fn, args, loop, future, context, deadline = self._queue.get()
+            if fn is None:
+                return
+
+            with self._lock:
+                self._queued[lane] -= 1
+                self._active += 1
+
+            try:
+                # Nobody is waiting for this result any more
+                reason = deadline.reason if deadline is not None else None
+                if future.cancelled() or reason is not None:
+                    with self._lock:
+                        self._shed += 1
+                    record_shed(reason or "cancelled", "inference")
+                    if not future.cancelled():
+                        loop.call_soon_threadsafe(
+                            _set_exception, future, RequestAbandoned(reason, "inference")
+                        )
+                    continue
+                try:
+                    result = context.run(fn, *args)
+                except BaseException as e:
+                    loop.call_soon_threadsafe(_set_exception, future, e)
+                else:
+                    loop.call_soon_threadsafe(_set_result, future, result)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "active": self._active,
+                "queued": dict(self._queued),
+                "shed": self._shed,
+            }
+
+    def shutdown(self):
+        """Stop workers once the jobs already queued have run"""
+        self._shutdown = True
+        for _ in self._threads:
+            # Sentinels sort after every real job
+            self._queue.put(
+                (len(LANE_PRIORITY), next(self._sequence), None, None, None, None, None, None, None)
+            )
+        self._threads = []
+
+
+def _set_result(future: asyncio.Future, result: Any):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: asyncio.Future, error: BaseException):
+    if not future.done():
+        future.set_exception(error)
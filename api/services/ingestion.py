@@ -0,0 +1,411 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import structlog
+
+from ..config import settings
+from .delta_index import DeltaIndex
+from .embedding_service import EmbeddingService, table_text
+
+logger = structlog.get_logger()
+
+TABLE_EXTENSIONS = (".csv", ".parquet")
+MANIFEST_FILE = "ingest_manifest.json"
+EXAMPLE_VALUES = 3
+
+
+class IngestionJobConflict(Exception):
+    """Raised when an ingestion job is already running for the index"""
+
+
+def discover_files(source_dir: str) -> List[str]:
+    """Table files under source_dir, as sorted paths relative to it"""
+    found = []
+    for root, _, files in os.walk(source_dir):
+        for name in files:
+            if name.lower().endswith(TABLE_EXTENSIONS):
+                found.append(os.path.relpath(os.path.join(root, name), source_dir))
+    return sorted(found)
+
+
+def file_fingerprint(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class ColumnProfile:
+    """Streaming type, null and range statistics for one column"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.nulls = 0
+        self.integers = 0
+        self.floats = 0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.examples: List[str] = []
+
+    def add(self, value: Any):
+        self.count += 1
+        if value is None or value == "":
+            self.nulls += 1
+            return
+
+        number = None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            number = value
+        else:
+            try:
+                number = int(value)
+            except (TypeError, ValueError):
+                try:
+                    number = float(value)
+                except (TypeError, ValueError):
+                    pass
+
+        if number is not None:
+            if isinstance(number, int):
+                self.integers += 1
+            else:
+                self.floats += 1
+            self.minimum = number if self.minimum is None else min(self.minimum, number)
+            self.maximum = number if self.maximum is None else max(self.maximum, number)
+
+        if len(self.examples) < EXAMPLE_VALUES:
+            text = str(value)[:50]
+            if text not in self.examples:
+                self.examples.append(text)
+
+    @property
+    def type(self) -> str:
+        present = self.count - self.nulls
+        if present == 0:
+            return "unknown"
+        if self.integers == present:
+            return "integer"
+        if self.integers + self.floats == present:
+            return "float"
+        return "string"
+
+    def to_schema(self) -> Dict[str, Any]:
+        column = {
+            "name": self.name,
+            "type": self.type,
+            "null_fraction": round(self.nulls / self.count, 4) if self.count else 0.0,
+            "examples": self.examples,
+        }
+        if self.type in ("integer", "float"):
+            column.update(min=self.minimum, max=self.maximum)
+        return column
+
+
+def _iter_csv(path: str) -> Tuple[List[str], Iterator[List[Any]]]:
+    f = open(path, "r", newline="", encoding="utf-8", errors="replace")
+    reader = csv.reader(f)
+    header = next(reader, [])
+
+    def rows():
+        with f:
+            yield from reader
+
+    return header, rows()
+
+
+def _iter_parquet(path: str) -> Tuple[List[str], Iterator[List[Any]]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("pyarrow is required to ingest Parquet files")
+
+    parquet = pq.ParquetFile(path)
+    header = parquet.schema_arrow.names
+
+    def rows():
+        for batch in parquet.iter_batches(batch_size=8192):
+            columns = batch.to_pydict()
+            yield from zip(*(columns[name] for name in header))
+
+    return header, rows()
+
+
+def summarize(table_name: str, row_count: int, schema: List[Dict[str, Any]]) -> str:
+    """Deterministic description built from the profile"""
+    columns = ", ".join(
+        f"{c['name']} ({c['type']}" + (f", e.g. {', '.join(c['examples'])}" if c["examples"] else "") + ")"
+        for c in schema
+    )
+    return f"Table {table_name} with {row_count} rows and {len(schema)} columns: {columns}."
+
+
+def profile_table(source_dir: str, relative_path: str, sample_rows: int, profile_rows: int) -> Dict[str, Any]:
+    """Stream one file and return its table record (runs in a worker process)"""
+    path = os.path.join(source_dir, relative_path)
+    iterate = _iter_parquet if path.lower().endswith(".parquet") else _iter_csv
+    header, rows = iterate(path)
+
+    profiles = [ColumnProfile(name) for name in header]
+    samples = []
+    row_count = 0
+    for row in rows:
+        if row_count < profile_rows:
+            for profile, value in zip(profiles, row):
+                profile.add(value)
+        if row_count < sample_rows:
+            samples.append(dict(zip(header, row)))
+        row_count += 1
+
+    table_id = os.path.splitext(relative_path)[0].replace(os.sep, "/")
+    table_name = os.path.basename(table_id)
+    schema = [p.to_schema() for p in profiles]
+    return {
+        "table_id": table_id,
+        "table_name": table_name,
+        "description": summarize(table_name, row_count, schema),
+        "row_count": row_count,
+        "column_count": len(header),
+        "schema": schema,
+        "sample_data": json.loads(json.dumps(samples, default=str)),
+        "metadata": {
+            "source_path": relative_path,
+            "fingerprint": file_fingerprint(path),
+            "ingested_at": time.time(),
+        },
+    }
+
+
+class IngestionPipeline:
+    """Build an index's delta segment from a directory of CSV/Parquet files
+
+    Files are profiled in a process pool while finished profiles are embedded
+    in batches. After each batch is written to the segment, a manifest records
+    the files it covered, so a rerun after a crash skips them; files changed
+    since (by size and mtime) are ingested again.
+    """
+
+    def __init__(
+        self,
+        source_dir: str,
+        index_name: str,
+        embedder: Optional[EmbeddingService] = None,
+        delta: Optional[DeltaIndex] = None,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.source_dir = os.path.abspath(source_dir)
+        self.index_name = index_name
+        self.embedder = embedder or EmbeddingService()
+        self.delta = delta or DeltaIndex()
+        self.workers = workers or settings.ingest_workers or os.cpu_count() or 1
+        self.batch_size = batch_size or settings.ingest_embed_batch_size
+        self.progress = progress
+        self.segment = self.delta.segment(index_name, create=True)
+        self.manifest_path = os.path.join(self.segment.directory, MANIFEST_FILE)
+        self.manifest = self._load_manifest()
+        self.stats = {
+            "files_total": 0,
+            "files_skipped": 0,
+            "files_done": 0,
+            "files_failed": 0,
+            "started_at": time.time(),
+        }
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("source_dir") == self.source_dir:
+                return manifest
+        return {"source_dir": self.source_dir, "files": {}}
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def pending_files(self) -> List[str]:
+        files = discover_files(self.source_dir)
+        self.stats["files_total"] = len(files)
+
+        pending = []
+        for relative_path in files:
+            entry = self.manifest["files"].get(relative_path)
+            fingerprint = file_fingerprint(os.path.join(self.source_dir, relative_path))
+            if entry and entry["status"] == "done" and entry["fingerprint"] == fingerprint:
+                self.stats["files_skipped"] += 1
+            else:
+                pending.append(relative_path)
+        return pending
+
+    def run(self) -> Dict[str, Any]:
+        """Ingest every new or changed file (blocking)"""
+        pending = self.pending_files()
+        logger.info(
+            "Starting ingestion",
+            source=self.source_dir,
+            index=self.index_name,
+            pending=len(pending),
+            skipped=self.stats["files_skipped"],
+            workers=self.workers,
+        )
+
+        batch: List[Dict[str, Any]] = []
+        remaining = iter(pending)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Keep a bounded window of files in flight
+            in_flight = {}
+            for relative_path in remaining:
+                in_flight[self._submit(pool, relative_path)] = relative_path
+                if len(in_flight) >= self.workers * 2:
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    relative_path = in_flight.pop(future)
+                    try:
+                        batch.append(future.result())
+                    except Exception as e:
+                        self._record_failure(relative_path, e)
+
+                    next_path = next(remaining, None)
+                    if next_path is not None:
+                        in_flight[self._submit(pool, next_path)] = next_path
+
+                if len(batch) >= self.batch_size:
+                    self._flush(batch)
+                    batch = []
+
+        if batch:
+            self._flush(batch)
+        self._save_manifest()
+
+        self.stats["finished_at"] = time.time()
+        logger.info("Ingestion finished", index=self.index_name, **self.stats)
+        return dict(self.stats)
+
+    def _submit(self, pool: ProcessPoolExecutor, relative_path: str):
+        return pool.submit(
+            profile_table,
+            self.source_dir,
+            relative_path,
+            settings.ingest_sample_rows,
+            settings.ingest_profile_rows,
+        )
+
+    def _record_failure(self, relative_path: str, error: Exception):
+        logger.warning("Failed to ingest file", path=relative_path, error=str(error))
+        self.manifest["files"][relative_path] = {"status": "failed", "error": str(error), "fingerprint": None}
+        self.stats["files_failed"] += 1
+
+    def _flush(self, tables: List[Dict[str, Any]]):
+        """Embed a batch, write it to the segment, then checkpoint it"""
+        vectors = self.embedder.encode([table_text(t) for t in tables])
+        self.segment.append([
+            {"op": "upsert", "table_id": table["table_id"], "table": table, "vector": vector}
+            for table, vector in zip(tables, vectors)
+        ])
+
+        for table in tables:
+            self.manifest["files"][table["metadata"]["source_path"]] = {
+                "status": "done",
+                "fingerprint": table["metadata"]["fingerprint"],
+                "table_id": table["table_id"],
+            }
+        self._save_manifest()
+
+        self.stats["files_done"] += len(tables)
+        if self.progress:
+            self.progress(dict(self.stats))
+
+
+class IngestionJobService:
+    """Runs ingestion pipelines as background admin jobs, one per index"""
+
+    def __init__(self, embedder: EmbeddingService, delta: DeltaIndex):
+        self.embedder = embedder
+        self.delta = delta
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, source_dir: str, index_name: str, workers: Optional[int] = None) -> Dict[str, Any]:
+        for job in self.jobs.values():
+            if job["index_name"] == index_name and job["status"] == "running":
+                raise IngestionJobConflict(f"Ingestion already running for index {index_name}")
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "index_name": index_name,
+            "source_dir": source_dir,
+            "status": "running",
+            "progress": {},
+            "error": None,
+            "created_at": time.time(),
+            "completed_at": None,
+        }
+        self.jobs[job["job_id"]] = job
+        self.tasks[job["job_id"]] = asyncio.create_task(self._run(job, workers))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.jobs.get(job_id)
+
+    async def _run(self, job: Dict[str, Any], workers: Optional[int]):
+        def progress(stats: Dict[str, Any]):
+            job["progress"] = stats
+
+        try:
+            pipeline = IngestionPipeline(
+                job["source_dir"],
+                job["index_name"],
+                embedder=self.embedder,
+                delta=self.delta,
+                workers=workers,
+                progress=progress,
+            )
+            job["progress"] = await asyncio.to_thread(pipeline.run)
+            job["status"] = "completed"
+        except Exception as e:
+            logger.error("Ingestion job failed", job_id=job["job_id"], error=str(e))
+            job.update(status="failed", error=str(e))
+        finally:
+            job["completed_at"] = time.time()
+            self.tasks.pop(job["job_id"], None)
+
+    async def stop(self):
+        # Running pipelines finish their current batch on the worker thread
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks = {}
+
+
+def main():
+    """CLI: python -m api.services.ingestion SOURCE_DIR --index NAME"""
+    from ..middleware.logging import setup_logging
+
+    parser = argparse.ArgumentParser(description="Ingest a directory of CSV/Parquet tables into an index")
+    parser.add_argument("source_dir", help="Directory to scan for .csv and .parquet files")
+    parser.add_argument("--index", default=settings.pneuma_default_index, help="Index to ingest into")
+    parser.add_argument("--workers", type=int, default=None, help="Profiling processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Tables embedded per batch")
+    args = parser.parse_args()
+
+    setup_logging()
+    stats = IngestionPipeline(
+        args.source_dir, args.index, workers=args.workers, batch_size=args.batch_size
+    ).run()
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+import structlog
+
+from ..config import settings
+from .deadlines import RequestAbandoned, current_deadline, record_shed
+
+logger = structlog.get_logger()
+
+# Frames are a 4-byte header length, a JSON header and an optional raw body
+FRAME_HEADER = struct.Struct("!I")
+
+
+def _encode_frame(header: Dict[str, Any], body: bytes = b"") -> bytes:
+    raw = json.dumps(dict(header, body_len=len(body))).encode("utf-8")
+    return FRAME_HEADER.pack(len(raw)) + raw + body
+
+
+def _pack_payload(header: Dict[str, Any], payload: bytes) -> Tuple[Dict[str, Any], bytes]:
+    """Move large payloads into shared memory; the receiver unlinks the segment"""
+    if len(payload) < settings.model_host_shm_threshold:
+        return header, payload
+
+    shm = shared_memory.SharedMemory(create=True, size=len(payload))
+    shm.buf[: len(payload)] = payload
+    # Ownership passes to the receiver, so stop our resource tracker from reaping it
+    resource_tracker.unregister(shm._name, "shared_memory")
+    shm.close()
+    return dict(header, shm=shm.name, shm_size=len(payload)), b""
+
+
+def _unpack_payload(header: Dict[str, Any], body: bytes) -> bytes:
+    name = header.get("shm")
+    if not name:
+        return body
+
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(shm.buf[: header["shm_size"]])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _discard_payload(header: Dict[str, Any]):
+    """Unlink a shared-memory payload that was never delivered"""
+    if header.get("shm"):
+        try:
+            _unpack_payload(header, b"")
+        except FileNotFoundError:
+            pass
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], bytes]:
+    (length,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    header = json.loads(await reader.readexactly(length))
+    body = await reader.readexactly(header["body_len"]) if header.get("body_len") else b""
+    return header, body
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            raise ConnectionError("Model host closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_frame(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    (length,) = FRAME_HEADER.unpack(_recv_exactly(sock, FRAME_HEADER.size))
+    header = json.loads(_recv_exactly(sock, length))
+    body = _recv_exactly(sock, header["body_len"]) if header.get("body_len") else b""
+    return header, body
+
+
+class ModelHost:
+    """Owns the single Pneuma instance and serves inference over a Unix socket
+
+    Requests from every API worker land in one queue. A batcher drains it in
+    short windows and coalesces identical calls, so concurrent duplicates run
+    once and the rest share the result.
+
+    A reload builds a fresh instance from ``factory`` beside the live one and
+    swaps it in; calls already running keep their reference to the old one,
+    which is freed when the last of them returns.
+
+    The host also owns the embedding model: ``encode`` and ``encode_query``
+    return raw float32 rows, so API workers never load it themselves.
+    """
+
+    OPS = {"ping", "query_index", "encode", "encode_query"}
+
+    def __init__(self, pneuma: Any, socket_path: str, factory: Optional[Callable[[], Any]] = None):
+        self.pneuma = pneuma
+        self.socket_path = socket_path
+        self.factory = factory
+        self.generation = 1
+        self.pool = ThreadPoolExecutor(max_workers=settings.inference_workers)
+        self.pending: Optional[asyncio.Queue] = None
+        self.reload_task: Optional[asyncio.Task] = None
+        self.embedder: Any = None
+        self.stats = {"requests": 0, "batches": 0, "coalesced": 0, "shed": 0}
+
+    async def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self.pending = asyncio.Queue()
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        batcher = asyncio.create_task(self._batch_loop())
+        logger.info("Model host listening", socket=self.socket_path)
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.pool.shutdown(wait=False)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        try:
+            while True:
+                header, _ = await _read_frame(reader)
+                if header.get("op") == "reload":
+                    # Model loading takes minutes; keep it off the inference pool
+                    asyncio.create_task(self._handle_reload(header, writer, write_lock))
+                    continue
+                await self.pending.put((header, writer, write_lock))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        window = settings.model_host_batch_window_ms / 1000
+
+        while True:
+            batch = [await self.pending.get()]
+            deadline = loop.time() + window
+            while len(batch) < settings.model_host_max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.pending.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            asyncio.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], Any, asyncio.Lock]]):
+        groups: Dict[str, List[Tuple[Dict[str, Any], Any, asyncio.Lock]]] = {}
+        for item in batch:
+            header = item[0]
+            key = json.dumps([header.get("op"), header.get("args", [])])
+            groups.setdefault(key, []).append(item)
+
+        self.stats["requests"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["coalesced"] += len(batch) - len(groups)
+
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(self._run_group(loop, members) for members in groups.values())
+        )
+
+    async def _run_group(self, loop, members):
+        # Requests carry the caller's wall-clock deadline; skip those already past it
+        now = time.time()
+        expired = [m for m in members if m[0].get("deadline") is not None and m[0]["deadline"] <= now]
+        if expired:
+            self.stats["shed"] += len(expired)
+            members = [m for m in members if m not in expired]
+            for request, writer, write_lock in expired:
+                await self._reply(writer, write_lock, request["id"], False, b"", "Deadline exceeded", shed=True)
+            if not members:
+                return
+
+        header = members[0][0]
+        try:
+            result = await loop.run_in_executor(
+                self.pool, self._execute, header.get("op"), header.get("args", [])
+            )
+            payload = result if isinstance(result, bytes) else result.encode("utf-8")
+            ok, error = True, None
+        except Exception as e:
+            ok, payload, error = False, b"", str(e)
+
+        for request, writer, write_lock in members:
+            await self._reply(writer, write_lock, request["id"], ok, payload, error)
+
+    async def _handle_reload(self, header: Dict[str, Any], writer, write_lock):
+        # Reload requests from several workers share one rebuild
+        if self.reload_task is None or self.reload_task.done():
+            self.reload_task = asyncio.create_task(self._reload())
+
+        try:
+            generation = await asyncio.shield(self.reload_task)
+            await self._reply(writer, write_lock, header["id"], True, str(generation).encode("utf-8"), None)
+        except Exception as e:
+            await self._reply(writer, write_lock, header["id"], False, b"", str(e))
+
+    async def _reload(self) -> int:
+        if self.factory is None:
+            raise RuntimeError("Model host was started without a backend factory")
+
+        logger.info("Model host building new backend", generation=self.generation + 1)
+        pneuma = await asyncio.get_running_loop().run_in_executor(None, self.factory)
+        self.pneuma = pneuma
+        self.generation += 1
+        logger.info("Model host swapped backend", generation=self.generation)
+        return self.generation
+
+    def _execute(self, op: str, args: List[Any]) -> Union[str, bytes]:
+        if op not in self.OPS:
+            raise ValueError(f"Unknown operation: {op}")
+        if op == "ping":
+            return "pong"
+        if op in ("encode", "encode_query"):
+            vectors = getattr(self._embedder(), op)(*args)
+            return np.ascontiguousarray(vectors, dtype=np.float32).tobytes()
+        return self.pneuma.query_index(*args)
+
+    def _embedder(self) -> Any:
+        if self.embedder is None:
+            from .embedding_service import EmbeddingService
+
+            # Encode locally; the host socket setting points back at ourselves
+            self.embedder = EmbeddingService(host_socket="")
+        return self.embedder
+
+    async def _reply(
+        self,
+        writer,
+        write_lock,
+        request_id: int,
+        ok: bool,
+        payload: bytes,
+        error: Optional[str],
+        shed: bool = False,
+    ):
+        header = {"id": request_id, "ok": ok}
+        if error:
+            header["error"] = error
+        if shed:
+            header["shed"] = True
+        header, body = _pack_payload(header, payload)
+
+        try:
+            async with write_lock:
+                writer.write(_encode_frame(header, body))
+                await writer.drain()
+        except (ConnectionError, RuntimeError):
+            _discard_payload(header)
+
+
+class RemotePneuma:
+    """Stand-in for Pneuma that forwards calls to a shared model host process
+
+    One socket per API worker is multiplexed across threads: requests carry an
+    id and a reader thread resolves the matching future when the reply arrives.
+    """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+
+    def setup(self):
+        """Wait until the model host is up and its models are loaded"""
+        deadline = time.monotonic() + settings.model_host_connect_timeout
+        while True:
+            try:
+                self._call("ping", [], timeout=5)
+                logger.info("Connected to model host", socket=self.socket_path)
+                return
+            except (OSError, concurrent.futures.TimeoutError) as e:
+                if time.monotonic() >= deadline:
+                    raise ConnectionError(f"Model host not reachable at {self.socket_path}: {e}")
+                time.sleep(0.5)
+
+    def query_index(self, index_name: str, query: str, k: int = 1, n: int = 5, alpha: float = 0.5) -> str:
+        return self._call("query_index", [index_name, query, k, n, alpha])
+
+    def ping(self, timeout: Optional[float] = None):
+        """Raise if the host does not answer within timeout seconds"""
+        self._call("ping", [], timeout=timeout)
+
+    def reload(self) -> int:
+        """Have the host load a new backend and swap it in; blocks until done"""
+        return int(self._call("reload", [], timeout=settings.model_host_connect_timeout))
+
+    def encode(self, texts: List[str], query: bool = False) -> np.ndarray:
+        """Unit-normalized float32 embeddings from the host's model, one row per text"""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        payload = self._call_raw("encode_query" if query else "encode", [list(texts)])
+        return np.frombuffer(payload, dtype=np.float32).reshape(len(texts), -1)
+
+    def _call(self, op: str, args: List[Any], timeout: Optional[float] = None) -> str:
+        return self._call_raw(op, args, timeout).decode("utf-8")
+
+    def _call_raw(self, op: str, args: List[Any], timeout: Optional[float] = None) -> bytes:
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            sock = self._connect()
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            request = {"id": request_id, "op": op, "args": args}
+            # Let the host drop the call if it is still queued when the caller gives up
+            deadline = current_deadline.get()
+            remaining = deadline.remaining() if deadline is not None else None
+            if remaining is not None:
+                request["deadline"] = time.time() + remaining
+            if timeout is None:
+                timeout = remaining if remaining is not None else settings.model_host_call_timeout
+            try:
+                sock.sendall(_encode_frame(request))
+            except OSError as e:
+                self._disconnect(sock, e)
+                raise ConnectionError(f"Failed to send to model host: {e}")
+
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            if timeout == remaining:
+                # The caller's deadline ran out, not the host
+                record_shed("deadline_exceeded", "model_host")
+                raise RequestAbandoned("deadline_exceeded", "model_host")
+            raise
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.socket_path)
+            self._sock = sock
+            threading.Thread(
+                target=self._read_loop, args=(sock,), name="model-host-reader", daemon=True
+            ).start()
+        return self._sock
+
+    def _read_loop(self, sock: socket.socket):
+        try:
+            while True:
+                header, body = _recv_frame(sock)
+                # Always unpack so shared-memory segments are released
+                payload = _unpack_payload(header, body)
+                with self._lock:
+                    future = self._pending.pop(header["id"], None)
+                if future is None:
+                    continue
+                if header.get("ok"):
+                    future.set_result(payload)
+                elif header.get("shed"):
+                    record_shed("deadline_exceeded", "model_host")
+                    future.set_exception(RequestAbandoned("deadline_exceeded", "model_host"))
+                else:
+                    future.set_exception(RuntimeError(header.get("error", "Model host error")))
+        except (OSError, ValueError) as e:
+            with self._lock:
+                self._disconnect(sock, e)
+
+    def _disconnect(self, sock: socket.socket, error: Exception):
+        """Drop a broken connection and fail the calls waiting on it"""
+        if sock is not self._sock:
+            return
+        self._sock = None
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(ConnectionError(f"Lost connection to model host: {error}"))
+
+    def close(self):
+        with self._lock:
+            if self._sock is not None:
+                self._disconnect(self._sock, ConnectionError("closed"))
+
+
+def main():
+    """Run the model host: load Pneuma once and serve it to all API workers"""
+    from ..middleware.logging import setup_logging
+    from .pneuma_service import create_pneuma
+
+    setup_logging()
+    socket_path = settings.model_host_socket or "/tmp/pneuma-model-host.sock"
+
+    logger.info("Loading Pneuma in model host...")
+    pneuma = create_pneuma()
+
+    asyncio.run(ModelHost(pneuma, socket_path, factory=create_pneuma).serve_forever())
+
+
+if __name__ == "__main__":
+    main()
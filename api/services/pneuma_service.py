@@ -1,41 +1,123 @@
 import asyncio
+import base64
+import gc
+import inspect
 import json
 import time
-from typing import Dict, Any, List, Optional
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+import numpy as np
 import structlog
 
 from ..config import settings
-from ..models.requests import QueryRequest
-from ..models.responses import QueryResponse, TableInfo
+from ..models.requests import AlphaSweepRequest, FederatedQueryRequest, QueryRequest, TABLE_FIELDS
+from ..models.responses import (
+    AlphaRanking,
+    AlphaSweepResponse,
+    FederatedQueryResponse,
+    IndexSearchStatus,
+    QueryResponse,
+    TableInfo,
+    TableLookup,
+)
+from .deadlines import RequestAbandoned, check_deadline
+from .delta_index import DeltaIndex, DeltaSegment
+from .embedding_service import EmbeddingService, table_text
+from .fusion import align_scores, fuse_alpha_sweep, merge_normalized, min_max_normalize
+from .health_monitor import BREAKER_ERRORS, CircuitBreaker, CircuitOpenError
+from .inference_executor import InferenceExecutor
+from .query_cache import QueryCache
+from .quick_search import QuickSearchService
+from .table_metadata import TableMetadataStore
 
 logger = structlog.get_logger()
 
+# Values used when the backend omits a requested field
+FIELD_DEFAULTS = {"schema": [], "sample_data": [], "metadata": {}}
+
+# Hybrid weights that isolate each retriever; alpha weighs the lexical component
+LEXICAL_ALPHA = 1.0
+DENSE_ALPHA = 0.0
+
+# Fields a candidate pool always keeps so follow-ups can be reranked from it
+POOL_FIELDS = ("description", "relevance_score", "schema")
+
+
+def encode_matrix(matrix: np.ndarray) -> Dict[str, Any]:
+    """Compact JSON-safe form of an embedding matrix (float16)"""
+    data = np.ascontiguousarray(matrix, dtype=np.float16)
+    return {"shape": list(data.shape), "data": base64.b64encode(data.tobytes()).decode("ascii")}
+
+
+def decode_matrix(encoded: Dict[str, Any]) -> np.ndarray:
+    data = np.frombuffer(base64.b64decode(encoded["data"]), dtype=np.float16)
+    return data.reshape(encoded["shape"])
+
+
+def create_pneuma() -> Any:
+    """Build and set up a local Pneuma instance (blocking; loads models)"""
+    # Import Pneuma here to avoid import issues during module load
+    from src.pneuma import Pneuma
+
+    pneuma = Pneuma(
+        out_path=settings.pneuma_storage_path,
+        llm_path=settings.pneuma_llm_path,
+        embed_path=settings.pneuma_embed_path,
+    )
+    pneuma.setup()
+    return pneuma
+
+
+@dataclass
+class BackendGeneration:
+    """One loaded Pneuma backend and the requests currently using it"""
+
+    generation: int
+    pneuma: Any
+    accepts_fields: bool
+    loaded_at: float = field(default_factory=time.time)
+    in_flight: int = 0
+    retired: bool = False
+    drained: asyncio.Event = field(default_factory=asyncio.Event)
+
 
 class PneumaService:
-    """Service for interacting with Pneuma core functionality"""
+    """Service for interacting with Pneuma core functionality
+
+    Queries lease the current backend generation for their whole duration.
+    A reload builds the next generation in the background while the current
+    one keeps serving, swaps it in atomically, then releases the old one once
+    its in-flight requests have drained.
+    """
 
     def __init__(self):
-        self.pneuma = None
+        self.backend: Optional[BackendGeneration] = None
+        self.retiring: List[BackendGeneration] = []
         self.initialized = False
+        self.executor = InferenceExecutor(settings.inference_workers)
+        self.reload_task: Optional[asyncio.Task] = None
+        self.reload_state: Dict[str, Any] = {"state": "idle"}
+        self.delta = DeltaIndex()
+        # Metadata of every table a search has returned, shared by all workers
+        self.table_metadata = TableMetadataStore()
+        # Set by the application once the session store's Redis is available
+        self.cache: Optional[QueryCache] = None
+        # Set by the application when quick mode is enabled
+        self.quick: Optional[QuickSearchService] = None
+        self.embedder = EmbeddingService()
+        # Opened by backend connection failures or by the health monitor
+        self.breaker = CircuitBreaker("pneuma")
+
+    @property
+    def pneuma(self) -> Any:
+        return self.backend.pneuma if self.backend else None
 
     async def initialize(self):
         """Initialize Pneuma instance"""
         try:
             logger.info("Initializing Pneuma service...")
-
-            # Import Pneuma here to avoid import issues during module load
-            from src.pneuma import Pneuma
-
-            self.pneuma = Pneuma(
-                out_path=settings.pneuma_storage_path,
-                llm_path=settings.pneuma_llm_path,
-                embed_path=settings.pneuma_embed_path,
-            )
-
-            # Run setup in a separate thread to avoid blocking
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.pneuma.setup)
-
+            self.backend = await self._build_backend(1)
             self.initialized = True
             logger.info("Pneuma service initialized successfully")
 
@@ -43,36 +125,295 @@ class PneumaService:
             logger.error("Failed to initialize Pneuma service", error=str(e))
             raise
 
+    async def _build_backend(self, generation: int) -> BackendGeneration:
+        """Load a backend off the event loop without touching the live one"""
+        loop = asyncio.get_running_loop()
+
+        if settings.model_host_socket:
+            # Share one model-host process across API workers
+            from .model_host import RemotePneuma
+
+            pneuma = RemotePneuma(settings.model_host_socket)
+            await loop.run_in_executor(None, pneuma.setup)
+            if generation > 1:
+                # The host reloads its own models and swaps them the same way
+                await loop.run_in_executor(None, pneuma.reload)
+        else:
+            pneuma = await loop.run_in_executor(None, create_pneuma)
+
+        # Push field selection down to the backend when its query API supports it
+        accepts_fields = "fields" in inspect.signature(pneuma.query_index).parameters
+        return BackendGeneration(generation, pneuma, accepts_fields)
+
+    @asynccontextmanager
+    async def _lease(self):
+        """Pin the current backend generation for the duration of a request"""
+        if not self.initialized or self.backend is None:
+            raise RuntimeError("Pneuma service not initialized")
+
+        backend = self.backend
+        backend.in_flight += 1
+        try:
+            yield backend
+        finally:
+            backend.in_flight -= 1
+            if backend.retired and backend.in_flight == 0:
+                backend.drained.set()
+
+    def start_reload(self) -> bool:
+        """Begin a background reload; returns False if one is already running"""
+        if self.reload_task is not None and not self.reload_task.done():
+            return False
+
+        generation = self.backend.generation + 1 if self.backend else 1
+        self.reload_state = {
+            "state": "building",
+            "target_generation": generation,
+            "started_at": time.time(),
+        }
+        self.reload_task = asyncio.create_task(self._reload(generation))
+        return True
+
+    async def _reload(self, generation: int):
+        logger.info("Building new Pneuma backend", generation=generation)
+
+        try:
+            new_backend = await self._build_backend(generation)
+        except Exception as e:
+            logger.error("Pneuma reload failed; keeping current backend", error=str(e))
+            self.reload_state.update(state="failed", error=str(e), finished_at=time.time())
+            return
+
+        old_backend, self.backend = self.backend, new_backend
+        self.initialized = True
+        if self.cache is not None:
+            await self.cache.bump_epoch()
+        logger.info("Swapped in new Pneuma backend", generation=generation)
+
+        if old_backend is not None:
+            self.reload_state["state"] = "draining"
+            await self._retire(old_backend)
+
+        self.reload_state.update(state="completed", finished_at=time.time())
+
+    async def _retire(self, backend: BackendGeneration):
+        """Wait for a replaced backend's requests to finish, then free it"""
+        backend.retired = True
+        self.retiring.append(backend)
+        if backend.in_flight == 0:
+            backend.drained.set()
+
+        await backend.drained.wait()
+        self.retiring.remove(backend)
+        if hasattr(backend.pneuma, "close"):
+            backend.pneuma.close()
+        backend.pneuma = None
+        gc.collect()
+        logger.info("Released old Pneuma backend", generation=backend.generation)
+
+    def status(self) -> Dict[str, Any]:
+        """Active generation, draining generations and reload progress"""
+        return {
+            "generation": self.backend.generation if self.backend else None,
+            "loaded_at": self.backend.loaded_at if self.backend else None,
+            "in_flight": self.backend.in_flight if self.backend else 0,
+            "draining": [
+                {"generation": b.generation, "in_flight": b.in_flight} for b in self.retiring
+            ],
+            "reload": dict(self.reload_state),
+            "inference": self.executor.stats(),
+            "query_cache": self.cache.stats() if self.cache else None,
+            "quick_search": self.quick.status() if self.quick else None,
+        }
+
     async def query_tables(self, request: QueryRequest) -> QueryResponse:
         """Query tables using Pneuma"""
-        if not self.initialized:
-            raise RuntimeError("Pneuma service not initialized")
+        response, _ = await self._query(request, request.k, request.fields)
+        return response
+
+    async def query_with_pool(self, request: QueryRequest) -> Tuple[QueryResponse, List[Dict[str, Any]]]:
+        """Query tables and also return the wider candidate pool behind the results
+
+        The pool (raw records, best first) lets a follow-up refinement rerank
+        it without another retrieval. Sample rows are left out to keep it small.
+        Pneuma still generates k*n candidates in total; see ``_query``.
+        """
+        pool_size = max(request.k, min(request.k * request.n, settings.refine_pool_size))
+        fields = None
+        if request.fields is not None:
+            fields = [f for f in TABLE_FIELDS if f in request.fields or f in POOL_FIELDS]
+
+        response, records = await self._query(request, pool_size, fields)
+        pool = [{k: v for k, v in r.items() if k != "sample_data"} for r in records]
+        return response, pool
 
+    async def query_federated(self, request: FederatedQueryRequest) -> FederatedQueryResponse:
+        """Search several indexes in parallel and merge their results into one top-k
+
+        Scores are min-max normalized per index before the heap merge, so the
+        returned relevance_score is relative to each table's own index. An
+        index that errors or misses the per-index timeout is left out and the
+        response is marked partial; the query only fails when every index failed.
+        """
         start_time = time.time()
 
-        try:
-            logger.info("Executing Pneuma query", query=request.query, k=request.k)
-
-            # Run Pneuma query in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            response_str = await loop.run_in_executor(
-                None,
-                self.pneuma.query_index,
-                request.index_name,
-                request.query,
-                request.k,
-                request.n,
-                request.alpha,
+        if request.index_names == "all":
+            index_names = await self.get_available_indexes()
+        else:
+            index_names = list(dict.fromkeys(request.index_names))
+        if len(index_names) > settings.federated_max_indexes:
+            logger.warning(
+                "Federated query truncated", indexes=len(index_names), limit=settings.federated_max_indexes
+            )
+            index_names = index_names[: settings.federated_max_indexes]
+
+        timeout = settings.federated_index_timeout_seconds
+        if request.index_timeout_ms is not None:
+            timeout = request.index_timeout_ms / 1000
+
+        # Scores are needed for the merge even when the client did not ask for them
+        fields = None
+        if request.fields is not None:
+            fields = [f for f in TABLE_FIELDS if f in request.fields or f == "relevance_score"]
+
+        async def search(index_name: str) -> Tuple[List[Dict[str, Any]], IndexSearchStatus, Optional[Exception]]:
+            sub_request = QueryRequest(
+                query=request.query,
+                index_name=index_name,
+                k=request.k,
+                n=request.n,
+                alpha=request.alpha,
+                fields=request.fields,
+                priority=request.priority,
+                mode=request.mode,
+            )
+            started = time.perf_counter()
+            records, status, error = [], "ok", None
+            try:
+                _, records = await asyncio.wait_for(self._query(sub_request, request.k, fields), timeout)
+            except RequestAbandoned:
+                raise
+            except asyncio.TimeoutError:
+                status = "timeout"
+                logger.warning("Federated index timed out", index=index_name, timeout=timeout)
+            except Exception as e:
+                status, error = "error", e
+                logger.warning("Federated index failed", index=index_name, error=str(e))
+
+            outcome = IndexSearchStatus(
+                index_name=index_name,
+                status=status,
+                results=len(records),
+                search_time_ms=(time.perf_counter() - started) * 1000,
             )
+            if error is not None:
+                outcome.error = str(error)
+            return records, outcome, error
+
+        outcomes = await asyncio.gather(*(search(name) for name in index_names))
+        statuses = [status for _, status, _ in outcomes]
+        errors = [error for _, _, error in outcomes if error is not None]
+        if errors and not any(status.status == "ok" for status in statuses):
+            raise errors[0]
+
+        check_deadline("fusion")
+        merged = merge_normalized(
+            {status.index_name: records for records, status, _ in outcomes if status.status == "ok"},
+            request.k,
+        )
+        tables = self._convert_records(
+            [dict(record, relevance_score=score) for _, score, record in merged], request.fields
+        )
+        for table, (index_name, _, _) in zip(tables, merged):
+            table.index_name = index_name
+
+        return FederatedQueryResponse(
+            query=request.query,
+            session_id=request.session_id,
+            results=tables,
+            total_results=len(tables),
+            search_time_ms=(time.time() - start_time) * 1000,
+            timestamp=time.time(),
+            partial=any(status.status != "ok" for status in statuses),
+            indexes=statuses,
+        )
+
+    async def _query(
+        self, request: QueryRequest, limit: int, fields: Optional[List[str]]
+    ) -> Tuple[QueryResponse, List[Dict[str, Any]]]:
+        start_time = time.time()
+
+        try:
+            logger.debug("Executing Pneuma query", query=request.query, k=request.k)
+
+            if request.mode == "quick" and self.quick is not None:
+                records = await self.quick.search(request.index_name, request.query, limit, request.priority)
+                if records is not None:
+                    response = QueryResponse(
+                        query=request.query,
+                        session_id=request.session_id,
+                        results=self._convert_records(records[: request.k], request.fields),
+                        total_results=min(len(records), request.k),
+                        search_time_ms=(time.time() - start_time) * 1000,
+                        timestamp=time.time(),
+                        mode="quick",
+                    )
+                    return response, records
+                # Too few tables indexed yet; answer in balanced mode
+
+            # Thorough mode hands the LLM reranker a wider candidate pool
+            n = request.n
+            if request.mode == "thorough":
+                n = min(max(n, settings.thorough_candidate_multiplier), 20)
+            # Over-fetching past k (candidate pools) keeps generation at k*n candidates
+            if limit > request.k:
+                n = max(1, request.k * n // limit)
+
+            # Over-fetch from the base index to backfill tables the delta hides
+            segment = self.delta.segment(request.index_name)
+            if segment is not None and segment.is_empty():
+                segment = None
+            fetch_k = limit + min(len(segment.tombstones), limit) if segment else limit
+
+            async with self._lease() as backend:
+                cache_key, records = None, None
+                if self.cache is not None:
+                    cache_key = QueryCache.make_key(
+                        await self.cache.epoch(),
+                        request.index_name,
+                        request.query,
+                        n,
+                        request.alpha,
+                        fields if backend.accepts_fields else None,
+                    )
+                    records = await self.cache.get(cache_key, fetch_k)
 
-            # Parse Pneuma response
-            response_data = json.loads(response_str)
+                if records is None:
+                    response_data = await self._run_query(
+                        backend,
+                        request.index_name,
+                        request.query,
+                        fetch_k,
+                        n,
+                        request.alpha,
+                        fields,
+                        request.priority,
+                    )
+                    records = response_data.get("data", {}).get("response", [])
+                    if cache_key is not None:
+                        await self.cache.put(cache_key, records, fetch_k)
+                    if self.quick is not None:
+                        self.quick.observe(request.index_name, records)
             search_time = (time.time() - start_time) * 1000  # Convert to ms
 
+            if segment is not None:
+                check_deadline("delta_merge")
+                records = await self._merge_delta(segment, request, records, limit)
+
             # Convert to our response format
-            tables = self._convert_pneuma_response(response_data)
+            tables = self._convert_records(records[: request.k], request.fields)
 
-            return QueryResponse(
+            response = QueryResponse(
                 query=request.query,
                 session_id=request.session_id,
                 results=tables,
@@ -80,31 +421,255 @@ class PneumaService:
                 search_time_ms=search_time,
                 timestamp=time.time(),
             )
+            if request.mode != "balanced":
+                response.mode = "thorough" if request.mode == "thorough" else "balanced"
+            return response, records[:limit]
 
+        except (CircuitOpenError, RequestAbandoned):
+            raise
         except Exception as e:
             logger.error("Pneuma query failed", error=str(e), query=request.query)
             raise
 
+    async def refine_tables(
+        self, request: QueryRequest, pool: Dict[str, Any]
+    ) -> Tuple[Optional[QueryResponse], Optional[str]]:
+        """Rerank a session's previous candidate pool against a follow-up query
+
+        Scores blend the follow-up's cosine similarity to each candidate with
+        the candidate's original (min-max normalized) score. Returns no response
+        when too few candidates still match, so the caller runs a full search.
+        The second value holds newly computed pool embeddings to cache with the
+        pool, or None if they were already cached.
+        """
+        start_time = time.time()
+        records = pool["records"]
+        if not records:
+            return None, None
+
+        query_vector = (
+            await self.executor.run(request.priority, self.embedder.encode_query, [request.query])
+        )[0]
+        new_vectors = None
+        if pool.get("vectors"):
+            vectors = decode_matrix(pool["vectors"])
+        else:
+            vectors = await self.executor.run(
+                request.priority, self.embedder.encode, [table_text(r) for r in records]
+            )
+            new_vectors = encode_matrix(vectors)
+
+        similarity = vectors.astype(np.float32) @ query_vector
+        matched = int((similarity >= settings.refine_min_similarity).sum())
+        overlap = matched / min(request.k, len(records))
+        if overlap < settings.refine_min_overlap:
+            logger.info("Refinement overlap too low, running full search", overlap=round(overlap, 3))
+            return None, new_vectors
+
+        prior = min_max_normalize(
+            np.array([r.get("relevance_score") or 0.0 for r in records], dtype=np.float64)
+        )
+        weight = settings.refine_prior_weight
+        scores = (1.0 - weight) * similarity + weight * prior
+        order = np.argsort(-scores, kind="stable")[: request.k]
+
+        ranked = [dict(records[i], relevance_score=float(scores[i])) for i in order]
+        tables = self._convert_records(ranked, request.fields)
+        response = QueryResponse(
+            query=request.query,
+            session_id=request.session_id,
+            results=tables,
+            total_results=len(tables),
+            search_time_ms=(time.time() - start_time) * 1000,
+            timestamp=time.time(),
+            refined=True,
+        )
+        return response, new_vectors
+
+    async def query_alpha_sweep(self, request: AlphaSweepRequest) -> AlphaSweepResponse:
+        """Rank one shared candidate pool under several hybrid weights
+
+        The lexical and dense candidate sets are retrieved once each (concurrently),
+        then re-fused for every alpha in a single vectorized pass, so a sweep over
+        N alphas costs two retrievals instead of N.
+        """
+        start_time = time.time()
+        pool_size = request.k * request.n
+        fields = None
+        if request.fields is not None:
+            fields = [f for f in TABLE_FIELDS if f in request.fields or f == "relevance_score"]
+
+        try:
+            logger.info(
+                "Executing alpha sweep",
+                query=request.query,
+                alphas=len(request.alphas),
+                pool_size=pool_size,
+            )
+
+            # Both retrievals must come from the same generation to be comparable
+            async with self._lease() as backend:
+                lexical_data, dense_data = await asyncio.gather(
+                    self._run_query(
+                        backend,
+                        request.index_name,
+                        request.query,
+                        pool_size,
+                        1,
+                        LEXICAL_ALPHA,
+                        fields,
+                        request.priority,
+                    ),
+                    self._run_query(
+                        backend,
+                        request.index_name,
+                        request.query,
+                        pool_size,
+                        1,
+                        DENSE_ALPHA,
+                        fields,
+                        request.priority,
+                    ),
+                )
+            check_deadline("fusion")
+            lexical = self._convert_pneuma_response(lexical_data, fields)
+            dense = self._convert_pneuma_response(dense_data, fields)
+
+            candidates: Dict[str, TableInfo] = {}
+            for table in lexical + dense:
+                candidates.setdefault(table.table_id, table)
+            candidate_ids = list(candidates)
+
+            lexical_scores = align_scores(
+                candidate_ids, {t.table_id: t.relevance_score or 0.0 for t in lexical}
+            )
+            dense_scores = align_scores(
+                candidate_ids, {t.table_id: t.relevance_score or 0.0 for t in dense}
+            )
+            top, top_scores = fuse_alpha_sweep(
+                lexical_scores, dense_scores, request.alphas, request.k
+            )
+
+            rankings = [
+                AlphaRanking(
+                    alpha=alpha,
+                    results=[
+                        candidates[candidate_ids[i]].model_copy(
+                            update={"relevance_score": float(score)}
+                        )
+                        for i, score in zip(indices, scores)
+                    ],
+                )
+                for alpha, indices, scores in zip(request.alphas, top, top_scores)
+            ]
+
+            return AlphaSweepResponse(
+                query=request.query,
+                rankings=rankings,
+                candidate_count=len(candidate_ids),
+                retrievals=2,
+                search_time_ms=(time.time() - start_time) * 1000,
+                timestamp=time.time(),
+            )
+
+        except (CircuitOpenError, RequestAbandoned):
+            raise
+        except Exception as e:
+            logger.error("Alpha sweep failed", error=str(e), query=request.query)
+            raise
+
+    async def _merge_delta(
+        self,
+        segment: DeltaSegment,
+        request: QueryRequest,
+        records: List[Dict[str, Any]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Hide superseded base tables and merge in matches from the delta segment
+
+        Delta scores are cosine similarities from Pneuma's own embedding model,
+        so they sit on the same scale as its dense scores.
+        """
+        records = [r for r in records if r.get("table_id") not in segment.tombstones]
+
+        if segment.tables:
+            query_vector = (
+                await self.executor.run(request.priority, self.embedder.encode_query, [request.query])
+            )[0]
+            records += [
+                dict(segment.tables[table_id], relevance_score=score)
+                for table_id, score in segment.search(query_vector, limit)
+            ]
+            records.sort(key=lambda r: r.get("relevance_score") or 0.0, reverse=True)
+
+        return records[:limit]
+
+    async def _run_query(
+        self,
+        backend: BackendGeneration,
+        index_name: str,
+        query: str,
+        k: int,
+        n: int,
+        alpha: float,
+        fields: Optional[List[str]] = None,
+        priority: str = "interactive",
+    ) -> Dict[str, Any]:
+        """Run Pneuma's query_index off the event loop and parse its JSON response"""
+        query_args = [index_name, query, k, n, alpha]
+        if backend.accepts_fields and fields is not None:
+            query_args.append(fields)
+
+        # Fail fast instead of queueing behind a backend that is down
+        self.breaker.check()
+
+        # Run Pneuma query on the inference pool in its priority lane
+        try:
+            response_str = await self.executor.run(
+                priority, backend.pneuma.query_index, *query_args
+            )
+        except BREAKER_ERRORS:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+
+        # Parse Pneuma response
+        response_data = json.loads(response_str)
+
+        # Remember the returned tables so they can be looked up by id later
+        records = response_data.get("data", {}).get("response")
+        if records:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.table_metadata.record, index_name, records)
+        return response_data
+
     def _convert_pneuma_response(
-        self, response_data: Dict[str, Any]
+        self, response_data: Dict[str, Any], fields: Optional[Iterable[str]] = None
     ) -> List[TableInfo]:
-        """Convert Pneuma response to our TableInfo format"""
-        tables = []
+        """Convert Pneuma response to our TableInfo format
 
+        Only the requested fields are copied and validated; the rest stay unset
+        so they are left out of the serialized response.
+        """
         if "data" in response_data and "response" in response_data["data"]:
-            for table_data in response_data["data"]["response"]:
-                table_info = TableInfo(
-                    table_id=table_data.get("table_id", "unknown"),
-                    table_name=table_data.get("table_name", "Unknown Table"),
-                    description=table_data.get("description"),
-                    relevance_score=table_data.get("relevance_score"),
-                    row_count=table_data.get("row_count"),
-                    column_count=table_data.get("column_count"),
-                    schema=table_data.get("schema", []),
-                    sample_data=table_data.get("sample_data", []),
-                    metadata=table_data.get("metadata", {}),
-                )
-                tables.append(table_info)
+            return self._convert_records(response_data["data"]["response"], fields)
+        return []
+
+    def _convert_records(
+        self, records: List[Dict[str, Any]], fields: Optional[Iterable[str]] = None
+    ) -> List[TableInfo]:
+        """Build TableInfo objects from raw backend records"""
+        tables = []
+        wanted = TABLE_FIELDS if fields is None else [f for f in TABLE_FIELDS if f in fields]
+
+        for table_data in records:
+            values = {
+                "table_id": table_data.get("table_id", "unknown"),
+                "table_name": table_data.get("table_name", "Unknown Table"),
+            }
+            for name in wanted:
+                values[name] = table_data.get(name, FIELD_DEFAULTS.get(name))
+            tables.append(TableInfo(**values))
 
         return tables
 
@@ -113,11 +678,113 @@ class PneumaService:
         # This would need to be implemented based on Pneuma's actual API
         return ["default", "chicago_data", "demo_index"]
 
-    async def get_table_details(self, table_id: str) -> Optional[TableInfo]:
+    async def get_table_details(
+        self,
+        table_id: str,
+        fields: Optional[Iterable[str]] = None,
+        sample_size: Optional[int] = None,
+    ) -> Optional[TableInfo]:
         """Get detailed information about a specific table"""
-        # This would need to be implemented based on Pneuma's actual API
-        return None
+        return (await self.get_tables_details([table_id], fields=fields, sample_size=sample_size))[0]
+
+    async def get_tables_details(
+        self,
+        table_ids: List[str],
+        fields: Optional[Iterable[str]] = None,
+        sample_size: Optional[int] = None,
+        index_name: Optional[str] = None,
+    ) -> List[Optional[TableInfo]]:
+        """Look up many tables in one read, returned in request order with None for misses"""
+        lookups = await self.lookup_tables(table_ids, fields, sample_size, index_name)
+        return [lookup.table for lookup in lookups]
+
+    async def lookup_tables(
+        self,
+        table_ids: List[str],
+        fields: Optional[Iterable[str]] = None,
+        sample_size: Optional[int] = None,
+        index_name: Optional[str] = None,
+    ) -> List[TableLookup]:
+        """Look up many tables in one read, with the reason for every miss
+
+        Pneuma has no lookup by table id, so records come from the delta
+        segments and the stored metadata of tables seen in search results,
+        both persisted on disk and shared by all workers.
+        """
+        loop = asyncio.get_running_loop()
+        records, deleted = await loop.run_in_executor(
+            None, self._lookup_tables, set(table_ids), index_name
+        )
+
+        lookups = []
+        for table_id in table_ids:
+            record = records.get(table_id)
+            if record is None:
+                reason = "deleted" if table_id in deleted else "not_cataloged"
+                lookups.append(TableLookup(table_id=table_id, found=False, reason=reason))
+                continue
+            if sample_size is not None and record.get("sample_data"):
+                record = dict(record, sample_data=record["sample_data"][:sample_size])
+            table = self._convert_records([record], fields)[0]
+            lookups.append(TableLookup(table_id=table_id, found=True, table=table))
+        return lookups
+
+    def _lookup_tables(
+        self, wanted: Set[str], index_name: Optional[str]
+    ) -> Tuple[Dict[str, Dict[str, Any]], Set[str]]:
+        """Table records for the wanted ids and the ids deleted from an index (blocking)
+
+        Every index is searched unless one is given. Within an index the delta
+        segment wins over stored metadata, and tables it deleted are not
+        resolved from a stale copy.
+        """
+        if index_name is not None:
+            index_names = [index_name]
+        else:
+            index_names = sorted(
+                set(self.delta.index_names())
+                | set(self.table_metadata.index_names())
+                | set(self.quick.index_names() if self.quick else []),
+                key=lambda name: name != settings.pneuma_default_index,
+            )
+
+        found: Dict[str, Dict[str, Any]] = {}
+        deleted: Set[str] = set()
+        for name in index_names:
+            missing = wanted - found.keys()
+            if not missing:
+                break
+            segment = self.delta.segment(name)
+            tombstones = segment.tombstones if segment is not None else set()
+            deleted |= missing & tombstones
+
+            stored = []
+            log = self.table_metadata.log(name)
+            if log is not None:
+                stored.append(log.tables)
+            if self.quick is not None:
+                stored.append(self.quick.catalog(name).tables)
+
+            for table_id in missing:
+                if segment is not None and table_id in segment.tables:
+                    found[table_id] = segment.tables[table_id]
+                    continue
+                if table_id in tombstones:
+                    continue
+                for tables in stored:
+                    if table_id in tables:
+                        found[table_id] = tables[table_id]
+                        break
+        return found, deleted - found.keys()
+
+    async def cleanup(self):
+        """Stop the inference workers and any in-progress reload"""
+        if self.reload_task is not None:
+            self.reload_task.cancel()
+        self.executor.shutdown()
+        if hasattr(self.pneuma, "close"):
+            self.pneuma.close()
 
     def is_healthy(self) -> bool:
         """Check if Pneuma service is healthy"""
-        return self.initialized and self.pneuma is not None
+        return self.initialized and self.backend is not None
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+CACHE_KEY_PREFIX = "qcache:"
+# Shared counter bumped on every backend reload; part of every cache key
+EPOCH_KEY = CACHE_KEY_PREFIX + "epoch"
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class QueryCache:
+    """Cache of raw backend results per (epoch, index, query, knobs)
+
+    Entries live in Redis so every API worker shares them, with an in-process
+    LRU as fallback. The epoch is a counter kept next to the entries and bumped
+    on every reload, so all workers move to a clean cache together, including
+    ones started later. The result count is not part of the key: an
+    entry fetched with a larger k also serves smaller ones from its prefix.
+    """
+
+    def __init__(self, redis: Any = None):
+        self.redis = redis
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Used while Redis is unavailable
+        self._epoch = 0
+
+    async def epoch(self) -> int:
+        if self.redis is not None:
+            try:
+                return int(await self.redis.get(EPOCH_KEY) or 0)
+            except Exception as e:
+                logger.warning("Query cache epoch read failed", error=str(e))
+        return self._epoch
+
+    async def bump_epoch(self):
+        """Invalidate every entry, for all workers, after the index changed"""
+        self._epoch += 1
+        if self.redis is not None:
+            try:
+                await self.redis.incr(EPOCH_KEY)
+            except Exception as e:
+                logger.warning("Query cache epoch bump failed", error=str(e))
+        self._local.clear()
+
+    @staticmethod
+    def make_key(
+        epoch: int,
+        index_name: str,
+        query: str,
+        n: int,
+        alpha: float,
+        fields: Optional[List[str]],
+    ) -> str:
+        raw = json.dumps(
+            [epoch, index_name, normalize_query(query), n, alpha, sorted(fields) if fields else None]
+        )
+        return CACHE_KEY_PREFIX + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str, k: int) -> Optional[List[Dict[str, Any]]]:
+        """Cached records if the entry holds at least k of them (or all there are)"""
+        entry = None
+        if self.redis is not None:
+            try:
+                data = await self.redis.get(key)
+                entry = json.loads(data) if data else None
+            except Exception as e:
+                logger.warning("Query cache read failed", error=str(e))
+        if entry is None:
+            # Entries written while Redis was failing only exist here
+            cached = self._local.get(key)
+            if cached and cached[0] > time.time():
+                self._local.move_to_end(key)
+                entry = cached[1]
+
+        if entry is None or (len(entry["records"]) < k and not entry["complete"]):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["records"][:k]
+
+    async def put(self, key: str, records: List[Dict[str, Any]], k: int):
+        entry = {"records": records, "complete": len(records) < k}
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, json.dumps(entry), ex=settings.query_cache_ttl_seconds)
+                return
+            except Exception as e:
+                logger.warning("Query cache write failed", error=str(e))
+
+        self._local[key] = (time.time() + settings.query_cache_ttl_seconds, entry)
+        self._local.move_to_end(key)
+        while len(self._local) > settings.query_cache_max_entries:
+            self._local.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": "redis" if self.redis is not None else "local",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
@@ -0,0 +1,336 @@
+import asyncio
+import fcntl
+import json
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import structlog
+
+from ..config import settings
+from .delta_index import DeltaIndex
+from .embedding_service import EmbeddingService, table_text
+from .inference_executor import InferenceExecutor
+from .table_metadata import INDEX_NAME_PATTERN
+
+logger = structlog.get_logger()
+
+CATALOG_VECTORS = "catalog.npz"
+CATALOG_META = "catalog.json"
+LOCK_FILE = ".lock"
+
+# Record fields kept in the catalog; sample rows are too large to hold for every table
+CATALOG_FIELDS = ("table_id", "table_name", "description", "row_count", "column_count", "schema", "metadata")
+
+
+class IVFIndex:
+    """Inverted-file approximate nearest neighbour index over unit vectors
+
+    Vectors are clustered with spherical k-means; a search scores only the
+    members of the ``nprobe`` lists whose centroids are closest to the query.
+    Small collections get a single list, i.e. exact search.
+    """
+
+    def __init__(self, ids: List[str], vectors: np.ndarray, n_lists: Optional[int] = None, seed: int = 0):
+        count = len(ids)
+        if n_lists is None:
+            n_lists = 1 if count < settings.quick_exact_threshold else int(math.sqrt(count))
+        n_lists = max(1, min(n_lists, count))
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if n_lists > 1:
+            self.centroids, assignment = self._kmeans(vectors, n_lists, np.random.default_rng(seed))
+        else:
+            self.centroids = np.zeros((1, vectors.shape[1] if count else 0), dtype=np.float32)
+            assignment = np.zeros(count, dtype=np.int64)
+
+        # Store vectors grouped by list so each list is one contiguous slice
+        order = np.argsort(assignment, kind="stable")
+        self.ids = [ids[i] for i in order]
+        self.vectors = vectors[order]
+        self.offsets = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+        self.n_lists = n_lists
+
+    @staticmethod
+    def _assign(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 16384) -> np.ndarray:
+        """Nearest centroid per vector, in chunks to bound the score matrix"""
+        return np.concatenate([
+            np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), chunk)
+        ])
+
+    @classmethod
+    def _kmeans(cls, vectors: np.ndarray, n_lists: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)].copy()
+        for _ in range(settings.quick_kmeans_iterations):
+            assignment = cls._assign(vectors, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, vectors)
+            counts = np.bincount(assignment, minlength=n_lists)
+            # Re-seed empty lists from random vectors
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+        centroids = centroids.astype(np.float32)
+        return centroids, cls._assign(vectors, centroids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query_vector: np.ndarray, k: int, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Top-k (id, cosine similarity) among the probed lists, best first"""
+        if not self.ids:
+            return []
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+
+        if self.n_lists == 1:
+            candidates = None
+            scores = self.vectors @ query_vector
+        else:
+            nprobe = min(nprobe or settings.quick_nprobe, self.n_lists)
+            closest = np.argpartition(-(self.centroids @ query_vector), nprobe - 1)[:nprobe]
+            candidates = np.concatenate([np.arange(self.offsets[l], self.offsets[l + 1]) for l in closest])
+            scores = self.vectors[candidates] @ query_vector
+
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        positions = top if candidates is None else candidates[top]
+        return [(self.ids[p], float(scores[i])) for p, i in zip(positions, top)]
+
+
+class TableCatalog:
+    """Embedded table records for one index, persisted under <pneuma_storage_path>/quick
+
+    Workers merge with the file on save, so tables embedded by any worker
+    end up in everyone's catalog after a restart.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        self.vectors: Dict[str, np.ndarray] = {}
+        self.version = 0
+        self._load()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, np.ndarray]]:
+        if not os.path.exists(self._path(CATALOG_META)):
+            return {}, {}
+        with open(self._path(CATALOG_META), "r", encoding="utf-8") as f:
+            tables = json.load(f)
+        with np.load(self._path(CATALOG_VECTORS), allow_pickle=False) as data:
+            ids, matrix = data["ids"].tolist(), data["vectors"].astype(np.float32)
+        return tables, {table_id: matrix[i] for i, table_id in enumerate(ids)}
+
+    def _load(self):
+        try:
+            self.tables, self.vectors = self._read()
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable quick-search catalog", directory=self.directory, error=str(e))
+
+    def add(self, tables: List[Dict[str, Any]], vectors: np.ndarray):
+        for table, vector in zip(tables, vectors):
+            self.tables[table["table_id"]] = table
+            self.vectors[table["table_id"]] = vector
+        self.version += 1
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                on_disk_tables, on_disk_vectors = self._read()
+                merged = [table_id for table_id in on_disk_tables if table_id not in self.tables]
+                for table_id in merged:
+                    self.tables[table_id] = on_disk_tables[table_id]
+                    self.vectors[table_id] = on_disk_vectors[table_id]
+                if merged:
+                    self.version += 1
+
+                ids = list(self.vectors)
+                matrix = np.stack([self.vectors[i] for i in ids]) if ids else np.empty((0, 0))
+                tmp_vectors = self._path(CATALOG_VECTORS + ".tmp.npz")
+                np.savez(tmp_vectors, ids=np.array(ids, dtype=str), vectors=matrix.astype(np.float16))
+                os.replace(tmp_vectors, self._path(CATALOG_VECTORS))
+
+                tmp_meta = self._path(CATALOG_META + ".tmp")
+                with open(tmp_meta, "w", encoding="utf-8") as f:
+                    json.dump(self.tables, f)
+                os.replace(tmp_meta, self._path(CATALOG_META))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class QuickSearchService:
+    """Millisecond-scale table search that skips Pneuma and its LLM stage
+
+    Answers from an in-process IVF index over table embeddings: the index's
+    delta-segment tables plus every table seen in a full-mode result, which
+    are embedded in the background on the bulk lane. The ANN index is rebuilt
+    off the request path when its inputs change.
+    """
+
+    def __init__(self, embedder: EmbeddingService, delta: DeltaIndex, executor: InferenceExecutor):
+        self.embedder = embedder
+        self.delta = delta
+        self.executor = executor
+        self.root = os.path.join(settings.pneuma_storage_path, "quick")
+        self.catalogs: Dict[str, TableCatalog] = {}
+        self.indexes: Dict[str, Tuple[Any, IVFIndex, Dict[str, Dict[str, Any]]]] = {}
+        self.pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.rebuilds: Dict[str, asyncio.Task] = {}
+        self.built_at: Dict[str, float] = {}
+        self.wakeup: Optional[asyncio.Event] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.stats = {"searches": 0, "fallbacks": 0, "embedded": 0, "rebuilds": 0}
+
+    async def start(self):
+        self.wakeup = asyncio.Event()
+        self.worker = asyncio.create_task(self._embed_loop())
+
+    async def stop(self):
+        for task in [self.worker, *self.rebuilds.values()]:
+            if task is not None:
+                task.cancel()
+
+    def catalog(self, index_name: str) -> TableCatalog:
+        if not INDEX_NAME_PATTERN.match(index_name):
+            raise ValueError(f"Invalid index name: {index_name!r}")
+        catalog = self.catalogs.get(index_name)
+        if catalog is None:
+            catalog = self.catalogs[index_name] = TableCatalog(os.path.join(self.root, index_name))
+        return catalog
+
+    def index_names(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return sorted(self.catalogs)
+        return sorted(
+            set(self.catalogs)
+            | {
+                name for name in os.listdir(self.root)
+                if INDEX_NAME_PATTERN.match(name) and os.path.isdir(os.path.join(self.root, name))
+            }
+        )
+
+    def observe(self, index_name: str, records: List[Dict[str, Any]]):
+        """Queue tables from a full-mode result for embedding into the catalog"""
+        if self.wakeup is None:
+            return
+        catalog = self.catalog(index_name)
+        pending = self.pending.setdefault(index_name, {})
+        for record in records:
+            table_id = record.get("table_id")
+            if (
+                table_id is None
+                or table_id in catalog.tables
+                or table_id in pending
+                or len(catalog.tables) + len(pending) >= settings.quick_max_tables
+            ):
+                continue
+            pending[table_id] = {f: record[f] for f in CATALOG_FIELDS if f in record}
+        if pending:
+            self.wakeup.set()
+
+    async def _embed_loop(self):
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            for index_name in list(self.pending):
+                pending = self.pending.pop(index_name, {})
+                tables = list(pending.values())
+                try:
+                    for start in range(0, len(tables), settings.embedding_batch_size):
+                        batch = tables[start:start + settings.embedding_batch_size]
+                        vectors = await self.executor.run(
+                            "bulk", self.embedder.encode, [table_text(t) for t in batch]
+                        )
+                        self.catalog(index_name).add(batch, vectors)
+                        self.stats["embedded"] += len(batch)
+                    await asyncio.get_running_loop().run_in_executor(None, self.catalog(index_name).save)
+                except Exception as e:
+                    logger.error("Quick-search catalog update failed", index=index_name, error=str(e))
+
+    def _signature(self, index_name: str) -> Any:
+        segment = self.delta.segment(index_name)
+        return (self.catalog(index_name).version, segment.version if segment is not None else None)
+
+    def _build(self, index_name: str, signature: Any) -> Tuple[Any, IVFIndex, Dict[str, Dict[str, Any]]]:
+        """Merge catalog and delta segment, then build the IVF index (blocking)"""
+        catalog = self.catalog(index_name)
+        tables, vectors = dict(catalog.tables), dict(catalog.vectors)
+
+        segment = self.delta.segment(index_name)
+        if segment is not None:
+            for table_id in segment.tombstones:
+                tables.pop(table_id, None)
+                vectors.pop(table_id, None)
+            tables.update(segment.tables)
+            vectors.update(segment.vectors)
+
+        ids = list(vectors)
+        matrix = np.stack([vectors[i] for i in ids]) if ids else np.empty((0, 0), dtype=np.float32)
+        start = time.perf_counter()
+        index = IVFIndex(ids, matrix)
+        logger.info(
+            "Built quick-search index",
+            index=index_name,
+            tables=len(ids),
+            lists=index.n_lists,
+            duration_ms=round((time.perf_counter() - start) * 1000, 1),
+        )
+        return signature, index, tables
+
+    async def _rebuild(self, index_name: str, signature: Any):
+        try:
+            loop = asyncio.get_running_loop()
+            self.indexes[index_name] = await loop.run_in_executor(None, self._build, index_name, signature)
+            self.built_at[index_name] = time.monotonic()
+            self.stats["rebuilds"] += 1
+        finally:
+            self.rebuilds.pop(index_name, None)
+
+    async def _current_index(self, index_name: str) -> Optional[Tuple[IVFIndex, Dict[str, Dict[str, Any]]]]:
+        """The index to search now; stale ones keep serving while a rebuild runs"""
+        signature = self._signature(index_name)
+        current = self.indexes.get(index_name)
+        usable = current is not None and len(current[1]) >= settings.quick_min_tables
+        if current is None or current[0] != signature:
+            due = time.monotonic() - self.built_at.get(index_name, 0.0) >= settings.quick_rebuild_interval_seconds
+            if index_name not in self.rebuilds and (not usable or due):
+                self.rebuilds[index_name] = asyncio.create_task(self._rebuild(index_name, signature))
+            if not usable and index_name in self.rebuilds:
+                try:
+                    await asyncio.shield(self.rebuilds[index_name])
+                except Exception as e:
+                    logger.error("Quick-search index build failed", index=index_name, error=str(e))
+                current = self.indexes.get(index_name)
+        return (current[1], current[2]) if current is not None else None
+
+    async def search(
+        self, index_name: str, query: str, k: int, priority: str = "interactive"
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Records for the top-k tables, or None when too few tables are indexed"""
+        current = await self._current_index(index_name)
+        if current is None or len(current[0]) < settings.quick_min_tables:
+            self.stats["fallbacks"] += 1
+            return None
+
+        index, tables = current
+        query_vector = (await self.executor.run(priority, self.embedder.encode_query, [query]))[0]
+        self.stats["searches"] += 1
+        return [dict(tables[table_id], relevance_score=score) for table_id, score in index.search(query_vector, k)]
+
+    def status(self) -> Dict[str, Any]:
+        return dict(
+            self.stats,
+            indexes={name: len(entry[1]) for name, entry in self.indexes.items()},
+            pending=sum(len(p) for p in self.pending.values()),
+        )
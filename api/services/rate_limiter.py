@@ -0,0 +1,201 @@
+import hashlib
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+BUCKET_KEY_PREFIX = "ratelimit:"
+
+# Refill every bucket in KEYS and take tokens from all of them or none.
+# ARGV is now, cost, then capacity and rate per key.
+# Returns {allowed, retry_after_ms, tokens_left per key}
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+
+local tokens = {}
+local allowed = 1
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local rate = tonumber(ARGV[2 + 2 * i])
+    local state = redis.call("HMGET", key, "tokens", "ts")
+    local left = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if left == nil then
+        left = capacity
+        ts = now
+    end
+
+    left = math.min(capacity, left + math.max(0, now - ts) * rate / 1000)
+    if left < cost then
+        allowed = 0
+        retry_after = math.max(retry_after, math.ceil((cost - left) * 1000 / rate))
+    end
+    tokens[i] = left
+end
+
+local result = {allowed, retry_after}
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[1 + 2 * i])
+    local rate = tonumber(ARGV[2 + 2 * i])
+    if allowed == 1 then
+        tokens[i] = tokens[i] - cost
+    end
+    redis.call("HSET", key, "tokens", tokens[i], "ts", now)
+    redis.call("PEXPIRE", key, math.ceil(capacity * 1000 / rate) + 1000)
+    result[i + 2] = tostring(tokens[i])
+end
+return result
+"""
+
+# (key, capacity, refill per second)
+Bucket = Tuple[str, int, float]
+
+
+@dataclass
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+class RateLimiter:
+    """Token-bucket admission control per client and priority lane
+
+    Buckets live in Redis and are updated by a server-side script so concurrent
+    API workers share them; without Redis they fall back to process memory.
+    Each client (API key, or address for anonymous callers) has a bucket per
+    lane, and each of its sessions a smaller one inside it, so a new session id
+    buys no extra requests and one conversation cannot use up its client's budget.
+    """
+
+    PRUNE_EVERY = 1000
+
+    def __init__(self, redis: Any = None):
+        self.redis = redis
+        self._script = None
+        # key -> (tokens, last refill, capacity, rate)
+        self._local: Dict[str, Tuple[float, float, int, float]] = {}
+        self._calls = 0
+        self.lanes = {
+            "interactive": (
+                settings.rate_limit_interactive_capacity,
+                settings.rate_limit_interactive_refill_per_second,
+            ),
+            "bulk": (
+                settings.rate_limit_bulk_capacity,
+                settings.rate_limit_bulk_refill_per_second,
+            ),
+        }
+
+    @staticmethod
+    def client_identity(api_key: Optional[str], client_host: Optional[str]) -> str:
+        """Key a client's buckets by API key, or by address for anonymous callers"""
+        if api_key:
+            return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return f"ip:{client_host or 'unknown'}"
+
+    async def acquire(
+        self,
+        identity: str,
+        lane: str = "interactive",
+        cost: int = 1,
+        session_id: Optional[str] = None,
+    ) -> RateLimitDecision:
+        """Take tokens from the client's bucket for a lane, and from the session's bucket too"""
+        capacity, rate = self.lanes[lane]
+        if not settings.rate_limit_enabled:
+            return RateLimitDecision(True, capacity, capacity, 0.0, 0.0)
+
+        client_key = f"{BUCKET_KEY_PREFIX}{lane}:{identity}"
+        buckets: List[Bucket] = [(client_key, capacity, rate)]
+        share = settings.rate_limit_session_share
+        if session_id and 0 < share < 1:
+            buckets.append(
+                (f"{client_key}:session:{session_id}", max(1, int(capacity * share)), rate * share)
+            )
+        # A request never needs more than a full bucket, or it could never be admitted
+        cost = min(cost, min(bucket[1] for bucket in buckets))
+
+        if self.redis is not None:
+            try:
+                return await self._acquire_redis(buckets, cost)
+            except Exception as e:
+                logger.warning("Redis rate limiting unavailable, using local buckets", error=str(e))
+
+        return self._acquire_local(buckets, cost)
+
+    async def _acquire_redis(self, buckets: List[Bucket], cost: int) -> RateLimitDecision:
+        if self._script is None:
+            self._script = self.redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+        args: List[Any] = [int(time.time() * 1000), cost]
+        for _, capacity, rate in buckets:
+            args += [capacity, rate]
+        allowed, retry_after_ms, *tokens = await self._script(
+            keys=[key for key, _, _ in buckets], args=args
+        )
+        return self._decision(
+            bool(int(allowed)), [float(t) for t in tokens], buckets, int(retry_after_ms) / 1000
+        )
+
+    def _acquire_local(self, buckets: List[Bucket], cost: int) -> RateLimitDecision:
+        now = time.monotonic()
+        tokens = []
+        for key, capacity, rate in buckets:
+            left, ts, _, _ = self._local.get(key, (float(capacity), now, capacity, rate))
+            tokens.append(min(capacity, left + (now - ts) * rate))
+
+        allowed = all(left >= cost for left in tokens)
+        retry_after = 0.0
+        if allowed:
+            tokens = [left - cost for left in tokens]
+        else:
+            retry_after = max(
+                (cost - left) / rate for left, (_, _, rate) in zip(tokens, buckets) if left < cost
+            )
+
+        for left, (key, capacity, rate) in zip(tokens, buckets):
+            self._local[key] = (left, now, capacity, rate)
+        self._calls += 1
+        if self._calls % self.PRUNE_EVERY == 0:
+            self._prune(now)
+
+        return self._decision(allowed, tokens, buckets, retry_after)
+
+    def _prune(self, now: float):
+        """Forget local buckets that have refilled completely"""
+        for key, (tokens, ts, capacity, rate) in list(self._local.items()):
+            if tokens + (now - ts) * rate >= capacity:
+                del self._local[key]
+
+    def _decision(
+        self, allowed: bool, tokens: List[float], buckets: List[Bucket], retry_after: float
+    ) -> RateLimitDecision:
+        """Report on the bucket closest to empty, the one that limits the client"""
+        left, (_, capacity, rate) = min(zip(tokens, buckets), key=lambda pair: pair[0])
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=capacity,
+            remaining=int(left),
+            retry_after=retry_after,
+            reset_after=(capacity - left) / rate,
+        )
@@ -1,11 +1,13 @@
 import json
 import asyncio
-from typing import Dict, Any, List, Optional
+import time
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
-import aioredis
 import structlog
 
 from ..config import settings
+from .health_monitor import BREAKER_ERRORS, CircuitBreaker, CircuitOpenError
+from .session_store import SessionStore, create_session_store
 
 logger = structlog.get_logger()
 
@@ -14,43 +16,65 @@ class SessionService:
     """Service for managing user sessions and conversation context"""
 
     def __init__(self):
+        self.store: Optional[SessionStore] = None
+        # Raw Redis client shared with the rate limiter, query cache and job
+        # stores; None when sessions are kept locally
         self.redis = None
+        # Consulted on the request path so session calls fail fast while the store is down
+        self.breaker = CircuitBreaker("session_store")
+        self.sweep_task: Optional[asyncio.Task] = None
+        self.last_sweep: Dict[str, int] = {}
 
     async def initialize(self):
-        """Initialize Redis connection"""
-        try:
-            self.redis = aioredis.from_url(
-                f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}",
-                password=settings.redis_password,
-                encoding="utf-8",
-                decode_responses=True,
-            )
-
-            # Test connection
-            await self.redis.ping()
-            logger.info("Redis connection established")
-
-        except Exception as e:
-            logger.error("Failed to connect to Redis", error=str(e))
-            raise
+        """Open the configured session store (see SESSION_STORE)"""
+        self.store, self.redis = await create_session_store()
 
     async def cleanup(self):
-        """Cleanup Redis connection"""
-        if self.redis:
-            await self.redis.close()
-
-    async def add_query_to_session(self, session_id: str, query: str, response: Any):
-        """Add a query and response to session history"""
+        """Cleanup the session store"""
+        if self.sweep_task is not None:
+            self.sweep_task.cancel()
+        if self.store:
+            await self.store.close()
+
+    @property
+    def ttl_seconds(self) -> int:
+        return int(timedelta(hours=settings.session_expire_hours).total_seconds())
+
+    async def _store_call(self, method: str, *args, **kwargs) -> Any:
+        """Call the store through the circuit breaker"""
+        self.breaker.check()
+        try:
+            result = await getattr(self.store, method)(*args, **kwargs)
+        except BREAKER_ERRORS:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def add_query_to_session(
+        self,
+        session_id: str,
+        query: str,
+        response: Any,
+        index_name: Optional[str] = None,
+        request_id: Optional[str] = None,
+    ):
+        """Add a query and response to session history
+
+        A retried request carries the same ``request_id`` and is recorded once.
+        """
         try:
-            session_key = f"session:{session_id}"
-
             # Get existing session data
             session_data = await self.get_session_data(session_id)
+            if request_id and any(q.get("request_id") == request_id for q in session_data["queries"]):
+                logger.debug("Query already recorded", session_id=session_id, request_id=request_id)
+                return
 
             # Add new query
             query_entry = {
                 "timestamp": datetime.utcnow().isoformat(),
                 "query": query,
+                "index_name": index_name,
                 "response_summary": {
                     "results_count": len(response.results) if response.results else 0,
                     "search_time_ms": response.search_time_ms,
@@ -59,26 +83,47 @@ class SessionService:
                     ],  # First 5 tables
                 },
             }
+            if request_id:
+                query_entry["request_id"] = request_id
 
             session_data["queries"].append(query_entry)
             session_data["last_activity"] = datetime.utcnow().isoformat()
             session_data["query_count"] = len(session_data["queries"])
 
-            # Store updated session
-            await self.redis.setex(
-                session_key,
-                timedelta(hours=settings.session_expire_hours).total_seconds(),
-                json.dumps(session_data),
-            )
+            # Store updated session and bump it in the activity index
+            await self._store_call("put", session_id, json.dumps(session_data), self.ttl_seconds, touch=True)
 
+        except CircuitOpenError:
+            logger.debug("Session store circuit open, history not recorded", session_id=session_id)
         except Exception as e:
             logger.error("Failed to store session data", error=str(e))
 
+    async def save_candidate_pool(self, session_id: str, pool: Dict[str, Any]):
+        """Keep the last query's candidate pool for follow-up refinement"""
+        try:
+            await self._store_call("put", session_id, json.dumps(pool), self.ttl_seconds, kind="pool")
+
+        except CircuitOpenError:
+            pass
+        except Exception as e:
+            logger.error("Failed to store candidate pool", error=str(e))
+
+    async def get_candidate_pool(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the last query's candidate pool, if the session has one"""
+        try:
+            data = await self._store_call("get", session_id, kind="pool")
+            return json.loads(data) if data else None
+
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            logger.error("Failed to retrieve candidate pool", error=str(e))
+            return None
+
     async def get_session_data(self, session_id: str) -> Dict[str, Any]:
         """Get session data"""
         try:
-            session_key = f"session:{session_id}"
-            data = await self.redis.get(session_key)
+            data = await self._store_call("get", session_id)
 
             if data:
                 return json.loads(data)
@@ -93,6 +138,8 @@ class SessionService:
                     "bookmarked_tables": [],
                 }
 
+        except CircuitOpenError:
+            return {"session_id": session_id, "queries": [], "query_count": 0}
         except Exception as e:
             logger.error("Failed to retrieve session data", error=str(e))
             return {"session_id": session_id, "queries": [], "query_count": 0}
@@ -101,3 +148,47 @@ class SessionService:
         """Get query history for a session"""
         session_data = await self.get_session_data(session_id)
         return session_data.get("queries", [])
+
+    async def delete_session(self, session_id: str) -> bool:
+        """Delete a session, its side records and its activity entry"""
+        return await self.delete_sessions([session_id]) > 0
+
+    async def delete_sessions(self, session_ids: List[str]) -> int:
+        """Delete sessions in batches; returns how many existed"""
+        return await self.store.delete(session_ids)
+
+    async def count_active_sessions(self, window_seconds: float) -> int:
+        """Sessions with activity in the last window_seconds"""
+        return await self.store.count_active(time.time() - window_seconds)
+
+    async def list_idle_sessions(
+        self, idle_seconds: float, limit: int = 100, offset: int = 0
+    ) -> List[Tuple[str, float]]:
+        """Sessions idle for at least idle_seconds, least recently active first"""
+        return await self.store.list_idle(time.time() - idle_seconds, limit, offset)
+
+    async def expire_idle_sessions(self, idle_seconds: float) -> int:
+        """Delete every session idle for at least idle_seconds, batch by batch"""
+        cutoff = time.time() - idle_seconds
+        deleted = 0
+        while True:
+            batch = await self.store.list_idle(cutoff, settings.session_delete_batch_size)
+            if not batch:
+                return deleted
+            deleted += await self.delete_sessions([session_id for session_id, _ in batch])
+            # Leave the store room for live traffic between batches
+            await asyncio.sleep(0)
+
+    def start_sweep(self) -> bool:
+        """Run sweep_sessions in the background; False if one is already running"""
+        if self.sweep_task is not None and not self.sweep_task.done():
+            return False
+        self.sweep_task = asyncio.create_task(self.sweep_sessions())
+        return True
+
+    async def sweep_sessions(self) -> Dict[str, int]:
+        """Reclaim expired sessions and reconcile the activity index"""
+        summary = await self.store.sweep()
+        self.last_sweep = summary
+        logger.info("Session sweep finished", store=self.store.name, **summary)
+        return summary
@@ -0,0 +1,518 @@
+import asyncio
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import structlog
+
+from ..config import settings
+
+logger = structlog.get_logger()
+
+# Sorted set of session ids scored by last activity (epoch seconds)
+SESSION_ACTIVITY_KEY = "sessions:activity"
+# Per-session records; "history" is the query log, the others are side data
+SESSION_KINDS = ("history", "pool")
+
+
+class SessionStore(ABC):
+    """Storage for session records plus an index of last activity per session"""
+
+    name = "abstract"
+
+    @abstractmethod
+    async def get(self, session_id: str, kind: str = "history") -> Optional[str]:
+        """Stored value, or None if missing or expired"""
+
+    @abstractmethod
+    async def put(self, session_id: str, value: str, ttl: int, kind: str = "history", touch: bool = False):
+        """Store a value for ttl seconds; touch also bumps the session's activity"""
+
+    @abstractmethod
+    async def delete(self, session_ids: List[str]) -> int:
+        """Delete sessions with all their records; returns how many existed"""
+
+    @abstractmethod
+    async def count_active(self, since: float) -> int:
+        """Sessions active at or after the given epoch time"""
+
+    @abstractmethod
+    async def list_idle(self, before: float, limit: int, offset: int = 0) -> List[Tuple[str, float]]:
+        """(session_id, last_activity) for sessions idle since before, oldest first"""
+
+    @abstractmethod
+    def iter_histories(self, batch_size: int) -> AsyncIterator[List[str]]:
+        """Yield batches of stored session histories"""
+
+    @abstractmethod
+    async def sweep(self) -> Dict[str, int]:
+        """Reclaim expired records and reconcile the activity index"""
+
+    async def ping(self):
+        """Raise if the store is unreachable"""
+
+    async def close(self):
+        pass
+
+
+class RedisSessionStore(SessionStore):
+    """Sessions as Redis keys with a sorted-set activity index, shared by all workers"""
+
+    name = "redis"
+
+    def __init__(self, client: Any):
+        self.redis = client
+
+    @staticmethod
+    def _key(session_id: str, kind: str) -> str:
+        return f"session:{session_id}" if kind == "history" else f"session:{session_id}:{kind}"
+
+    async def get(self, session_id: str, kind: str = "history") -> Optional[str]:
+        return await self.redis.get(self._key(session_id, kind))
+
+    async def put(self, session_id: str, value: str, ttl: int, kind: str = "history", touch: bool = False):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.setex(self._key(session_id, kind), ttl, value)
+            if touch:
+                pipe.zadd(SESSION_ACTIVITY_KEY, {session_id: time.time()})
+            await pipe.execute()
+
+    async def delete(self, session_ids: List[str]) -> int:
+        deleted = 0
+        batch_size = settings.session_delete_batch_size
+        for start in range(0, len(session_ids), batch_size):
+            batch = session_ids[start:start + batch_size]
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for session_id in batch:
+                    pipe.delete(*(self._key(session_id, kind) for kind in SESSION_KINDS))
+                pipe.zrem(SESSION_ACTIVITY_KEY, *batch)
+                results = await pipe.execute()
+            deleted += sum(1 for removed in results[:-1] if removed)
+        return deleted
+
+    async def count_active(self, since: float) -> int:
+        return await self.redis.zcount(SESSION_ACTIVITY_KEY, since, "+inf")
+
+    async def list_idle(self, before: float, limit: int, offset: int = 0) -> List[Tuple[str, float]]:
+        return await self.redis.zrangebyscore(
+            SESSION_ACTIVITY_KEY, "-inf", before, start=offset, num=limit, withscores=True
+        )
+
+    async def iter_histories(self, batch_size: int) -> AsyncIterator[List[str]]:
+        batch: List[str] = []
+        async for key in self.redis.scan_iter(match="session:*", count=batch_size):
+            # Skip per-session side keys such as candidate pools
+            if key.count(":") != 1:
+                continue
+            batch.append(key)
+            if len(batch) >= batch_size:
+                yield [v for v in await self.redis.mget(batch) if v]
+                batch = []
+        if batch:
+            yield [v for v in await self.redis.mget(batch) if v]
+
+    async def sweep(self) -> Dict[str, int]:
+        """Reconcile the activity index with the session keys
+
+        Drops index entries whose sessions have expired and, using an
+        incremental SCAN throttled to SESSION_SWEEP_KEYS_PER_SECOND, adds
+        sessions missing from the index (e.g. created before it existed),
+        estimating their last activity from the remaining TTL.
+        """
+        expire_seconds = timedelta(hours=settings.session_expire_hours).total_seconds()
+        now = time.time()
+        pruned = await self.redis.zremrangebyscore(SESSION_ACTIVITY_KEY, "-inf", now - expire_seconds)
+
+        scanned = indexed = 0
+        cursor = 0
+        delay = settings.session_sweep_scan_count / settings.session_sweep_keys_per_second
+        while True:
+            cursor, keys = await self.redis.scan(
+                cursor, match="session:*", count=settings.session_sweep_scan_count
+            )
+            session_ids = [key.split(":", 1)[1] for key in keys if key.count(":") == 1]
+            scanned += len(keys)
+
+            if session_ids:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for session_id in session_ids:
+                        pipe.zscore(SESSION_ACTIVITY_KEY, session_id)
+                        pipe.ttl(f"session:{session_id}")
+                    results = await pipe.execute()
+
+                missing = {}
+                for i, session_id in enumerate(session_ids):
+                    score, ttl = results[2 * i], results[2 * i + 1]
+                    if score is None and ttl is not None and ttl > 0:
+                        missing[session_id] = now - (expire_seconds - ttl)
+                if missing:
+                    await self.redis.zadd(SESSION_ACTIVITY_KEY, missing)
+                    indexed += len(missing)
+
+            if cursor == 0:
+                break
+            await asyncio.sleep(delay)
+
+        return {"scanned": scanned, "indexed": indexed, "pruned": pruned}
+
+    async def ping(self):
+        await self.redis.ping()
+
+    async def close(self):
+        await self.redis.close()
+
+
+class MemorySessionStore(SessionStore):
+    """Bounded in-process LRU of sessions with per-record TTLs
+
+    Least recently used sessions are evicted beyond max_sessions. Sessions are
+    local to the worker process, which suits single-node setups and tests.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_sessions: int):
+        self.max_sessions = max_sessions
+        self.sessions: "OrderedDict[str, Dict[str, Tuple[str, float]]]" = OrderedDict()
+        self.activity: Dict[str, float] = {}
+
+    def _drop(self, session_id: str):
+        self.sessions.pop(session_id, None)
+        self.activity.pop(session_id, None)
+
+    async def get(self, session_id: str, kind: str = "history") -> Optional[str]:
+        records = self.sessions.get(session_id)
+        if not records or kind not in records:
+            return None
+
+        value, expires_at = records[kind]
+        if expires_at <= time.time():
+            del records[kind]
+            if not records:
+                self._drop(session_id)
+            return None
+
+        self.sessions.move_to_end(session_id)
+        return value
+
+    async def put(self, session_id: str, value: str, ttl: int, kind: str = "history", touch: bool = False):
+        now = time.time()
+        self.sessions.setdefault(session_id, {})[kind] = (value, now + ttl)
+        self.sessions.move_to_end(session_id)
+        if touch:
+            self.activity[session_id] = now
+
+        while len(self.sessions) > self.max_sessions:
+            evicted, _ = self.sessions.popitem(last=False)
+            self.activity.pop(evicted, None)
+
+    async def delete(self, session_ids: List[str]) -> int:
+        deleted = 0
+        for session_id in session_ids:
+            if session_id in self.sessions:
+                deleted += 1
+            self._drop(session_id)
+        return deleted
+
+    async def count_active(self, since: float) -> int:
+        return sum(1 for ts in self.activity.values() if ts >= since)
+
+    async def list_idle(self, before: float, limit: int, offset: int = 0) -> List[Tuple[str, float]]:
+        idle = sorted((ts, sid) for sid, ts in self.activity.items() if ts <= before)
+        return [(sid, ts) for ts, sid in idle[offset:offset + limit]]
+
+    async def iter_histories(self, batch_size: int) -> AsyncIterator[List[str]]:
+        now = time.time()
+        values = [
+            records["history"][0]
+            for records in list(self.sessions.values())
+            if "history" in records and records["history"][1] > now
+        ]
+        for start in range(0, len(values), batch_size):
+            yield values[start:start + batch_size]
+
+    async def sweep(self) -> Dict[str, int]:
+        now = time.time()
+        expired = [
+            sid for sid, records in self.sessions.items()
+            if all(expires_at <= now for _, expires_at in records.values())
+        ]
+        for session_id in expired:
+            self._drop(session_id)
+        return {"pruned": len(expired)}
+
+
+class SqliteSessionStore(SessionStore):
+    """Sessions in a local SQLite file; survives restarts without a server
+
+    Calls run on a worker thread against one WAL-mode connection.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS sessions ("
+        " session_id TEXT NOT NULL, kind TEXT NOT NULL, value TEXT NOT NULL,"
+        " expires_at REAL NOT NULL, PRIMARY KEY (session_id, kind))",
+        "CREATE TABLE IF NOT EXISTS activity ("
+        " session_id TEXT PRIMARY KEY, last_activity REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS activity_last ON activity (last_activity)",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[Any] = None  # sqlite3.Connection, opened on first use
+        self._lock = threading.Lock()
+
+    def _connection(self) -> Any:
+        if self._conn is None:
+            import sqlite3
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, fn, *args):
+        def locked():
+            with self._lock:
+                return fn(self._connection(), *args)
+
+        return await asyncio.to_thread(locked)
+
+    async def get(self, session_id: str, kind: str = "history") -> Optional[str]:
+        def query(conn):
+            row = conn.execute(
+                "SELECT value FROM sessions WHERE session_id = ? AND kind = ? AND expires_at > ?",
+                (session_id, kind, time.time()),
+            ).fetchone()
+            return row[0] if row else None
+
+        return await self._run(query)
+
+    async def put(self, session_id: str, value: str, ttl: int, kind: str = "history", touch: bool = False):
+        def write(conn):
+            now = time.time()
+            with conn:
+                conn.execute("BEGIN")
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, kind, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (session_id, kind, value, now + ttl),
+                )
+                if touch:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO activity (session_id, last_activity) VALUES (?, ?)",
+                        (session_id, now),
+                    )
+
+        await self._run(write)
+
+    async def delete(self, session_ids: List[str]) -> int:
+        def remove(conn):
+            deleted = 0
+            batch_size = settings.session_delete_batch_size
+            with conn:
+                conn.execute("BEGIN")
+                for start in range(0, len(session_ids), batch_size):
+                    batch = session_ids[start:start + batch_size]
+                    marks = ",".join("?" * len(batch))
+                    deleted += conn.execute(
+                        f"SELECT COUNT(DISTINCT session_id) FROM sessions WHERE session_id IN ({marks})", batch
+                    ).fetchone()[0]
+                    conn.execute(f"DELETE FROM sessions WHERE session_id IN ({marks})", batch)
+                    conn.execute(f"DELETE FROM activity WHERE session_id IN ({marks})", batch)
+            return deleted
+
+        return await self._run(remove)
+
+    async def count_active(self, since: float) -> int:
+        def query(conn):
+            return conn.execute(
+                "SELECT COUNT(*) FROM activity WHERE last_activity >= ?", (since,)
+            ).fetchone()[0]
+
+        return await self._run(query)
+
+    async def list_idle(self, before: float, limit: int, offset: int = 0) -> List[Tuple[str, float]]:
+        def query(conn):
+            return conn.execute(
+                "SELECT session_id, last_activity FROM activity WHERE last_activity <= ?"
+                " ORDER BY last_activity LIMIT ? OFFSET ?",
+                (before, limit, offset),
+            ).fetchall()
+
+        return [tuple(row) for row in await self._run(query)]
+
+    async def iter_histories(self, batch_size: int) -> AsyncIterator[List[str]]:
+        def page(conn, after):
+            return conn.execute(
+                "SELECT session_id, value FROM sessions WHERE kind = 'history' AND expires_at > ?"
+                " AND session_id > ? ORDER BY session_id LIMIT ?",
+                (time.time(), after, batch_size),
+            ).fetchall()
+
+        after = ""
+        while True:
+            rows = await self._run(page, after)
+            if not rows:
+                return
+            yield [value for _, value in rows]
+            after = rows[-1][0]
+
+    async def sweep(self) -> Dict[str, int]:
+        def purge(conn):
+            with conn:
+                conn.execute("BEGIN")
+                pruned = conn.execute(
+                    "DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)
+                ).rowcount
+                conn.execute(
+                    "DELETE FROM activity WHERE session_id NOT IN (SELECT session_id FROM sessions)"
+                )
+            return {"pruned": pruned}
+
+        return await self._run(purge)
+
+    async def ping(self):
+        await self._run(lambda conn: conn.execute("SELECT 1").fetchone())
+
+    async def close(self):
+        def close_connection(conn):
+            conn.close()
+            self._conn = None
+
+        if self._conn is not None:
+            await self._run(close_connection)
+
+
+class FailoverSessionStore(SessionStore):
+    """Serves from a primary store and degrades to a local one when it fails
+
+    After a connection failure the primary is skipped for
+    SESSION_REDIS_RETRY_SECONDS, then tried again. Sessions written during
+    the outage stay in the fallback store.
+    """
+
+    def __init__(self, primary: SessionStore, fallback: SessionStore, primary_up: bool = True):
+        import redis.exceptions
+
+        self.failover_errors = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, OSError)
+        self.primary = primary
+        self.fallback = fallback
+        self.retry_at = 0.0 if primary_up else time.monotonic() + settings.session_redis_retry_seconds
+
+    @property
+    def name(self) -> str:
+        return self.primary.name if self.primary_up else f"{self.fallback.name} (fallback)"
+
+    @property
+    def primary_up(self) -> bool:
+        return time.monotonic() >= self.retry_at
+
+    def _mark_down(self, error: Exception):
+        if self.primary_up:
+            logger.warning(
+                "Session store unavailable, degrading to local store",
+                primary=self.primary.name,
+                fallback=self.fallback.name,
+                error=str(error),
+            )
+        self.retry_at = time.monotonic() + settings.session_redis_retry_seconds
+
+    async def _call(self, method: str, *args, **kwargs):
+        if self.primary_up:
+            try:
+                return await getattr(self.primary, method)(*args, **kwargs)
+            except self.failover_errors as e:
+                self._mark_down(e)
+        return await getattr(self.fallback, method)(*args, **kwargs)
+
+    async def get(self, session_id: str, kind: str = "history") -> Optional[str]:
+        return await self._call("get", session_id, kind)
+
+    async def put(self, session_id: str, value: str, ttl: int, kind: str = "history", touch: bool = False):
+        await self._call("put", session_id, value, ttl, kind, touch)
+
+    async def delete(self, session_ids: List[str]) -> int:
+        return await self._call("delete", session_ids)
+
+    async def count_active(self, since: float) -> int:
+        return await self._call("count_active", since)
+
+    async def list_idle(self, before: float, limit: int, offset: int = 0) -> List[Tuple[str, float]]:
+        return await self._call("list_idle", before, limit, offset)
+
+    async def iter_histories(self, batch_size: int) -> AsyncIterator[List[str]]:
+        store = self.primary if self.primary_up else self.fallback
+        async for batch in store.iter_histories(batch_size):
+            yield batch
+
+    async def sweep(self) -> Dict[str, int]:
+        return await self._call("sweep")
+
+    async def ping(self):
+        await self._call("ping")
+
+    async def close(self):
+        await self.primary.close()
+        await self.fallback.close()
+
+
+def create_local_store(kind: str) -> SessionStore:
+    if kind == "sqlite":
+        path = settings.session_sqlite_path or os.path.join(settings.pneuma_storage_path, "sessions.db")
+        return SqliteSessionStore(path)
+    return MemorySessionStore(settings.session_memory_max_sessions)
+
+
+async def create_session_store() -> Tuple[SessionStore, Optional[Any]]:
+    """Build the configured store; also returns the Redis client for Redis stores
+
+    The client is returned even when Redis is down at startup: the failover
+    store and the circuit breaker route around the outage, and the rate
+    limiter and query cache fall back to local state per call until it ends.
+    """
+    if settings.session_store in ("memory", "sqlite"):
+        logger.info("Using local session store", store=settings.session_store)
+        return create_local_store(settings.session_store), None
+
+    # Imported here so local-store deployments never load the Redis client
+    import redis.asyncio as redis_asyncio
+
+    client = redis_asyncio.from_url(
+        f"redis://{settings.redis_host}:{settings.redis_port}/{settings.redis_db}",
+        password=settings.redis_password,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        encoding="utf-8",
+        decode_responses=True,
+    )
+    store = RedisSessionStore(client)
+
+    try:
+        await client.ping()
+        logger.info("Redis connection established")
+        redis_up = True
+    except Exception as e:
+        if settings.session_store_fallback == "none":
+            logger.error("Failed to connect to Redis", error=str(e))
+            raise
+        logger.warning(
+            "Redis unavailable at startup, using local session store",
+            fallback=settings.session_store_fallback,
+            error=str(e),
+        )
+        redis_up = False
+
+    if settings.session_store_fallback == "none":
+        return store, client
+
+    fallback = create_local_store(settings.session_store_fallback)
+    return FailoverSessionStore(store, fallback, primary_up=redis_up), client
@@ -0,0 +1,147 @@
+import fcntl
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+import structlog
+
+from ..config import settings
+from ..models.requests import INDEX_NAME_PATTERN as INDEX_NAME_REGEX
+
+logger = structlog.get_logger()
+
+LOG_SUFFIX = ".jsonl"
+
+# Fields that describe the table itself; relevance_score belongs to one query
+METADATA_FIELDS = (
+    "table_id",
+    "table_name",
+    "description",
+    "row_count",
+    "column_count",
+    "schema",
+    "sample_data",
+    "metadata",
+)
+MAX_SAMPLE_ROWS = 10
+
+# Index names become file names; anything else is not recorded
+INDEX_NAME_PATTERN = re.compile(INDEX_NAME_REGEX)
+
+
+class TableMetadataLog:
+    """Last known metadata of every table one index has returned
+
+    Records are appended to a JSON-lines file that every API worker tails, so
+    a table returned through any worker, before or after a restart, can be
+    looked up by id. A record is only written when it adds or changes a field.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Pick up records written by any worker"""
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                return
+            if size < self._offset:
+                # Rewritten by hand; read it again from the start
+                self.tables, self._offset = {}, 0
+            if size == self._offset:
+                return
+
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+
+            # Only apply complete lines; a writer may be mid-append
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                if line.strip():
+                    record = json.loads(line)
+                    self.tables[record["table_id"]] = record
+            self._offset += end
+
+    def record(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Store the records that add or change metadata; returns how many (blocking)"""
+        self.refresh()
+
+        changed: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for record in records:
+                table_id = record.get("table_id")
+                if not table_id:
+                    continue
+                known = changed.get(table_id) or self.tables.get(table_id, {})
+                update = {f: record[f] for f in METADATA_FIELDS if f in record}
+                if isinstance(update.get("sample_data"), list):
+                    update["sample_data"] = update["sample_data"][:MAX_SAMPLE_ROWS]
+                merged = {**known, **update}
+                if merged != known:
+                    changed[table_id] = merged
+        if not changed:
+            return 0
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write("".join(json.dumps(r, default=str) + "\n" for r in changed.values()))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        self.refresh()
+        return len(changed)
+
+
+class TableMetadataStore:
+    """Table metadata logs for every index, stored under <pneuma_storage_path>/tables
+
+    Pneuma has no lookup by table id, so table details are served from the
+    records it has returned in search results.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(settings.pneuma_storage_path, "tables")
+        self.logs: Dict[str, TableMetadataLog] = {}
+
+    def log(self, index_name: str) -> Optional[TableMetadataLog]:
+        """The refreshed log for an index, or None if the name cannot be stored"""
+        if not INDEX_NAME_PATTERN.match(index_name):
+            return None
+        log = self.logs.get(index_name)
+        if log is None:
+            log = self.logs[index_name] = TableMetadataLog(
+                os.path.join(self.root, index_name + LOG_SUFFIX)
+            )
+        log.refresh()
+        return log
+
+    def record(self, index_name: str, records: List[Dict[str, Any]]) -> int:
+        """Remember the tables in a search result (blocking)"""
+        log = self.log(index_name)
+        if log is None:
+            return 0
+        try:
+            return log.record(records)
+        except OSError as e:
+            logger.warning("Failed to record table metadata", index=index_name, error=str(e))
+            return 0
+
+    def index_names(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return sorted(self.logs)
+        return sorted(
+            set(self.logs)
+            | {
+                name[: -len(LOG_SUFFIX)] for name in os.listdir(self.root)
+                if name.endswith(LOG_SUFFIX) and INDEX_NAME_PATTERN.match(name[: -len(LOG_SUFFIX)])
+            }
+        )
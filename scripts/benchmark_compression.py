@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression on typical Pneuma query payloads
+
+Builds QueryResponse-shaped payloads (k tables with schema and sample rows),
+compresses them with every available codec and reports the bytes saved and the
+end-to-end latency (compress + transfer + decompress) at several link speeds.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+WORDS = (
+    "crime traffic weather permit inspection district ward community area "
+    "beat arrest violation license business address latitude longitude "
+    "date time year month category status description type code"
+).split()
+
+# Link speeds in megabits per second
+LINKS = {"loopback": 10_000, "lan": 1_000, "wan": 100, "slow": 10}
+
+
+def make_table(i: int, columns: int, rows: int) -> dict:
+    names = [f"{random.choice(WORDS)}_{c}" for c in range(columns)]
+    return {
+        "table_id": f"chicago_{i:05d}",
+        "table_name": f"{random.choice(WORDS).title()} {random.choice(WORDS).title()} Records",
+        "description": " ".join(random.choices(WORDS, k=40)),
+        "relevance_score": round(random.random(), 4),
+        "row_count": random.randint(1_000, 5_000_000),
+        "column_count": columns,
+        "schema": [
+            {
+                "name": name,
+                "type": random.choice(["string", "integer", "float", "date"]),
+                "description": " ".join(random.choices(WORDS, k=8)),
+            }
+            for name in names
+        ],
+        "sample_data": [
+            {name: random.choice([random.randint(0, 99999), " ".join(random.choices(WORDS, k=2))]) for name in names}
+            for _ in range(rows)
+        ],
+        "metadata": {"source": "data.cityofchicago.org", "updated": "2024-01-15"},
+    }
+
+
+def make_response(k: int, columns: int, rows: int) -> bytes:
+    payload = {
+        "query": "crime data with location information",
+        "session_id": "3f1c2b1e-bench",
+        "results": [make_table(i, columns, rows) for i in range(k)],
+        "total_results": k,
+        "search_time_ms": 812.5,
+        "timestamp": "2024-01-15T12:00:00",
+    }
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def codecs() -> dict:
+    available = {
+        "gzip-1": (lambda b: gzip.compress(b, 1), gzip.decompress),
+        "gzip-6": (lambda b: gzip.compress(b, 6), gzip.decompress),
+    }
+    if zstandard is not None:
+        available["zstd-3"] = (
+            zstandard.ZstdCompressor(level=3).compress,
+            zstandard.ZstdDecompressor().decompress,
+        )
+    if brotli is not None:
+        available["br-4"] = (lambda b: brotli.compress(b, quality=4), brotli.decompress)
+    return available
+
+
+def timed(fn, data, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(data)
+    return out, (time.perf_counter() - start) / repeat * 1000
+
+
+def transfer_ms(size: int, mbps: int) -> float:
+    return size * 8 / (mbps * 1_000_000) * 1000
+
+
+def benchmark(label: str, body: bytes, repeat: int):
+    print(f"\n📦 {label}: {len(body):,} bytes uncompressed")
+    header = f"{'codec':<10} {'bytes':>10} {'ratio':>7} {'comp ms':>8} {'decomp ms':>9}"
+    header += "".join(f" {name + ' ms':>12}" for name in LINKS)
+    print(header)
+
+    row = f"{'identity':<10} {len(body):>10,} {1.0:>7.2f} {0.0:>8.2f} {0.0:>9.2f}"
+    row += "".join(f" {transfer_ms(len(body), mbps):>12.2f}" for mbps in LINKS.values())
+    print(row)
+
+    for name, (compress, decompress) in codecs().items():
+        compressed, comp_ms = timed(compress, body, repeat)
+        _, decomp_ms = timed(decompress, compressed, repeat)
+        row = f"{name:<10} {len(compressed):>10,} {len(body) / len(compressed):>7.2f} {comp_ms:>8.2f} {decomp_ms:>9.2f}"
+        for mbps in LINKS.values():
+            total = comp_ms + decomp_ms + transfer_ms(len(compressed), mbps)
+            row += f" {total:>12.2f}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    print("🗜️  Pneuma response compression benchmark")
+    print("Link columns are end-to-end ms: compress + transfer + decompress")
+
+    benchmark("k=5, search-tool fields", make_response(5, 12, 0), args.repeat)
+    benchmark("k=5 with schema + 10 sample rows", make_response(5, 25, 10), args.repeat)
+    benchmark("k=20 with schema + 10 sample rows", make_response(20, 25, 10), args.repeat)
+    benchmark("k=20 wide tables, 50 sample rows", make_response(20, 80, 50), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
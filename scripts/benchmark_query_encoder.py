@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark the int8 quantized query encoder against the fp32 model
+
+Reports single-query latency, batch throughput (total and per core), model
+size on disk and retrieval quality: how closely int8 query embeddings match
+fp32 ones and the recall@k of int8 queries against fp32 results over a table
+corpus (fp32 table embeddings in both cases, as in the service).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+WORDS = (
+    "crime traffic weather permit inspection district ward community area "
+    "beat arrest violation license business address latitude longitude "
+    "school budget salary employee housing tree taxi fare trip restaurant"
+).split()
+
+QUERIES = [
+    "crime data with location information",
+    "building permits issued by year",
+    "traffic crashes involving cyclists",
+    "restaurant food inspection results",
+    "public school enrollment by ward",
+    "taxi trips with fares and tips",
+    "street tree species and condition",
+    "affordable housing developments",
+    "city employee salaries by department",
+    "311 service requests for potholes",
+]
+
+
+def synthetic_tables(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    return [
+        {
+            "table_id": f"t{i}",
+            "table_name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} Records",
+            "description": " ".join(rng.choices(WORDS, k=30)),
+            "schema": [{"name": f"{rng.choice(WORDS)}_{c}"} for c in range(8)],
+        }
+        for i in range(count)
+    ]
+
+
+def percentile(values, q):
+    return float(np.percentile(np.asarray(values), q))
+
+
+def time_single(encode, queries, repeats):
+    encode(queries[:1])  # warm up
+    latencies = []
+    for _ in range(repeats):
+        for query in queries:
+            start = time.perf_counter()
+            encode([query])
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def time_batch(encode, queries, batch_size, seconds):
+    batch = (queries * (batch_size // len(queries) + 1))[:batch_size]
+    encode(batch)
+    done, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        encode(batch)
+        done += len(batch)
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=None, help="Embedding model (default: PNEUMA_EMBED_PATH)")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--tables", type=int, default=2000, help="Synthetic corpus size")
+    parser.add_argument("--tables-file", help="JSON list of table records to search instead")
+    parser.add_argument("--queries-file", help="One query per line (default: built-in set)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each throughput run")
+    args = parser.parse_args()
+
+    import torch
+
+    from api.config import settings
+    from api.services.embedding_service import EmbeddingService, table_text
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    settings.embedding_device = "cpu"
+    settings.embedding_quantized_path = os.path.join(tempfile.mkdtemp(), "query.int8.pt")
+
+    embedder = EmbeddingService(args.model, quantize_queries=True)
+    queries = QUERIES
+    if args.queries_file:
+        with open(args.queries_file, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    if args.tables_file:
+        with open(args.tables_file, "r", encoding="utf-8") as f:
+            tables = json.load(f)
+    else:
+        tables = synthetic_tables(args.tables, seed=0)
+
+    start = time.perf_counter()
+    embedder.encode_query(queries[:1])
+    print(f"model {embedder.model_path}, {torch.get_num_threads()} threads")
+    print(f"int8 export + load: {time.perf_counter() - start:.1f}s,"
+          f" artifact {os.path.getsize(settings.embedding_quantized_path) / 1e6:.1f} MB\n")
+
+    encoders = {"fp32": embedder.encode, "int8": embedder.encode_query}
+    cores = torch.get_num_threads()
+    print(f"{'encoder':<8}{'p50 ms':>10}{'p95 ms':>10}{'queries/s':>12}{'per core':>10}")
+    for name, encode in encoders.items():
+        latencies = time_single(encode, queries, args.repeats)
+        throughput = time_batch(encode, queries, args.batch_size, args.seconds)
+        print(f"{name:<8}{percentile(latencies, 50):>10.2f}{percentile(latencies, 95):>10.2f}"
+              f"{throughput:>12.1f}{throughput / cores:>10.1f}")
+
+    corpus = embedder.encode([table_text(t) for t in tables])
+    fp32_queries = embedder.encode(queries)
+    int8_queries = embedder.encode_query(queries)
+    cosine = np.sum(fp32_queries * int8_queries, axis=1)
+
+    k = min(args.k, len(tables))
+    hits = 0
+    for fp32_q, int8_q in zip(fp32_queries, int8_queries):
+        truth = set(np.argpartition(-(corpus @ fp32_q), k - 1)[:k])
+        found = set(np.argpartition(-(corpus @ int8_q), k - 1)[:k])
+        hits += len(truth & found)
+
+    print(f"\nquery embedding cosine fp32 vs int8: mean {cosine.mean():.4f}, min {cosine.min():.4f}")
+    print(f"int8 recall@{k} vs fp32 over {len(tables)} tables: {hits / (len(queries) * k):.3f}")
+
+
+if __name__ == "__main__":
+    main()
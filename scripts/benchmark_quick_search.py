@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark quick-mode search: recall and latency against exhaustive and thorough search
+
+ann:  builds the in-process IVF index over synthetic clustered embeddings and
+      reports recall@k against exact search and query latency for several
+      nprobe values.
+api:  sends the same queries to a running API in thorough and quick mode and
+      reports recall@k of quick against thorough plus per-mode latency.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+DEFAULT_QUERIES = [
+    "crime data with location information",
+    "building permits issued by year",
+    "traffic crashes involving cyclists",
+    "restaurant food inspection results",
+    "public school enrollment by ward",
+    "taxi trips with fares and tips",
+    "street tree species and condition",
+    "affordable housing developments",
+    "city employee salaries by department",
+    "311 service requests for potholes",
+]
+
+
+def percentile(values, q):
+    return float(np.percentile(np.asarray(values), q)) if values else float("nan")
+
+
+def synthetic_embeddings(count: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Unit vectors drawn around random topic centres, like description embeddings"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, count)] + 0.6 * rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def bench_ann(args):
+    from api.services.quick_search import IVFIndex
+
+    vectors = synthetic_embeddings(args.tables, args.dim, args.clusters, args.seed)
+    queries = synthetic_embeddings(args.queries, args.dim, args.clusters, args.seed + 1)
+    ids = [f"t{i}" for i in range(args.tables)]
+
+    start = time.perf_counter()
+    index = IVFIndex(ids, vectors, n_lists=args.lists)
+    build_s = time.perf_counter() - start
+    print(f"{args.tables} tables x {args.dim} dims, {index.n_lists} lists, built in {build_s:.2f}s\n")
+
+    exact = []
+    exact_ms = []
+    for q in queries:
+        start = time.perf_counter()
+        scores = vectors @ q
+        top = np.argpartition(-scores, args.k - 1)[: args.k]
+        exact_ms.append((time.perf_counter() - start) * 1000)
+        exact.append({ids[i] for i in top})
+
+    print(f"{'search':<14}{'recall@' + str(args.k):>10}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'exact':<14}{1.0:>10.3f}{percentile(exact_ms, 50):>10.3f}{percentile(exact_ms, 95):>10.3f}")
+    for nprobe in args.nprobe:
+        hits, latencies = 0, []
+        for q, truth in zip(queries, exact):
+            start = time.perf_counter()
+            found = index.search(q, args.k, nprobe=nprobe)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len(truth & {table_id for table_id, _ in found})
+        recall = hits / (len(queries) * args.k)
+        label = f"ivf nprobe={nprobe}"
+        print(f"{label:<14}{recall:>10.3f}{percentile(latencies, 50):>10.3f}{percentile(latencies, 95):>10.3f}")
+
+
+def bench_api(args):
+    import requests
+
+    queries = DEFAULT_QUERIES
+    if args.queries_file:
+        with open(args.queries_file, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    session = requests.Session()
+    results = {}
+    latencies = {"thorough": [], "quick": []}
+    for query in queries:
+        for mode in ("thorough", "quick"):
+            start = time.perf_counter()
+            response = session.post(
+                f"{args.api}/query",
+                json={"query": query, "k": args.k, "index_name": args.index, "mode": mode, "fields": ["relevance_score"]},
+                timeout=args.timeout,
+            )
+            latencies[mode].append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+            body = response.json()
+            results[(query, mode)] = ([r["table_id"] for r in body["results"]], body.get("mode", mode))
+
+    hits = total = fallbacks = 0
+    for query in queries:
+        truth = set(results[(query, "thorough")][0])
+        found, answered_by = results[(query, "quick")]
+        fallbacks += answered_by != "quick"
+        hits += len(truth & set(found))
+        total += len(truth)
+
+    print(f"{len(queries)} queries, k={args.k}, index={args.index}")
+    print(f"quick recall@{args.k} vs thorough: {hits / total if total else float('nan'):.3f}"
+          f" ({fallbacks} answered in balanced mode)")
+    for mode, values in latencies.items():
+        print(f"{mode:<9} p50 {percentile(values, 50):8.1f} ms   p95 {percentile(values, 95):8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ann = sub.add_parser("ann", help="IVF index vs exact search on synthetic embeddings")
+    ann.add_argument("--tables", type=int, default=50_000)
+    ann.add_argument("--dim", type=int, default=768)
+    ann.add_argument("--clusters", type=int, default=200)
+    ann.add_argument("--queries", type=int, default=200)
+    ann.add_argument("--lists", type=int, default=None, help="IVF lists (default: sqrt of tables)")
+    ann.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    ann.add_argument("--k", type=int, default=10)
+    ann.add_argument("--seed", type=int, default=0)
+
+    api = sub.add_parser("api", help="quick vs thorough mode against a running API")
+    api.add_argument("--api", default="http://localhost:8000/api/v1")
+    api.add_argument("--index", default="default")
+    api.add_argument("--queries-file", help="One query per line (default: built-in set)")
+    api.add_argument("--k", type=int, default=5)
+    api.add_argument("--timeout", type=float, default=300)
+
+    args = parser.parse_args()
+    if args.command == "ann":
+        bench_ann(args)
+    else:
+        bench_api(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON vs MessagePack responses between the API and the tools
+
+Builds QueryResponse and table-details payloads, serializes them the way the
+API does for each negotiated format, decodes them the way BasePneumaTool does
+and reports encode/decode time and payload size (raw and gzip-1, the
+compression middleware's default codec).
+"""
+
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from benchmark_compression import make_table  # noqa: E402
+
+
+def timed(fn, data, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = fn(data)
+    return out, (time.perf_counter() - start) / repeat * 1000
+
+
+def make_query_response(k: int, columns: int, rows: int):
+    from api.models.responses import QueryResponse, TableInfo
+
+    return QueryResponse(
+        query="crime data with location information",
+        session_id="3f1c2b1e-bench",
+        results=[TableInfo(**make_table(i, columns, rows)) for i in range(k)],
+        total_results=k,
+        search_time_ms=812.5,
+        timestamp=datetime(2024, 1, 15, 12),
+    )
+
+
+def make_table_details(columns: int, rows: int):
+    from api.models.responses import TableInfo
+
+    return TableInfo(**make_table(0, columns, rows))
+
+
+def benchmark(label: str, content, repeat: int):
+    import msgpack
+
+    from api.middleware.wire_format import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, render
+
+    formats = {
+        "json": (JSON_MEDIA_TYPE, json.loads),
+        "msgpack": (MSGPACK_MEDIA_TYPE, lambda b: msgpack.unpackb(b, raw=False)),
+    }
+    print(f"\n{label}")
+    print(f"{'format':<9} {'bytes':>10} {'gzip bytes':>11} {'encode ms':>10} {'decode ms':>10} {'total ms':>9}")
+    for name, (media_type, decode) in formats.items():
+        body, encode_ms = timed(lambda c: render(c, media_type), content, repeat)
+        _, decode_ms = timed(decode, body, repeat)
+        gzipped = len(gzip.compress(body, 1))
+        print(f"{name:<9} {len(body):>10,} {gzipped:>11,} {encode_ms:>10.3f} {decode_ms:>10.3f} {encode_ms + decode_ms:>9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        sys.exit("msgpack is not installed (pip install msgpack)")
+
+    random.seed(args.seed)
+    print("Pneuma wire format benchmark (encode = API side, decode = tool side)")
+
+    benchmark("query k=5, search-tool fields", make_query_response(5, 12, 0), args.repeat)
+    benchmark("query k=20 with schema + 10 sample rows", make_query_response(20, 25, 10), args.repeat)
+    benchmark("table details, 80 columns + 50 sample rows", make_table_details(80, 50), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
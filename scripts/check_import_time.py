@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Enforce import-time budgets for the API and the OpenWebUI tools
+
+Imports each module in a fresh interpreter under ``python -X importtime``
+and keeps the best of several runs. The framework a module is built on
+(FastAPI for the API, pydantic for the tools) is imported first, so only the
+module's own cost counts against its budget. Fails (exit code 1) when a module
+exceeds its budget or pulls in a module it must load lazily.
+tests/test_import_time.py runs the same check under pytest.
+
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --scale 2          # slower machine
+    python scripts/check_import_time.py --budget api.main=400
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+from typing import Dict, List, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+API_BASELINE = "from fastapi import FastAPI"
+TOOL_BASELINE = "from pydantic import BaseModel, Field"
+
+# Import time per module once its baseline is loaded, in milliseconds
+BUDGETS = {
+    "api.main": (API_BASELINE, 300),
+    "tools.pneuma_search_tool": (TOOL_BASELINE, 150),
+    "tools.pneuma_analysis_tool": (TOOL_BASELINE, 150),
+    "tools.pneuma_export_tool": (TOOL_BASELINE, 150),
+}
+
+# Modules that may only be loaded on first use, not at import
+API_LAZY = ["numpy", "torch", "sentence_transformers", "transformers", "src.pneuma", "uvicorn", "redis", "sqlite3", "pyarrow", "httpx"]
+TOOL_LAZY = ["requests", "urllib3", "httpx", "structlog", "numpy"]
+FORBIDDEN = {
+    "api.main": API_LAZY,
+    "tools.pneuma_search_tool": TOOL_LAZY,
+    "tools.pneuma_analysis_tool": TOOL_LAZY,
+    "tools.pneuma_export_tool": TOOL_LAZY,
+}
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+MARKER = "-- baseline loaded --"
+
+
+def trace(module: str, baseline: str = "pass") -> Tuple[int, Dict[str, int]]:
+    """Import a module under -X importtime after running a baseline statement
+
+    Returns (total us, {module: self us}) for the imports the module itself
+    triggers; whatever the baseline loaded is already cached and not counted.
+    """
+    statement = f"{baseline}; import sys; sys.stderr.write({MARKER!r} + '\\n'); import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    lines = result.stderr.splitlines()
+    total, self_times = 0, {}
+    for line in lines[lines.index(MARKER) + 1:]:
+        match = LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        self_times[name] = int(self_us)
+        if not indent:
+            total += int(cumulative_us)
+    return total, self_times
+
+
+def check_module(module: str, repeat: int = 5) -> Tuple[float, List[str], Dict[str, int]]:
+    """Best own import time in ms, eagerly imported lazy modules and per-module self times"""
+    baseline, _ = BUDGETS[module]
+    trace(module, baseline)  # warm the bytecode cache
+    total_us, self_times = min((trace(module, baseline) for _ in range(repeat)), key=lambda run: run[0])
+
+    loaded = [
+        name for name in FORBIDDEN.get(module, [])
+        if any(m == name or m.startswith(name + ".") for m in self_times)
+    ]
+    return total_us / 1000, loaded, self_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per module; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget, e.g. on slow CI hosts")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS", help="Override one budget")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest packages to show per module")
+    args = parser.parse_args()
+
+    budgets = {module: budget for module, (_, budget) in BUDGETS.items()}
+    for override in args.budget:
+        module, _, ms = override.partition("=")
+        if module not in BUDGETS:
+            parser.error(f"unknown module {module}")
+        budgets[module] = float(ms)
+
+    failures = []
+    print(f"{'module':<30}{'own ms':>9}{'budget ms':>11}")
+    for module, budget in budgets.items():
+        budget *= args.scale
+        own_ms, loaded, self_times = check_module(module, args.repeat)
+
+        flag = "" if own_ms <= budget else "  OVER BUDGET"
+        print(f"{module:<30}{own_ms:>9.1f}{budget:>11.0f}{flag}")
+        if flag:
+            failures.append(f"{module} took {own_ms:.0f} ms (budget {budget:.0f} ms)")
+        if loaded:
+            failures.append(f"{module} imports {', '.join(loaded)} eagerly")
+
+        packages = Counter()
+        for name, self_us in self_times.items():
+            packages[name.split(".")[0]] += self_us
+        heaviest = ", ".join(f"{name} {us / 1000:.0f}" for name, us in packages.most_common(args.top))
+        print(f"{'':<4}heaviest (self ms): {heaviest}")
+
+    if failures:
+        print("\nImport-time check failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nAll modules within budget")
+
+
+if __name__ == "__main__":
+    main()
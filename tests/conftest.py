@@ -0,0 +1,8 @@
+"""
+Shared pytest setup: make the repository root importable as in the scripts
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,108 @@
+"""
+Accept-Encoding negotiation and the minimum-size cutoff of CompressionMiddleware
+"""
+
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.middleware.compression import CompressionMiddleware, negotiate_encoding
+
+MINIMUM_SIZE = 100
+SMALL = "x" * (MINIMUM_SIZE - 1)
+LARGE = "pneuma " * 200
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, available, expected",
+    [
+        ("gzip", ["zstd", "br", "gzip"], "gzip"),
+        ("gzip, zstd", ["zstd", "br", "gzip"], "zstd"),  # equal q: server preference
+        ("gzip;q=1.0, zstd;q=0.5", ["zstd", "br", "gzip"], "gzip"),
+        ("zstd, br", ["gzip"], None),  # nothing we can produce
+        ("*", ["zstd", "gzip"], "zstd"),
+        ("*, zstd;q=0", ["zstd", "gzip"], "gzip"),
+        ("gzip;q=0", ["gzip"], None),
+        ("GZIP ; q=0.8", ["gzip"], "gzip"),
+        ("gzip;q=oops", ["gzip"], None),
+        ("identity", ["gzip"], None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, available, expected):
+    assert negotiate_encoding(accept_encoding, available) == expected
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse(SMALL)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield "chunk " * 5
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/image")
+    async def image():
+        return PlainTextResponse(LARGE, media_type="image/png")
+
+    middleware = CompressionMiddleware(app, minimum_size=MINIMUM_SIZE)
+    middleware.available = ["gzip"]  # zstd and brotli are optional
+    return TestClient(middleware)
+
+
+def raw_get(client, path, accept_encoding="gzip"):
+    """Fetch without httpx decoding the body, so the wire bytes can be checked"""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_bodies_below_minimum_size_are_sent_as_is(client):
+    response, body = raw_get(client, "/small")
+
+    assert "content-encoding" not in response.headers
+    assert body == SMALL.encode()
+
+
+def test_large_bodies_are_gzipped(client):
+    response, body = raw_get(client, "/large")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == len(body) < len(LARGE)
+    assert zlib.decompress(body, 31) == LARGE.encode()
+
+
+def test_streams_are_compressed_regardless_of_chunk_size(client):
+    response, body = raw_get(client, "/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert zlib.decompress(body, 31) == ("chunk " * 15).encode()
+
+
+def test_no_accept_encoding_leaves_the_response_alone(client):
+    response, body = raw_get(client, "/large", accept_encoding="")
+
+    assert "content-encoding" not in response.headers
+    assert body == LARGE.encode()
+
+
+def test_compressed_media_types_are_skipped(client):
+    response, body = raw_get(client, "/image")
+
+    assert "content-encoding" not in response.headers
+    assert body == LARGE.encode()
@@ -0,0 +1,154 @@
+"""
+Delta segments: the change log, snapshots from compaction and tombstones
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from api.services.delta_index import LOG_FILE, SNAPSHOT_META, DeltaIndex, DeltaSegment
+
+
+def unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def upsert(table_id, vector, name=None):
+    return {
+        "op": "upsert",
+        "table_id": table_id,
+        "table": {"table_id": table_id, "table_name": name or table_id},
+        "vector": vector,
+    }
+
+
+def delete(table_id):
+    return {"op": "delete", "table_id": table_id}
+
+
+@pytest.fixture
+def segment(tmp_path):
+    return DeltaSegment(str(tmp_path / "default"))
+
+
+def test_upsert_and_delete_leave_tombstones(segment):
+    segment.append([upsert("t1", unit(1, 0)), upsert("t2", unit(0, 1))])
+    segment.append([delete("t1")])
+
+    assert set(segment.tables) == {"t2"}
+    assert set(segment.vectors) == {"t2"}
+    # t1 is gone and t2 overrides its base copy; both hide the base index's rows
+    assert segment.tombstones == {"t1", "t2"}
+    assert segment.log_entries == 3
+
+
+def test_later_upsert_replaces_earlier(segment):
+    segment.append([upsert("t1", unit(1, 0), name="old")])
+    segment.append([upsert("t1", unit(0, 1), name="new")])
+
+    assert segment.tables["t1"]["table_name"] == "new"
+    np.testing.assert_allclose(segment.vectors["t1"], unit(0, 1))
+
+
+def test_search_ranks_by_cosine_similarity(segment):
+    segment.append([upsert("x", unit(1, 0)), upsert("y", unit(0, 1)), upsert("xy", unit(1, 1))])
+
+    results = segment.search(unit(1, 0.1), k=2)
+
+    assert [table_id for table_id, _ in results] == ["x", "xy"]
+    assert results[0][1] > results[1][1]
+    assert DeltaSegment(segment.directory).search(unit(1, 0), k=3) == []
+
+
+def test_other_workers_tail_the_log(segment):
+    reader = DeltaSegment(segment.directory)
+    reader.refresh()
+
+    segment.append([upsert("t1", unit(1, 0))])
+    reader.refresh()
+    assert set(reader.tables) == {"t1"}
+
+    segment.append([delete("t1"), upsert("t2", unit(0, 1))])
+    reader.refresh()
+    assert set(reader.tables) == {"t2"}
+    assert reader.tombstones == {"t1", "t2"}
+    assert reader.version == segment.version
+
+
+def test_partial_lines_wait_for_the_writer(segment):
+    segment.append([upsert("t1", unit(1, 0))])
+    with open(os.path.join(segment.directory, LOG_FILE), "a") as f:
+        f.write('{"op": "delete", "table_id": "t1"')  # no newline yet
+
+    segment.refresh()
+    assert "t1" in segment.tables
+
+    with open(os.path.join(segment.directory, LOG_FILE), "a") as f:
+        f.write("}\n")
+    segment.refresh()
+    assert "t1" not in segment.tables
+
+
+def test_compaction_snapshots_and_truncates_the_log(segment):
+    segment.append([upsert("t1", unit(1, 0)), upsert("t2", unit(0, 1)), delete("t1")])
+
+    assert segment.compact() == 3
+    assert os.path.getsize(os.path.join(segment.directory, LOG_FILE)) == 0
+    assert os.path.exists(os.path.join(segment.directory, SNAPSHOT_META))
+    assert segment.log_entries == 0
+    assert segment.compact() == 0
+
+    # A cold reader sees the same state from the snapshot alone
+    reader = DeltaSegment(segment.directory)
+    reader.refresh()
+    assert set(reader.tables) == {"t2"}
+    assert reader.tombstones == {"t1", "t2"}
+    np.testing.assert_allclose(reader.vectors["t2"], unit(0, 1))
+
+
+def test_readers_reload_after_another_worker_compacts(segment):
+    reader = DeltaSegment(segment.directory)
+    segment.append([upsert("t1", unit(1, 0))])
+    reader.refresh()
+
+    segment.compact()
+    segment.append([upsert("t2", unit(0, 1))])
+    reader.refresh()
+
+    assert set(reader.tables) == {"t1", "t2"}
+    assert reader.log_entries == 1
+
+
+def test_compacting_everything_away_keeps_tombstones(segment):
+    segment.append([upsert("t1", unit(1, 0)), delete("t1")])
+    segment.compact()
+
+    reader = DeltaSegment(segment.directory)
+    reader.refresh()
+    assert reader.tables == {}
+    assert reader.tombstones == {"t1"}
+    assert not reader.is_empty()
+
+
+def test_delta_index_segments(tmp_path):
+    index = DeltaIndex(str(tmp_path))
+
+    assert index.segment("sales") is None
+    assert index.index_names() == []
+
+    index.segment("sales", create=True).append([upsert("t1", unit(1, 0))])
+
+    assert index.index_names() == ["sales"]
+    assert set(DeltaIndex(str(tmp_path)).segment("sales").tables) == {"t1"}
+
+
+@pytest.mark.parametrize("index_name", ["..", "../tables", ".hidden", "a/b", ""])
+def test_index_names_that_escape_the_root_are_refused(tmp_path, index_name):
+    delta = DeltaIndex(str(tmp_path / "delta"))
+
+    with pytest.raises(ValueError):
+        delta.segment(index_name, create=True)
+    assert delta.segments == {}
+    assert not (tmp_path / "tables").exists()
@@ -0,0 +1,108 @@
+"""
+Score normalization and fusion helpers shared by alpha sweeps and federated search
+"""
+
+import numpy as np
+import pytest
+
+from api.services.fusion import align_scores, fuse_alpha_sweep, merge_normalized, min_max_normalize
+
+
+def test_min_max_normalize_scales_to_unit_range():
+    scores = min_max_normalize(np.array([2.0, 4.0, 3.0]))
+
+    np.testing.assert_allclose(scores, [0.0, 1.0, 0.5])
+
+
+def test_min_max_normalize_constant_and_empty():
+    np.testing.assert_array_equal(min_max_normalize(np.array([0.7, 0.7])), [1.0, 1.0])
+    assert min_max_normalize(np.array([])).size == 0
+
+
+def test_align_scores_normalizes_present_and_zeroes_missing():
+    aligned = align_scores(["a", "b", "c", "d"], {"a": 10.0, "c": 20.0, "d": 15.0})
+
+    np.testing.assert_allclose(aligned, [0.0, 0.0, 1.0, 0.5])
+
+
+def test_align_scores_without_any_scores():
+    np.testing.assert_array_equal(align_scores(["a", "b"], {}), [0.0, 0.0])
+
+
+def test_fuse_alpha_sweep_matches_per_alpha_ranking():
+    rng = np.random.default_rng(7)
+    lexical, dense = rng.random(50), rng.random(50)
+    alphas = [0.0, 0.3, 0.5, 1.0]
+
+    top, scores = fuse_alpha_sweep(lexical, dense, alphas, k=5)
+
+    assert top.shape == scores.shape == (4, 5)
+    for row, alpha in enumerate(alphas):
+        fused = alpha * lexical + (1 - alpha) * dense
+        expected = np.argsort(-fused, kind="stable")[:5]
+        np.testing.assert_array_equal(top[row], expected)
+        np.testing.assert_allclose(scores[row], fused[expected])
+
+
+def test_fuse_alpha_sweep_alpha_weighs_lexical():
+    lexical = np.array([1.0, 0.0])
+    dense = np.array([0.0, 1.0])
+
+    top, _ = fuse_alpha_sweep(lexical, dense, [1.0, 0.0], k=1)
+
+    assert top[:, 0].tolist() == [0, 1]
+
+
+@pytest.mark.parametrize("candidates, k, expected_k", [(3, 10, 3), (0, 5, 0)])
+def test_fuse_alpha_sweep_clamps_k_to_candidates(candidates, k, expected_k):
+    top, scores = fuse_alpha_sweep(np.ones(candidates), np.ones(candidates), [0.5, 0.7], k)
+
+    assert top.shape == scores.shape == (2, expected_k)
+    assert top.dtype == np.int64
+
+
+def records(*scored):
+    return [{"table_id": table_id, "relevance_score": score} for table_id, score in scored]
+
+
+def test_merge_normalized_puts_sources_on_one_scale():
+    # Raw scores differ by orders of magnitude; each index's best result ties at 1.0
+    ranked = {
+        "small": records(("s1", 0.02), ("s2", 0.01)),
+        "large": records(("l1", 90.0), ("l2", 50.0), ("l3", 10.0)),
+    }
+
+    merged = merge_normalized(ranked, k=5)
+
+    assert [(source, record["table_id"]) for source, _, record in merged] == [
+        ("small", "s1"),
+        ("large", "l1"),
+        ("large", "l2"),
+        ("small", "s2"),
+        ("large", "l3"),
+    ]
+    assert [score for _, score, _ in merged] == pytest.approx([1.0, 1.0, 0.5, 0.0, 0.0])
+
+
+def test_merge_normalized_keeps_best_entry_per_table_and_stops_at_k():
+    ranked = {
+        "a": records(("t1", 0.9), ("t2", 0.1)),
+        "b": records(("t3", 5.0), ("t1", 4.0), ("t4", 1.0)),
+    }
+
+    merged = merge_normalized(ranked, k=3)
+
+    # t1 scores 1.0 in "a" and 0.75 in "b"; the weaker duplicate is dropped
+    assert [(source, record["table_id"]) for source, _, record in merged] == [
+        ("a", "t1"),
+        ("b", "t3"),
+        ("a", "t2"),
+    ]
+
+
+def test_merge_normalized_handles_missing_scores_and_empty_sources():
+    ranked = {"a": [{"table_id": "t1"}, {"table_id": "t2", "relevance_score": None}], "b": []}
+
+    merged = merge_normalized(ranked, k=5)
+
+    assert [score for _, score, _ in merged] == [1.0, 1.0]
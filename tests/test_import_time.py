@@ -0,0 +1,22 @@
+"""
+Import-time budgets for the API and the tools (see scripts/check_import_time.py)
+
+Set IMPORT_TIME_SCALE to loosen every budget on slow hosts.
+"""
+
+import os
+
+import pytest
+
+from scripts.check_import_time import BUDGETS, check_module
+
+SCALE = float(os.environ.get("IMPORT_TIME_SCALE", "1.0"))
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_time_within_budget(module):
+    own_ms, loaded, _ = check_module(module, repeat=3)
+    budget = BUDGETS[module][1] * SCALE
+
+    assert not loaded, f"{module} imports {', '.join(loaded)} eagerly"
+    assert own_ms <= budget, f"{module} took {own_ms:.0f} ms on top of its baseline (budget {budget:.0f} ms)"
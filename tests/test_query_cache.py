@@ -0,0 +1,63 @@
+"""
+QueryCache: keys shared across workers and the in-process fallback
+"""
+
+import fakeredis.aioredis
+import pytest
+import redis.exceptions
+
+from api.services.query_cache import QueryCache
+
+RECORDS = [{"table": f"t{i}", "score": 1.0 - i / 10} for i in range(5)]
+
+
+def key(epoch, query="revenue by region"):
+    return QueryCache.make_key(epoch, "tables", query, 5, 0.5, None)
+
+
+class FailingWrites(fakeredis.aioredis.FakeRedis):
+    async def set(self, *args, **kwargs):
+        raise redis.exceptions.ConnectionError("write failed")
+
+
+def test_key_normalizes_the_query():
+    assert key(0, "Revenue  by REGION") == key(0)
+    assert key(0) != key(1)
+
+
+@pytest.mark.asyncio
+async def test_reload_on_one_worker_invalidates_all():
+    server = fakeredis.FakeServer()
+    worker_a = QueryCache(fakeredis.aioredis.FakeRedis(server=server))
+    worker_b = QueryCache(fakeredis.aioredis.FakeRedis(server=server))
+
+    await worker_a.put(key(await worker_a.epoch()), RECORDS, 10)
+    assert await worker_b.get(key(await worker_b.epoch()), 3) == RECORDS[:3]
+
+    await worker_a.bump_epoch()
+    assert await worker_b.epoch() == 1
+    assert await worker_b.get(key(await worker_b.epoch()), 3) is None
+
+    # A restarted worker starts from the shared epoch, not from zero
+    restarted = QueryCache(fakeredis.aioredis.FakeRedis(server=server))
+    assert await restarted.epoch() == 1
+
+
+@pytest.mark.asyncio
+async def test_entry_written_during_redis_outage_is_served_locally():
+    cache = QueryCache(FailingWrites())
+
+    await cache.put(key(0), RECORDS, 10)
+
+    assert await cache.get(key(0), 5) == RECORDS
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_incomplete_entry_does_not_serve_larger_k():
+    cache = QueryCache()
+
+    await cache.put(key(0), RECORDS, 5)
+
+    assert await cache.get(key(0), 5) == RECORDS
+    assert await cache.get(key(0), 8) is None
@@ -0,0 +1,153 @@
+"""
+Token buckets of RateLimiter: the Redis script and the in-process fallback
+"""
+
+import fakeredis.aioredis
+import pytest
+
+from api.config import settings
+from api.services import rate_limiter
+from api.services.rate_limiter import RateLimiter
+
+CAPACITY = 4
+
+
+@pytest.fixture(autouse=True)
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_interactive_capacity", CAPACITY)
+    monkeypatch.setattr(settings, "rate_limit_interactive_refill_per_second", 0.001)
+    monkeypatch.setattr(settings, "rate_limit_session_share", 0.5)
+
+
+@pytest.fixture(params=["local", "redis"])
+def limiter(request):
+    # fakeredis runs the token-bucket script through lupa
+    redis = fakeredis.aioredis.FakeRedis() if request.param == "redis" else None
+    return RateLimiter(redis)
+
+
+async def take(limiter, n, identity="ip:10.0.0.1", session_id=None):
+    return [(await limiter.acquire(identity, session_id=session_id)).allowed for _ in range(n)]
+
+
+def test_client_identity_prefers_api_key_and_hides_it():
+    identity = RateLimiter.client_identity("secret-key", "10.0.0.1")
+
+    assert identity.startswith("key:") and "secret-key" not in identity
+    assert identity == RateLimiter.client_identity("secret-key", "10.0.0.2")
+    assert RateLimiter.client_identity(None, "10.0.0.1") == "ip:10.0.0.1"
+    assert RateLimiter.client_identity(None, None) == "ip:unknown"
+
+
+@pytest.mark.asyncio
+async def test_bucket_rejects_once_empty(limiter):
+    assert await take(limiter, CAPACITY + 1) == [True] * CAPACITY + [False]
+
+    decision = await limiter.acquire("ip:10.0.0.1")
+    assert not decision.allowed
+    assert decision.remaining == 0
+    assert decision.retry_after > 0
+    assert "Retry-After" in decision.headers()
+
+
+@pytest.mark.asyncio
+async def test_new_session_ids_do_not_buy_more_requests(limiter):
+    allowed = [
+        (await limiter.acquire("ip:10.0.0.1", session_id=f"s{i}")).allowed
+        for i in range(CAPACITY + 2)
+    ]
+
+    assert allowed == [True] * CAPACITY + [False, False]
+
+
+@pytest.mark.asyncio
+async def test_one_session_gets_a_share_of_its_client(limiter):
+    share = int(CAPACITY * settings.rate_limit_session_share)
+
+    assert await take(limiter, share + 1, session_id="chatty") == [True] * share + [False]
+    # The rejected call took nothing from the client bucket
+    assert await take(limiter, CAPACITY - share, session_id="quiet") == [True] * (CAPACITY - share)
+    assert await take(limiter, 1, session_id="quiet") == [False]
+
+
+@pytest.mark.asyncio
+async def test_cost_takes_several_tokens_at_once(limiter):
+    assert (await limiter.acquire("ip:10.0.0.1", cost=3)).allowed
+    assert not (await limiter.acquire("ip:10.0.0.1", cost=2)).allowed
+    assert await take(limiter, 2) == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_cost_is_capped_at_a_full_bucket(limiter):
+    share = int(CAPACITY * settings.rate_limit_session_share)
+
+    decision = await limiter.acquire("ip:10.0.0.1", cost=CAPACITY * 3, session_id="s1")
+
+    assert decision.allowed
+    assert await take(limiter, CAPACITY - share + 1) == [True] * (CAPACITY - share) + [False]
+
+
+@pytest.mark.asyncio
+async def test_clients_have_separate_buckets(limiter):
+    await take(limiter, CAPACITY, identity="ip:10.0.0.1")
+
+    assert await take(limiter, 1, identity="ip:10.0.0.2") == [True]
+
+
+@pytest.mark.asyncio
+async def test_disabled_limiter_admits_everything(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+
+    assert await take(limiter, CAPACITY * 3) == [True] * (CAPACITY * 3)
+
+
+@pytest.mark.asyncio
+async def test_redis_buckets_are_shared_and_expire():
+    redis = fakeredis.aioredis.FakeRedis()
+    first, second = RateLimiter(redis), RateLimiter(redis)
+
+    await take(first, CAPACITY - 1)
+    assert await take(second, 2) == [True, False]
+
+    key = "ratelimit:interactive:ip:10.0.0.1"
+    assert await redis.pttl(key) > 0
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_local_buckets():
+    redis = fakeredis.aioredis.FakeRedis()
+    limiter = RateLimiter(redis)
+
+    async def down(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    limiter._script = down
+
+    assert await take(limiter, CAPACITY + 1) == [True] * CAPACITY + [False]
+    assert limiter._local
+
+
+@pytest.mark.asyncio
+async def test_local_buckets_refill_over_time(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(settings, "rate_limit_interactive_refill_per_second", 2.0)
+    limiter = RateLimiter()
+
+    assert await take(limiter, CAPACITY + 1) == [True] * CAPACITY + [False]
+    now[0] += 1.0  # two tokens back
+    assert await take(limiter, 3) == [True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_local_prune_forgets_full_buckets(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    limiter = RateLimiter()
+
+    await limiter.acquire("ip:10.0.0.1", session_id="s1")
+    now[0] += 10_000.0  # long enough for both buckets to refill
+    limiter._prune(now[0])
+
+    assert limiter._local == {}
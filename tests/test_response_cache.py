@@ -0,0 +1,29 @@
+"""
+ResponseCache: size-bounded LRU of tool responses
+"""
+
+from tools.response_cache import ResponseCache
+
+
+def test_hits_are_isolated_from_caller_mutation():
+    cache = ResponseCache(max_bytes=1024)
+    body = {"results": [{"table_id": "t1"}]}
+
+    cache.put("k", body, None, ttl=60, size=10)
+    body["results"].clear()
+    first = cache.get("k").body
+    first["results"].append({"table_id": "t2"})
+
+    assert cache.get("k").body == {"results": [{"table_id": "t1"}]}
+
+
+def test_evicts_least_recently_used_past_the_size_bound():
+    cache = ResponseCache(max_bytes=20)
+    cache.put("a", 1, None, ttl=60, size=10)
+    cache.put("b", 2, None, ttl=60, size=10)
+    cache.get("a")
+    cache.put("c", 3, None, ttl=60, size=10)
+
+    assert cache.get("b") is None
+    assert cache.get("a").body == 1
+    assert cache.stats() == {"entries": 2, "bytes": 20}
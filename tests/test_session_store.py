@@ -0,0 +1,143 @@
+"""
+Failover between the Redis session store and a local fallback
+"""
+
+import fakeredis
+import fakeredis.aioredis
+import pytest
+import redis.exceptions
+
+from api.config import settings
+from api.services import session_store
+from api.services.health_monitor import CircuitBreaker, HealthMonitor
+from api.services.session_store import (
+    FailoverSessionStore,
+    MemorySessionStore,
+    RedisSessionStore,
+    create_session_store,
+)
+
+TTL = 60
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def store(server, monkeypatch):
+    monkeypatch.setattr(settings, "session_redis_retry_seconds", 30.0)
+    client = fakeredis.aioredis.FakeRedis(server=server, decode_responses=True)
+    return FailoverSessionStore(RedisSessionStore(client), MemorySessionStore(100))
+
+
+@pytest.mark.asyncio
+async def test_primary_serves_while_up(store):
+    await store.put("s1", "history", TTL, touch=True)
+
+    assert await store.get("s1") == "history"
+    assert await store.primary.get("s1") == "history"
+    assert await store.fallback.get("s1") is None
+    assert store.name == "redis"
+
+
+@pytest.mark.asyncio
+async def test_outage_degrades_to_fallback(store, server):
+    server.connected = False
+
+    await store.put("s1", "during outage", TTL, touch=True)
+
+    assert not store.primary_up
+    assert store.name == "memory (fallback)"
+    assert await store.get("s1") == "during outage"
+    assert await store.fallback.get("s1") == "during outage"
+    assert await store.count_active(0) == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_is_skipped_until_the_retry_window_passes(store, server, monkeypatch):
+    server.connected = False
+    await store.get("s1")
+    server.connected = True
+
+    # Still inside the retry window: reads keep going to the fallback
+    await store.primary.put("s1", "in redis", TTL)
+    assert await store.get("s1") is None
+
+    now = session_store.time.monotonic()
+    monkeypatch.setattr(session_store.time, "monotonic", lambda: now + 31.0)
+    assert store.primary_up
+    assert await store.get("s1") == "in redis"
+    assert store.name == "redis"
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_not_treated_as_outages(store, monkeypatch):
+    async def broken(*args, **kwargs):
+        raise ValueError("bad data")
+
+    monkeypatch.setattr(store.primary, "get", broken)
+
+    with pytest.raises(ValueError):
+        await store.get("s1")
+    assert store.primary_up
+
+
+@pytest.mark.asyncio
+async def test_redis_down_at_startup_still_hands_out_the_client(monkeypatch):
+    monkeypatch.setattr(settings, "session_store", "redis")
+    monkeypatch.setattr(settings, "session_store_fallback", "memory")
+    monkeypatch.setattr(settings, "redis_port", 1)  # nothing listens here
+    monkeypatch.setattr(settings, "redis_socket_timeout", 0.5)
+
+    store, client = await create_session_store()
+
+    assert isinstance(store, FailoverSessionStore)
+    assert not store.primary_up
+    assert client is not None
+    await store.put("s1", "history", TTL)
+    assert await store.get("s1") == "history"
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_down_without_fallback_fails_startup(monkeypatch):
+    monkeypatch.setattr(settings, "session_store", "redis")
+    monkeypatch.setattr(settings, "session_store_fallback", "none")
+    monkeypatch.setattr(settings, "redis_port", 1)
+    monkeypatch.setattr(settings, "redis_socket_timeout", 0.5)
+
+    with pytest.raises(redis.exceptions.ConnectionError):
+        await create_session_store()
+
+
+class StubPneumaService:
+    pneuma = None
+    breaker = CircuitBreaker("pneuma")
+
+    def is_healthy(self):
+        return True
+
+
+class StubSessionService:
+    def __init__(self, store):
+        self.store = store
+        self.breaker = CircuitBreaker("session_store")
+
+
+@pytest.mark.asyncio
+async def test_health_probe_reports_a_covered_outage_as_degraded(store, server):
+    sessions = StubSessionService(store)
+    monitor = HealthMonitor(StubPneumaService(), sessions)
+
+    await monitor.probe_all()
+    assert monitor.status("session_store") == "healthy"
+
+    server.connected = False
+    await monitor.probe_all()
+
+    assert monitor.status("session_store") == "degraded"
+    assert "serving from memory" in monitor.snapshot["session_store"]["error"]
+    # Sessions are still served, so calls must not be short-circuited
+    sessions.breaker.check()
@@ -0,0 +1,98 @@
+"""
+Retry policy of BasePneumaTool._make_request
+"""
+
+import json
+
+import pytest
+
+from tools import base_tool
+from tools.base_tool import BasePneumaTool
+
+BASE_URL = "http://pneuma.test/api/v1"
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.text = json.dumps(body or {})
+        self.content = self.text.encode()
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeSession:
+    """Stands in for the pooled requests session, replaying canned responses"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    tool = BasePneumaTool()
+    tool.valves.API_BASE_URL = BASE_URL
+    tool.valves.CACHE_ENABLED = False
+    tool.valves.RETRY_BACKOFF_BASE = 0.0
+    tool.valves.MAX_RETRIES = 3
+    monkeypatch.setattr(base_tool, "_sessions", {})
+    return tool
+
+
+def install(responses):
+    session = FakeSession(responses)
+    base_tool._sessions[BASE_URL] = session
+    return session
+
+
+def test_4xx_is_returned_without_retrying(tool):
+    session = install([FakeResponse(404, {"detail": "Table t1 not found"})])
+
+    result = tool._make_request("GET", "/tables/t1")
+
+    assert result == {"error": "API returned status 404: Table t1 not found"}
+    assert len(session.calls) == 1
+
+
+def test_5xx_on_idempotent_call_is_retried(tool):
+    session = install([FakeResponse(503), FakeResponse(200, {"ok": True})])
+
+    result = tool._make_request("POST", "/tables/batch", idempotent=True, json={})
+
+    assert result == {"ok": True}
+    assert len(session.calls) == 2
+
+
+def test_5xx_on_non_idempotent_call_is_not_retried(tool):
+    session = install([FakeResponse(500, {"detail": "boom"})])
+
+    result = tool._make_request("POST", "/export/jobs", json={})
+
+    assert result == {"error": "API returned status 500: boom"}
+    assert len(session.calls) == 1
+
+
+def test_429_is_retried_for_any_method(tool):
+    session = install([
+        FakeResponse(429, headers={"Retry-After": "0"}),
+        FakeResponse(200, {"ok": True}),
+    ])
+
+    assert tool._make_request("POST", "/export/jobs", json={}) == {"ok": True}
+    assert len(session.calls) == 2
+
+
+def test_retries_stop_after_max_attempts(tool):
+    session = install([FakeResponse(502)] * 3)
+
+    result = tool._make_request("GET", "/indexes")
+
+    assert result == {"error": "API returned status 502"}
+    assert len(session.calls) == 3
@@ -2,13 +2,86 @@
 Base class for OpenWebUI tools
 """
 
-import requests
+import random
+import threading
+import time
 import json
-from typing import Dict, Any, Optional
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel
-import structlog
 
-logger = structlog.get_logger()
+from .response_cache import CacheEntry, ResponseCache
+
+try:
+    import msgpack
+except ImportError:  # Optional wire format; JSON is used without it
+    msgpack = None
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Tells the API how long we will still wait, so it can drop work we gave up on
+DEADLINE_HEADER = "X-Request-Timeout"
+
+# Sent unchanged on every attempt of a call so the API can apply its side effects once
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# Prefer MessagePack but let the API fall back to JSON when it cannot produce it
+MSGPACK_ACCEPT = "application/msgpack, application/json;q=0.5"
+
+# Keep-alive clients shared by every tool instance talking to the same API.
+# requests/httpx and asyncio are imported on first use so loading a tool stays cheap.
+_sessions: Dict[str, Any] = {}
+_async_clients: Dict[tuple, Any] = {}
+_caches: Dict[str, ResponseCache] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_session(base_url: str, pool_size: int):
+    """Return the pooled requests session for an API base URL, creating it on first use"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    with _clients_lock:
+        session = _sessions.get(base_url)
+        if session is None:
+            session = requests.Session()
+            # Advertise every codec urllib3 can decode here (gzip, plus br/zstd when installed)
+            session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[base_url] = session
+        return session
+
+
+def _get_cache(base_url: str, max_bytes: int) -> ResponseCache:
+    """Return the response cache for an API base URL, creating it on first use"""
+    with _clients_lock:
+        cache = _caches.get(base_url)
+        if cache is None:
+            cache = ResponseCache(max_bytes)
+            _caches[base_url] = cache
+        cache.max_bytes = max_bytes
+        return cache
+
+
+def _get_async_client(base_url: str, pool_size: int):
+    """Return the pooled httpx client for the running event loop, creating it on first use"""
+    import asyncio
+    import httpx
+
+    key = (base_url, id(asyncio.get_running_loop()))
+    with _clients_lock:
+        client = _async_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=pool_size, max_keepalive_connections=pool_size
+                )
+            )
+            _async_clients[key] = client
+        return client
 
 
 class BasePneumaTool:
@@ -16,34 +89,309 @@ class BasePneumaTool:
 
     class Valves(BaseModel):
         API_BASE_URL: str = "http://localhost:8000/api/v1"
-        REQUEST_TIMEOUT: int = 30
-        MAX_RETRIES: int = 3
+        REQUEST_TIMEOUT: int = 30  # Total deadline across all attempts
+        CONNECT_TIMEOUT: float = 3.0
+        MAX_RETRIES: int = 3  # Total attempts per call
+        RETRY_BACKOFF_BASE: float = 0.25
+        RETRY_BACKOFF_MAX: float = 4.0
+        POOL_MAXSIZE: int = 10
+        CACHE_ENABLED: bool = True
+        CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+        CACHE_DEFAULT_TTL: int = 60
+        # Seconds to cache responses per endpoint prefix; 0 disables caching
+        CACHE_TTLS: Dict[str, int] = {
+            "/query": 120,
+            "/tables/": 600,
+            "/indexes": 3600,
+            "/export": 0,
+        }
+        # "msgpack" asks the API for MessagePack (when installed here), "json" for JSON
+        WIRE_FORMAT: str = "msgpack"
+        BATCH_MAX_IDS: int = 100  # Table ids per /tables/batch call; match TABLES_BATCH_MAX_IDS
 
     def __init__(self):
         self.valves = self.Valves()
 
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make HTTP request to Pneuma API with error handling"""
+    def _make_request(
+        self, method: str, endpoint: str, idempotent: Optional[bool] = None, **kwargs
+    ) -> Dict[str, Any]:
+        """Make HTTP request to Pneuma API with error handling
+
+        Connection failures and 429 responses are retried for any method, 5xx
+        responses and read timeouts only for idempotent calls. Other 4xx
+        responses are returned as errors straight away. Pass
+        ``idempotent=True`` for POST endpoints that are read-only or that
+        deduplicate their side effects by ``Idempotency-Key``.
+        """
+        import requests
+
         url = f"{self.valves.API_BASE_URL}{endpoint}"
+        session = _get_session(self.valves.API_BASE_URL, self.valves.POOL_MAXSIZE)
+        idempotent = self._is_idempotent(method, idempotent)
+        cache_key, cached, ttl = self._cache_lookup(method, endpoint, idempotent, kwargs)
+        if cached is not None and cached.fresh:
+            return cached.body
+        kwargs = self._with_idempotency_key(method, idempotent, kwargs)
+
+        deadline = time.monotonic() + self.valves.REQUEST_TIMEOUT
+        error = "Max retries exceeded"
 
         for attempt in range(self.valves.MAX_RETRIES):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return {"error": f"Request deadline of {self.valves.REQUEST_TIMEOUT}s exceeded"}
+
+            retry_after = None
             try:
-                response = requests.request(
+                response = session.request(
                     method=method,
                     url=url,
-                    timeout=self.valves.REQUEST_TIMEOUT,
-                    **kwargs,
+                    timeout=(min(self.valves.CONNECT_TIMEOUT, remaining), remaining),
+                    **self._with_headers(kwargs, remaining),
                 )
 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    error_msg = f"API returned status {response.status_code}"
-                    if attempt == self.valves.MAX_RETRIES - 1:
-                        return {"error": error_msg}
+                if response.status_code == 304 and cached is not None:
+                    self._cache.refresh(cache_key, ttl)
+                    return cached.body
 
+                if 200 <= response.status_code < 300:
+                    body = self._decode_body(response)
+                    if cache_key is not None:
+                        self._cache.put(
+                            cache_key,
+                            body,
+                            response.headers.get("ETag"),
+                            ttl,
+                            len(response.content),
+                        )
+                    return body
+
+                error = self._error_from_response(response.status_code, response.text)
+                if not self._should_retry_status(response.status_code, idempotent):
+                    return {"error": error}
+                retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+
+            except requests.exceptions.ConnectTimeout as e:
+                error = f"Connection failed: {str(e)}"
             except requests.exceptions.RequestException as e:
-                if attempt == self.valves.MAX_RETRIES - 1:
-                    return {"error": f"Connection failed: {str(e)}"}
+                error = f"Connection failed: {str(e)}"
+                if not (idempotent or self._is_connect_failure(e)):
+                    return {"error": error}
+
+            if not self._sleep_before_retry(attempt, deadline, retry_after):
+                break
+
+        return {"error": error}
+
+    async def _amake_request(
+        self, method: str, endpoint: str, idempotent: Optional[bool] = None, **kwargs
+    ) -> Dict[str, Any]:
+        """Async variant of ``_make_request`` backed by a pooled httpx client
+
+        Tool methods are coroutines that call this, so OpenWebUI awaits them
+        instead of parking a thread per call. Without httpx the blocking client
+        runs on a worker thread.
+        """
+        import asyncio
+
+        try:
+            import httpx
+        except ImportError:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, lambda: self._make_request(method, endpoint, idempotent, **kwargs)
+            )
+
+        url = f"{self.valves.API_BASE_URL}{endpoint}"
+        client = _get_async_client(self.valves.API_BASE_URL, self.valves.POOL_MAXSIZE)
+        idempotent = self._is_idempotent(method, idempotent)
+        cache_key, cached, ttl = self._cache_lookup(method, endpoint, idempotent, kwargs)
+        if cached is not None and cached.fresh:
+            return cached.body
+        kwargs = self._with_idempotency_key(method, idempotent, kwargs)
+
+        deadline = time.monotonic() + self.valves.REQUEST_TIMEOUT
+        error = "Max retries exceeded"
+
+        for attempt in range(self.valves.MAX_RETRIES):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return {"error": f"Request deadline of {self.valves.REQUEST_TIMEOUT}s exceeded"}
+
+            retry_after = None
+            try:
+                response = await client.request(
+                    method,
+                    url,
+                    timeout=httpx.Timeout(
+                        remaining, connect=min(self.valves.CONNECT_TIMEOUT, remaining)
+                    ),
+                    **self._with_headers(kwargs, remaining),
+                )
+
+                if response.status_code == 304 and cached is not None:
+                    self._cache.refresh(cache_key, ttl)
+                    return cached.body
+
+                if 200 <= response.status_code < 300:
+                    body = self._decode_body(response)
+                    if cache_key is not None:
+                        self._cache.put(
+                            cache_key,
+                            body,
+                            response.headers.get("ETag"),
+                            ttl,
+                            len(response.content),
+                        )
+                    return body
+
+                error = self._error_from_response(response.status_code, response.text)
+                if not self._should_retry_status(response.status_code, idempotent):
+                    return {"error": error}
+                retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                error = f"Connection failed: {str(e)}"
+            except httpx.HTTPError as e:
+                error = f"Connection failed: {str(e)}"
+                if not idempotent:
+                    return {"error": error}
+
+            delay = self._backoff_delay(attempt, deadline, retry_after)
+            if delay is None or attempt == self.valves.MAX_RETRIES - 1:
+                break
+            await asyncio.sleep(delay)
+
+        return {"error": error}
+
+    async def _fetch_tables(
+        self, table_ids: List[str], include_sample: bool = False
+    ) -> Dict[str, Any]:
+        """Look up many tables through /tables/batch, BATCH_MAX_IDS ids per call
+
+        Returns ``{"tables": [...]}`` with one ``{"table_id", "found", "table", "reason"}``
+        entry per id in request order, or ``{"error": ...}``.
+        """
+        lookups = []
+        for start in range(0, len(table_ids), self.valves.BATCH_MAX_IDS):
+            response = await self._amake_request(
+                method="POST",
+                endpoint="/tables/batch",
+                idempotent=True,
+                json={
+                    "table_ids": table_ids[start:start + self.valves.BATCH_MAX_IDS],
+                    "include_sample_data": include_sample,
+                },
+            )
+            if "error" in response:
+                return response
+            lookups.extend(response.get("tables", []))
+        return {"tables": lookups}
+
+    @property
+    def _cache(self) -> ResponseCache:
+        return _get_cache(self.valves.API_BASE_URL, self.valves.CACHE_MAX_BYTES)
+
+    def _cache_ttl(self, endpoint: str) -> int:
+        """TTL of the longest matching endpoint prefix in CACHE_TTLS"""
+        matches = [p for p in self.valves.CACHE_TTLS if endpoint.startswith(p)]
+        if not matches:
+            return self.valves.CACHE_DEFAULT_TTL
+        return self.valves.CACHE_TTLS[max(matches, key=len)]
+
+    def _cache_lookup(
+        self, method: str, endpoint: str, idempotent: bool, kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[CacheEntry], int]:
+        """Find a cached response and add If-None-Match to kwargs for stale entries"""
+        ttl = self._cache_ttl(endpoint)
+        if not (self.valves.CACHE_ENABLED and idempotent and ttl > 0):
+            return None, None, ttl
+
+        key = ResponseCache.make_key(method, endpoint, kwargs.get("params"), kwargs.get("json"))
+        cached = self._cache.get(key)
+        if cached is not None and not cached.fresh and cached.etag:
+            headers = dict(kwargs.get("headers") or {})
+            headers["If-None-Match"] = cached.etag
+            kwargs["headers"] = headers
+
+        return key, cached, ttl
+
+    def _with_headers(self, kwargs: Dict[str, Any], remaining: float) -> Dict[str, Any]:
+        """Request kwargs with the remaining time budget and preferred wire format as headers"""
+        headers = dict(kwargs.get("headers") or {})
+        headers[DEADLINE_HEADER] = f"{remaining:.3f}"
+        if self.valves.WIRE_FORMAT == "msgpack" and msgpack is not None:
+            headers.setdefault("Accept", MSGPACK_ACCEPT)
+        return {**kwargs, "headers": headers}
+
+    def _with_idempotency_key(self, method: str, idempotent: bool, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Give a retryable POST one key for all of its attempts"""
+        if not idempotent or method.upper() in IDEMPOTENT_METHODS:
+            return kwargs
+        headers = dict(kwargs.get("headers") or {})
+        headers.setdefault(IDEMPOTENCY_HEADER, uuid.uuid4().hex)
+        return {**kwargs, "headers": headers}
+
+    def _decode_body(self, response) -> Any:
+        """Decode a response body as MessagePack or JSON according to its Content-Type"""
+        content_type = response.headers.get("Content-Type", "")
+        if "msgpack" in content_type and msgpack is not None:
+            return msgpack.unpackb(response.content, raw=False)
+        return response.json()
+
+    def _is_idempotent(self, method: str, idempotent: Optional[bool]) -> bool:
+        if idempotent is not None:
+            return idempotent
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def _should_retry_status(self, status_code: int, idempotent: bool) -> bool:
+        """429 was rejected before any work was done; 5xx may have had side effects"""
+        return status_code == 429 or (idempotent and status_code >= 500)
+
+    def _is_connect_failure(self, error: Exception) -> bool:
+        """True when the request never reached the server and is safe to resend"""
+        import requests
+        from urllib3.exceptions import NewConnectionError
+
+        if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+            return False
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+
+    def _error_from_response(self, status_code: int, body: str) -> str:
+        """Build an error message that keeps the API's error detail"""
+        detail = None
+        try:
+            detail = json.loads(body).get("detail")
+        except (ValueError, AttributeError):
+            detail = body.strip()[:200] or None
+
+        if detail:
+            return f"API returned status {status_code}: {detail}"
+        return f"API returned status {status_code}"
+
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value) if value else None
+        except ValueError:
+            return None
+
+    def _backoff_delay(
+        self, attempt: int, deadline: float, retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """Exponential backoff with full jitter, or None if it would overrun the deadline"""
+        cap = min(self.valves.RETRY_BACKOFF_MAX, self.valves.RETRY_BACKOFF_BASE * (2**attempt))
+        delay = retry_after if retry_after is not None else random.uniform(0, cap)
+        if time.monotonic() + delay >= deadline:
+            return None
+        return delay
 
-        return {"error": "Max retries exceeded"}
+    def _sleep_before_retry(
+        self, attempt: int, deadline: float, retry_after: Optional[float] = None
+    ) -> bool:
+        if attempt == self.valves.MAX_RETRIES - 1:
+            return False
+        delay = self._backoff_delay(attempt, deadline, retry_after)
+        if delay is None:
+            return False
+        time.sleep(delay)
+        return True
@@ -3,13 +3,13 @@ Tool for analyzing table details and data quality
 """
 
 from .base_tool import BasePneumaTool
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 
 class PneumaAnalysisTool(BasePneumaTool):
     """Tool for analyzing table details and data quality"""
 
-    def get_table_details(self, table_id: str, include_sample: bool = True) -> str:
+    async def get_table_details(self, table_id: str, include_sample: bool = True) -> str:
         """
         Get detailed information about a specific table.
 
@@ -21,7 +21,7 @@ class PneumaAnalysisTool(BasePneumaTool):
             Detailed table information
         """
 
-        response = self._make_request(
+        response = await self._amake_request(
             method="GET",
             endpoint=f"/tables/{table_id}",
             params={"include_sample_data": include_sample},
@@ -32,7 +32,42 @@ class PneumaAnalysisTool(BasePneumaTool):
 
         return self._format_table_details(response)
 
-    def analyze_data_quality(self, table_id: str) -> str:
+    async def get_multiple_table_details(
+        self, table_ids: List[str], include_sample: bool = False
+    ) -> str:
+        """
+        Get detailed information about several tables at once.
+
+        Args:
+            table_ids: List of table identifiers
+            include_sample: Whether to include sample data
+
+        Returns:
+            Detailed information for each table, in the order given
+        """
+
+        if not table_ids:
+            return "❌ Please provide at least one table ID"
+
+        response = await self._fetch_tables(table_ids, include_sample=include_sample)
+
+        if "error" in response:
+            return f"❌ Error retrieving table details: {response['error']}"
+
+        sections = []
+        for lookup in response["tables"]:
+            if lookup.get("found"):
+                sections.append(self._format_table_details(lookup["table"]))
+            else:
+                why = {
+                    "deleted": " (deleted from the index)",
+                    "not_cataloged": " (no metadata yet, search for it first)",
+                }.get(lookup.get("reason"), "")
+                sections.append(f"❓ **{lookup['table_id']}:** table not found{why}\n")
+
+        return "\n".join(sections)
+
+    async def analyze_data_quality(self, table_id: str) -> str:
         """
         Analyze data quality metrics for a table.
 
@@ -44,7 +79,7 @@ class PneumaAnalysisTool(BasePneumaTool):
         """
 
         # This would call a specific data quality endpoint
-        response = self._make_request(
+        response = await self._amake_request(
             method="GET", endpoint=f"/tables/{table_id}/quality"
         )
 
@@ -53,7 +88,7 @@ class PneumaAnalysisTool(BasePneumaTool):
 
         return self._format_quality_analysis(response)
 
-    def compare_tables(self, table_ids: list) -> str:
+    async def compare_tables(self, table_ids: list) -> str:
         """
         Compare multiple tables side by side.
 
@@ -70,14 +105,16 @@ class PneumaAnalysisTool(BasePneumaTool):
         if len(table_ids) > 5:
             return "❌ Maximum 5 tables can be compared at once"
 
-        response = self._make_request(
-            method="POST", endpoint="/tables/compare", json={"table_ids": table_ids}
-        )
+        response = await self._fetch_tables(table_ids)
 
         if "error" in response:
             return f"❌ Error comparing tables: {response['error']}"
 
-        return self._format_table_comparison(response)
+        missing = [t["table_id"] for t in response["tables"] if not t.get("found")]
+        if missing:
+            return f"❌ Tables not found: {', '.join(missing)}"
+
+        return self._format_table_comparison([t["table"] for t in response["tables"]])
 
     def _format_table_details(self, table_data: Dict[str, Any]) -> str:
         """Format detailed table information"""
@@ -148,21 +185,36 @@ class PneumaAnalysisTool(BasePneumaTool):
 
         return result
 
-    def _format_table_comparison(self, comparison_data: Dict[str, Any]) -> str:
-        """Format table comparison results"""
+    def _format_table_comparison(self, tables: List[Dict[str, Any]]) -> str:
+        """Format a side-by-side comparison of table details"""
 
         result = "🔄 **Table Comparison**\n\n"
 
-        tables = comparison_data.get("tables", [])
-
         result += "📊 **Overview:**\n"
         for table in tables:
-            name = table.get("name", "Unknown")
+            name = table.get("table_name", "Unknown")
             rows = table.get("row_count", "Unknown")
             cols = table.get("column_count", "Unknown")
             result += f"   • **{name}**: {rows} rows × {cols} columns\n"
 
         result += "\n🏗️ **Schema Comparison:**\n"
-        # Add schema comparison logic here
+        columns = [
+            [col.get("name") for col in table.get("schema") or [] if col.get("name")]
+            for table in tables
+        ]
+        shared = set(columns[0]).intersection(*columns[1:])
+        if shared:
+            shared_in_order = [name for name in columns[0] if name in shared]
+            result += f"   • Shared columns: {', '.join(shared_in_order)}\n"
+        else:
+            result += "   • No shared columns\n"
+
+        for table, names in zip(tables, columns):
+            unique = [name for name in names if name not in shared]
+            if unique:
+                shown = ", ".join(unique[:10])
+                if len(unique) > 10:
+                    shown += f", ... ({len(unique) - 10} more)"
+                result += f"   • Only in **{table.get('table_name', 'Unknown')}**: {shown}\n"
 
         return result
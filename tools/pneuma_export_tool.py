@@ -3,13 +3,20 @@ Tool for exporting table data and metadata
 """
 
 from .base_tool import BasePneumaTool
+from .pneuma_analysis_tool import PneumaAnalysisTool
+from .pneuma_search_tool import PneumaSearchTool
 from typing import Dict, Any, List
+import time
 
 
 class PneumaExportTool(BasePneumaTool):
     """Tool for exporting table data and metadata"""
 
-    def export_table_metadata(self, table_ids: List[str], format: str = "json") -> str:
+    class Valves(BasePneumaTool.Valves):
+        EXPORT_POLL_INTERVAL: float = 1.0
+        EXPORT_WAIT_TIMEOUT: int = 60
+
+    async def export_table_metadata(self, table_ids: List[str], format: str = "json") -> str:
         """
         Export metadata for one or more tables.
 
@@ -27,10 +34,9 @@ class PneumaExportTool(BasePneumaTool):
         if format not in ["json", "csv", "markdown"]:
             return "❌ Supported formats: json, csv, markdown"
 
-        response = self._make_request(
-            method="POST",
-            endpoint="/export/metadata",
-            json={"table_ids": table_ids, "format": format, "include_metadata": True},
+        response = await self._run_export_job(
+            "/export/jobs/metadata",
+            {"table_ids": table_ids, "format": format, "include_metadata": True},
         )
 
         if "error" in response:
@@ -38,7 +44,7 @@ class PneumaExportTool(BasePneumaTool):
 
         return self._format_export_response(response, "metadata")
 
-    def export_search_results(self, session_id: str, format: str = "json") -> str:
+    async def export_search_results(self, session_id: str, format: str = "json") -> str:
         """
         Export search results from a session.
 
@@ -50,10 +56,8 @@ class PneumaExportTool(BasePneumaTool):
             Export information
         """
 
-        response = self._make_request(
-            method="POST",
-            endpoint="/export/session",
-            json={"session_id": session_id, "format": format},
+        response = await self._run_export_job(
+            "/export/jobs/session", {"session_id": session_id, "format": format}
         )
 
         if "error" in response:
@@ -61,7 +65,31 @@ class PneumaExportTool(BasePneumaTool):
 
         return self._format_export_response(response, "search results")
 
-    def generate_data_report(self, table_ids: List[str]) -> str:
+    async def get_export_status(self, job_id: str) -> str:
+        """
+        Check on an export that was still running, and get its download link once done.
+
+        Args:
+            job_id: Export job identifier returned by an earlier export
+
+        Returns:
+            Export progress or download information
+        """
+
+        if not job_id:
+            return "❌ Please provide an export job ID"
+
+        response = await self._amake_request(method="GET", endpoint=f"/export/jobs/{job_id}")
+
+        if "error" in response:
+            return f"❌ Could not get export status: {response['error']}"
+        if response.get("status") == "failed":
+            return f"❌ Export failed: {response.get('error') or 'Export job failed'}"
+
+        export_type = "search results" if response.get("kind") == "session" else "metadata"
+        return self._format_export_response(response, export_type)
+
+    async def generate_data_report(self, table_ids: List[str]) -> str:
         """
         Generate a comprehensive data report for selected tables.
 
@@ -75,24 +103,80 @@ class PneumaExportTool(BasePneumaTool):
         if not table_ids:
             return "❌ Please provide at least one table ID"
 
-        response = self._make_request(
-            method="POST", endpoint="/export/report", json={"table_ids": table_ids}
-        )
+        response = await self._fetch_tables(table_ids)
 
         if "error" in response:
             return f"❌ Report generation failed: {response['error']}"
 
-        return self._format_data_report(response)
+        return self._format_data_report(self._build_data_report(response["tables"]))
+
+    def _build_data_report(self, lookups: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize batch lookup results into report data"""
+
+        tables = [lookup["table"] for lookup in lookups if lookup.get("found")]
+        missing = [lookup["table_id"] for lookup in lookups if not lookup.get("found")]
+
+        recommendations = []
+        if missing:
+            recommendations.append(f"Not found, check the IDs: {', '.join(missing)}")
+        undocumented = [t.get("table_name", t["table_id"]) for t in tables if not t.get("description")]
+        if undocumented:
+            recommendations.append(f"Add descriptions for: {', '.join(undocumented)}")
+
+        return {
+            "summary": {
+                "total_tables": len(tables),
+                "total_rows": sum(t.get("row_count") or 0 for t in tables),
+                "total_columns": sum(t.get("column_count") or 0 for t in tables),
+            },
+            "recommendations": recommendations,
+        }
+
+    async def _run_export_job(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit a background export job and poll until it finishes or the wait times out"""
+        import asyncio
+
+        job = await self._amake_request(method="POST", endpoint=endpoint, json=payload)
+        if "error" in job:
+            return job
+
+        deadline = time.monotonic() + self.valves.EXPORT_WAIT_TIMEOUT
+        while job.get("status") in ("queued", "running") and time.monotonic() < deadline:
+            await asyncio.sleep(self.valves.EXPORT_POLL_INTERVAL)
+            status = await self._amake_request(method="GET", endpoint=f"/export/jobs/{job['job_id']}")
+            if "error" in status:
+                return status
+            job = status
+
+        if job.get("status") == "failed":
+            return {"error": job.get("error") or "Export job failed"}
+
+        return job
+
+    def _format_file_size(self, size: Any) -> str:
+        if not isinstance(size, (int, float)):
+            return "Unknown"
+        for unit in ["B", "KB", "MB", "GB"]:
+            if size < 1024 or unit == "GB":
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
 
     def _format_export_response(
         self, response: Dict[str, Any], export_type: str
     ) -> str:
         """Format export response"""
 
+        if response.get("status") in ("queued", "running"):
+            progress = response.get("progress", 0) * 100
+            result = f"⏳ **{export_type.title()} Export In Progress** ({progress:.0f}%)\n\n"
+            result += f"🆔 **Job ID:** `{response.get('job_id')}`\n"
+            result += "Check on it with get_export_status to get the download link.\n"
+            return result
+
         result = f"✅ **{export_type.title()} Export Completed**\n\n"
 
         download_url = response.get("download_url")
-        file_size = response.get("file_size", "Unknown")
+        file_size = self._format_file_size(response.get("file_size"))
         expires_at = response.get("expires_at")
 
         if download_url:
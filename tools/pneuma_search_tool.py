@@ -3,38 +3,58 @@ Main search tool for Pneuma data discovery
 """
 
 from .base_tool import BasePneumaTool
-from typing import Dict, Any
+from typing import Dict, Any, List, Union
 import uuid
 
 
 class PneumaSearchTool(BasePneumaTool):
     """Tool for searching tables using natural language queries"""
 
-    def search_tables(self, query: str, k: int = 5, session_id: str = None) -> str:
+    # Only the fields _format_search_results renders
+    RESULT_FIELDS = ["description", "relevance_score", "row_count", "column_count", "schema"]
+
+    async def search_tables(
+        self, query: str, k: int = 5, session_id: str = None, mode: str = "balanced"
+    ) -> str:
         """
         Search for relevant tables using natural language query.
 
         Args:
             query: Natural language description of desired data
             k: Number of tables to return (1-20)
-            session_id: Optional session ID for context tracking
+            session_id: Optional session ID for context tracking; follow-up searches
+                in the same session rerank the session's earlier candidates
+            mode: "quick" for fast approximate lookups, "balanced" (default) or "thorough"
 
         Returns:
             Formatted string with search results
         """
 
+        # Only a caller-supplied session can have follow-ups worth refining
+        refine = bool(session_id)
+
         # Generate session ID if not provided
         if not session_id:
             session_id = str(uuid.uuid4())
 
         # Validate parameters
         k = max(1, min(20, k))
+        if mode not in ("quick", "balanced", "thorough"):
+            mode = "balanced"
 
         # Make API request
-        response = self._make_request(
+        response = await self._amake_request(
             method="POST",
             endpoint="/query",
-            json={"query": query, "k": k, "session_id": session_id},
+            idempotent=True,
+            json={
+                "query": query,
+                "k": k,
+                "session_id": session_id,
+                "fields": self.RESULT_FIELDS,
+                "mode": mode,
+                "refine": refine,
+            },
         )
 
         if "error" in response:
@@ -42,6 +62,53 @@ class PneumaSearchTool(BasePneumaTool):
 
         return self._format_search_results(response, query)
 
+    async def search_all_indexes(
+        self,
+        query: str,
+        k: int = 5,
+        indexes: Union[str, List[str]] = "all",
+        session_id: str = None,
+    ) -> str:
+        """
+        Search several indexes at once when it is unclear where the data lives.
+
+        Args:
+            query: Natural language description of desired data
+            k: Number of tables to return across all indexes (1-20)
+            indexes: List of index names, or "all" for every index
+            session_id: Optional session ID for context tracking
+
+        Returns:
+            Formatted string with the merged results
+        """
+
+        if not session_id:
+            session_id = str(uuid.uuid4())
+
+        k = max(1, min(20, k))
+
+        response = await self._amake_request(
+            method="POST",
+            endpoint="/query/federated",
+            idempotent=True,
+            json={
+                "query": query,
+                "k": k,
+                "index_names": indexes,
+                "session_id": session_id,
+                "fields": self.RESULT_FIELDS,
+            },
+        )
+
+        if "error" in response:
+            return f"❌ Error: {response['error']}"
+
+        result = self._format_search_results(response, query)
+        skipped = [s["index_name"] for s in response.get("indexes", []) if s.get("status") != "ok"]
+        if skipped:
+            result += f"⚠️ Partial results: {', '.join(skipped)} timed out or failed\n"
+        return result
+
     def get_query_suggestions(self, context: str = "") -> str:
         """
         Get query suggestions based on available data.
@@ -96,7 +163,10 @@ class PneumaSearchTool(BasePneumaTool):
             row_count = table.get("row_count", "Unknown")
             col_count = table.get("column_count", "Unknown")
 
-            result += f"**{i}. {table_name}**\n"
+            result += f"**{i}. {table_name}**"
+            if table.get("index_name"):
+                result += f" _(index: {table['index_name']})_"
+            result += "\n"
             result += f"   📊 Relevance: {relevance:.2f} | Rows: {row_count} | Columns: {col_count}\n"
             result += f"   📄 {description}\n"
 
@@ -0,0 +1,86 @@
+"""
+In-process TTL cache for Pneuma API responses
+"""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    etag: Optional[str]
+    expires_at: float
+    size: int
+
+    @property
+    def body(self) -> Any:
+        """A copy of the cached body, so callers cannot change later hits"""
+        return copy.deepcopy(self.value)
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """LRU cache bounded by the total size of the cached response bodies"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(method: str, endpoint: str, params: Any = None, payload: Any = None) -> str:
+        """Build a stable key from method, endpoint and request payload"""
+        return json.dumps(
+            [method.upper(), endpoint, params, payload], sort_keys=True, default=str
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for a key, fresh or stale, marking it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, body: Any, etag: Optional[str], ttl: float, size: int):
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.size
+
+            # The caller keeps using the body it was given
+            self._entries[key] = CacheEntry(copy.deepcopy(body), etag, time.monotonic() + ttl, size)
+            self.total_bytes += size
+
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.size
+
+    def refresh(self, key: str, ttl: float):
+        """Extend a stale entry after the server confirmed it is unchanged"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + ttl
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.total_bytes}